@@ -0,0 +1,67 @@
+"""
+Set-based accept/reject of many contribution requests at once.
+
+The selected rows are locked and read once, changed with a single UPDATE,
+and the recipient's entitlement credits are adjusted by the net change, all
+in one transaction. Reject clears `accepted` (like
+ContributionRequestRejectView) rather than deleting, so used requests
+keep their history.
+"""
+
+from django.db import transaction
+from django.utils import timezone
+
+from .entitlements import grant_credits, revoke_credits
+from .models import ContributionRequest
+
+STATUS_FILTERS = {
+    "pending": {"accepted": False, "used": False},
+    "accepted": {"accepted": True, "used": False},
+    "used": {"used": True},
+}
+
+
+def respond_to_requests(user, action, ids=None, filters=None):
+    """
+    Accept or reject the user's incoming requests selected by `ids` or
+    `filters`. Returns {request_id: outcome}, where outcome is "accepted",
+    "rejected", "unchanged" or "not_found" (ids that are not the user's).
+    """
+    accept = action == "accept"
+    queryset = ContributionRequest.objects.filter(recipient=user)
+    if ids is not None:
+        queryset = queryset.filter(pk__in=ids)
+    else:
+        filters = filters or {}
+        if "status" in filters:
+            queryset = queryset.filter(**STATUS_FILTERS[filters["status"]])
+        if "created_before" in filters:
+            queryset = queryset.filter(created_at__lt=filters["created_before"])
+        if "created_after" in filters:
+            queryset = queryset.filter(created_at__gte=filters["created_after"])
+
+    with transaction.atomic():
+        rows = list(
+            queryset.select_for_update().order_by("pk").values_list("pk", "accepted", "used")
+        )
+        # Rows whose accepted flag actually flips, and how many carry a credit
+        changing = [(pk, used) for pk, accepted, used in rows if accepted != accept]
+        credit_delta = sum(1 for _, used in changing if not used)
+
+        if changing:
+            # Update exactly the locked rows that were counted; re-applying
+            # the filters could pick up rows that started matching since
+            ContributionRequest.objects.filter(pk__in=[pk for pk, _ in changing]).update(
+                accepted=accept, updated_at=timezone.now()
+            )
+            if accept:
+                grant_credits(user.pk, credit_delta)
+            else:
+                revoke_credits(user.pk, credit_delta)
+
+    changed = {pk for pk, _ in changing}
+    outcome = "accepted" if accept else "rejected"
+    results = {pk: outcome if pk in changed else "unchanged" for pk, _, _ in rows}
+    for pk in ids or []:
+        results.setdefault(pk, "not_found")
+    return results
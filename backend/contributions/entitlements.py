@@ -0,0 +1,136 @@
+"""
+Contribution entitlements.
+
+A user may log one contribution per accepted, unused ContributionRequest.
+Instead of scanning requests on every check, each user has a
+ContributionCredit counter: accepting a request grants a credit, rejecting
+or deleting an unused accepted request revokes it, and logging a
+contribution consumes it with one conditional UPDATE. The "allowed" flag
+the frontend polls is cached and dropped whenever the counter changes.
+Missing counters are rebuilt from the (indexed) requests table.
+"""
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F
+from django.db.models.functions import Greatest
+from django.utils import timezone
+
+from .models import ContributionCredit, ContributionRequest
+
+ALLOWED_CACHE_TIMEOUT = 60 * 5
+
+
+def _allowed_key(user_id):
+    return f"entitlement:allowed:{user_id}"
+
+
+def _invalidate_allowed(user_id):
+    transaction.on_commit(lambda: cache.delete(_allowed_key(user_id)))
+
+
+def available_requests(user_id):
+    """Accepted, unused requests for a user, oldest first."""
+    return ContributionRequest.objects.filter(
+        recipient_id=user_id, accepted=True, used=False
+    ).order_by("created_at", "id")
+
+
+def rebuild_credit(user_id):
+    """Recount a user's credits from the requests table and store them."""
+    available = available_requests(user_id).count()
+    ContributionCredit.objects.update_or_create(
+        user_id=user_id, defaults={"available": available}
+    )
+    _invalidate_allowed(user_id)
+    return available
+
+
+def available_credits(user_id):
+    """Return the user's credit balance with a primary-key read."""
+    try:
+        return ContributionCredit.objects.values_list("available", flat=True).get(
+            pk=user_id
+        )
+    except ContributionCredit.DoesNotExist:
+        return rebuild_credit(user_id)
+
+
+def is_contribution_allowed(user):
+    """Cached check: does the user have at least one credit to spend?"""
+    key = _allowed_key(user.pk)
+    allowed = cache.get(key)
+    if allowed is None:
+        allowed = available_credits(user.pk) > 0
+        cache.set(key, allowed, ALLOWED_CACHE_TIMEOUT)
+    return allowed
+
+
+def grant_credits(user_id, count=1):
+    """Add credits after requests became accepted and unused."""
+    if count <= 0:
+        return
+    updated = ContributionCredit.objects.filter(pk=user_id).update(
+        available=F("available") + count, updated_at=timezone.now()
+    )
+    if not updated:
+        # No counter yet; the requests table already reflects the grant
+        rebuild_credit(user_id)
+        return
+    _invalidate_allowed(user_id)
+
+
+def revoke_credits(user_id, count=1):
+    """Remove credits after accepted, unused requests were rejected or deleted."""
+    if count <= 0:
+        return
+    ContributionCredit.objects.filter(pk=user_id).update(
+        available=Greatest(F("available") - count, 0), updated_at=timezone.now()
+    )
+    _invalidate_allowed(user_id)
+
+
+def consume_credits(user_id, count=1, partial=False):
+    """
+    Spend `count` credits and mark that many of the user's oldest accepted
+    requests as used. The common case is a single conditional UPDATE; the
+    row is only locked when that fails (no counter yet, or not enough
+    credits and `partial` is set). Returns the number of credits spent.
+    """
+    if count <= 0:
+        return 0
+
+    with transaction.atomic():
+        now = timezone.now()
+        consumed = count
+        updated = ContributionCredit.objects.filter(
+            pk=user_id, available__gte=count
+        ).update(available=F("available") - count, updated_at=now)
+
+        if not updated:
+            credit = (
+                ContributionCredit.objects.select_for_update().filter(pk=user_id).first()
+            )
+            if credit is None:
+                rebuild_credit(user_id)
+                credit = ContributionCredit.objects.select_for_update().get(pk=user_id)
+            if credit.available >= count:
+                consumed = count
+            elif partial:
+                consumed = credit.available
+            else:
+                consumed = 0
+            if consumed:
+                ContributionCredit.objects.filter(pk=user_id).update(
+                    available=F("available") - consumed, updated_at=now
+                )
+
+        if consumed:
+            # Bulk UPDATE bypasses the request signals, so the counter is not touched twice
+            oldest = available_requests(user_id).values("pk")[:consumed]
+            ContributionRequest.objects.filter(pk__in=oldest).update(
+                used=True, updated_at=now
+            )
+            _invalidate_allowed(user_id)
+
+    return consumed
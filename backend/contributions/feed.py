@@ -0,0 +1,27 @@
+"""
+Hot-page cache for the global public contribution feed.
+
+Only the default first page (no cursor, no filters) is cached; it is what
+the landing page requests on every visit. Signal handlers drop it on
+commit whenever a contribution is created, changed or deleted, and the
+short timeout bounds staleness if an invalidation is ever missed.
+"""
+
+from django.core.cache import cache
+from django.db import transaction
+
+PUBLIC_FEED_CACHE_TIMEOUT = 30
+
+FIRST_PAGE_KEY = "contributions:public_feed:first_page"
+
+
+def get_cached_first_page():
+    return cache.get(FIRST_PAGE_KEY)
+
+
+def cache_first_page(data):
+    cache.set(FIRST_PAGE_KEY, data, PUBLIC_FEED_CACHE_TIMEOUT)
+
+
+def invalidate_public_feed():
+    transaction.on_commit(lambda: cache.delete(FIRST_PAGE_KEY))
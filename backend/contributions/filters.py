@@ -0,0 +1,71 @@
+"""
+Query-string filters shared by the contribution listing endpoints.
+"""
+
+from datetime import datetime, time, timedelta
+
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from rest_framework.exceptions import ValidationError
+
+from .models import Contribution
+
+TRUE_VALUES = {"true", "1", "yes"}
+FALSE_VALUES = {"false", "0", "no"}
+
+
+def _parse_bound(name, value):
+    """
+    Parse a date or datetime query parameter into an aware datetime.
+    Returns (datetime, is_bare_date).
+    """
+    try:
+        day = parse_date(value)
+        parsed = datetime.combine(day, time.min) if day else parse_datetime(value)
+    except ValueError:
+        parsed = None
+    if parsed is None:
+        raise ValidationError({name: "Expected an ISO date or datetime."})
+    is_date = day is not None
+    if timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed)
+    return parsed, is_date
+
+
+def filter_contributions(queryset, params):
+    """
+    Apply the optional `contribution_type`, `is_public`, `created_after`
+    and `created_before` filters from `params` to a Contribution queryset.
+    Range filters compare created_at directly so the composite indexes apply.
+    """
+    contribution_type = params.get("contribution_type")
+    if contribution_type:
+        valid_types = {choice for choice, _ in Contribution.TYPE_CHOICES}
+        if contribution_type not in valid_types:
+            raise ValidationError({"contribution_type": "Unknown contribution type."})
+        queryset = queryset.filter(contribution_type=contribution_type)
+
+    is_public = params.get("is_public")
+    if is_public:
+        if is_public.lower() in TRUE_VALUES:
+            queryset = queryset.filter(is_public=True)
+        elif is_public.lower() in FALSE_VALUES:
+            queryset = queryset.filter(is_public=False)
+        else:
+            raise ValidationError({"is_public": "Expected true or false."})
+
+    created_after = params.get("created_after")
+    if created_after:
+        bound, _ = _parse_bound("created_after", created_after)
+        queryset = queryset.filter(created_at__gte=bound)
+
+    created_before = params.get("created_before")
+    if created_before:
+        bound, is_date = _parse_bound("created_before", created_before)
+        if is_date:
+            # A bare date includes that whole day
+            queryset = queryset.filter(created_at__lt=bound + timedelta(days=1))
+        else:
+            queryset = queryset.filter(created_at__lte=bound)
+
+    return queryset
@@ -0,0 +1,144 @@
+"""
+Streaming bulk import of contributions.
+
+Rows are read one at a time from an NDJSON or CSV body, validated with
+ContributionImportSerializer in chunks, and each chunk is written with one
+bulk_create inside its own transaction. Entitlement credits are consumed
+once per chunk, not once per row. Because bulk_create skips model
+signals, every written chunk is announced through
+`contributions_bulk_created` so the denormalized counters stay current.
+"""
+
+import csv
+import json
+
+from django.db import transaction
+
+from .entitlements import consume_credits
+from .models import Contribution
+from .serializers import ContributionImportSerializer
+from .signals import contributions_bulk_created
+
+IMPORT_BATCH_SIZE = 500
+
+# Per-row errors beyond this are counted but not echoed back
+MAX_REPORTED_ERRORS = 1000
+
+NO_CREDIT_ERROR = {"non_field_errors": ["No contribution credit available."]}
+
+
+def iter_ndjson_rows(lines):
+    """Yield (row_number, data) for each non-blank NDJSON line."""
+    for row_number, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            data = json.loads(line)
+        except ValueError:
+            data = None
+        if not isinstance(data, dict):
+            yield row_number, {"_error": "Invalid JSON object."}
+            continue
+        yield row_number, data
+
+
+def iter_csv_rows(lines):
+    """Yield (row_number, data) for each CSV record; row 1 is the header."""
+    reader = csv.DictReader(lines)
+    for data in reader:
+        # Drop cells for missing columns and surplus cells without a header
+        yield reader.line_num, {
+            key: value for key, value in data.items() if key and value is not None
+        }
+
+
+class ContributionImporter:
+    """Validates and writes imported rows for one user, accumulating a report."""
+
+    def __init__(self, user, context=None, batch_size=IMPORT_BATCH_SIZE):
+        self.user = user
+        self.context = context or {}
+        self.batch_size = batch_size
+        self.created = 0
+        self.failed = 0
+        self.errors = []
+        self._credits_exhausted = False
+
+    def _error(self, row_number, errors):
+        self.failed += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({"row": row_number, "errors": errors})
+
+    def run(self, rows):
+        chunk = []
+        for row in rows:
+            chunk.append(row)
+            if len(chunk) >= self.batch_size:
+                self._import_chunk(chunk)
+                chunk = []
+        if chunk:
+            self._import_chunk(chunk)
+        return self.report
+
+    def _import_chunk(self, chunk):
+        valid = []
+        for row_number, data in chunk:
+            if "_error" in data:
+                self._error(row_number, {"non_field_errors": [data["_error"]]})
+                continue
+            serializer = ContributionImportSerializer(data=data, context=self.context)
+            if serializer.is_valid():
+                valid.append((row_number, serializer.validated_data))
+            else:
+                self._error(row_number, serializer.errors)
+
+        if not valid:
+            return
+        if self._credits_exhausted:
+            for row_number, _ in valid:
+                self._error(row_number, NO_CREDIT_ERROR)
+            return
+
+        with transaction.atomic():
+            # One set-based spend for the whole chunk; rows beyond the balance are rejected
+            granted = consume_credits(self.user.pk, len(valid), partial=True)
+            if granted < len(valid):
+                self._credits_exhausted = True
+                for row_number, _ in valid[granted:]:
+                    self._error(row_number, NO_CREDIT_ERROR)
+            valid = valid[:granted]
+            if not valid:
+                return
+
+            objs = []
+            imported_dates = []
+            for _, validated_data in valid:
+                created_at = validated_data.pop("created_at", None)
+                objs.append(Contribution(user=self.user, **validated_data))
+                imported_dates.append(created_at)
+            objs = Contribution.objects.bulk_create(objs, batch_size=self.batch_size)
+
+            # auto_now_add overrides timestamps on insert; restore historical ones
+            backdated = []
+            for obj, created_at in zip(objs, imported_dates):
+                if created_at is not None:
+                    obj.created_at = created_at
+                    backdated.append(obj)
+            if backdated:
+                Contribution.objects.bulk_update(
+                    backdated, ["created_at"], batch_size=self.batch_size
+                )
+
+            contributions_bulk_created.send(
+                sender=Contribution, user_id=self.user.pk, contributions=objs
+            )
+            self.created += len(objs)
+
+    @property
+    def report(self):
+        return {
+            "created": self.created,
+            "failed": self.failed,
+            "errors": self.errors,
+            "errors_truncated": self.failed > len(self.errors),
+        }
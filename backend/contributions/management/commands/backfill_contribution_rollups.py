@@ -0,0 +1,45 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+
+from contributions.rollups import rebuild_rollups
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    """
+    Rebuild ContributionDailyRollup from the contributions table.
+    Users are processed in id-ordered batches with one GROUP BY per batch.
+    """
+
+    help = "Backfill or repair daily contribution activity rollups."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Number of users rebuilt per batch (default: 500).",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        last_id = 0
+        users = 0
+        buckets = 0
+
+        while True:
+            user_ids = list(
+                User.objects.filter(pk__gt=last_id)
+                .order_by("pk")
+                .values_list("pk", flat=True)[:batch_size]
+            )
+            if not user_ids:
+                break
+            buckets += rebuild_rollups(user_ids)
+            users += len(user_ids)
+            last_id = user_ids[-1]
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Rebuilt {buckets} daily buckets for {users} users.")
+        )
@@ -0,0 +1,118 @@
+import asyncio
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+from django.utils import timezone
+
+from contributions.feed import invalidate_public_feed
+from contributions.models import Contribution
+from contributions.proofs import ProofVerifier
+
+
+class Command(BaseCommand):
+    """
+    Verify contribution proof links in the background.
+    Unchecked links and links not checked for `--recheck-hours` are
+    verified in id-ordered batches; with `--loop` the command keeps running
+    and sleeps between passes.
+    """
+
+    help = "Check contribution proof URLs and record their status."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=200,
+            help="Number of contributions checked per batch (default: 200).",
+        )
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=10,
+            help="Maximum number of requests in flight (default: 10).",
+        )
+        parser.add_argument(
+            "--per-host-interval",
+            type=float,
+            default=1.0,
+            help="Minimum seconds between requests to one host (default: 1).",
+        )
+        parser.add_argument(
+            "--recheck-hours",
+            type=int,
+            default=24,
+            help="Re-verify links last checked longer ago than this (default: 24).",
+        )
+        parser.add_argument(
+            "--loop",
+            type=int,
+            default=0,
+            metavar="SECONDS",
+            help="Run continuously, sleeping this long between passes.",
+        )
+        parser.add_argument(
+            "--allow-private-hosts",
+            action="store_true",
+            help="Also check links on loopback or private networks.",
+        )
+
+    def handle(self, *args, **options):
+        verifier = ProofVerifier(
+            concurrency=options["concurrency"],
+            per_host_interval=options["per_host_interval"],
+            allow_private_hosts=options["allow_private_hosts"],
+        )
+        while True:
+            checked = self.run_pass(
+                verifier, options["batch_size"], options["recheck_hours"]
+            )
+            self.stdout.write(self.style.SUCCESS(f"Checked {checked} proof links."))
+            if not options["loop"]:
+                break
+            time.sleep(options["loop"])
+
+    def run_pass(self, verifier, batch_size, recheck_hours):
+        stale_before = timezone.now() - timedelta(hours=recheck_hours)
+        pending = (
+            Contribution.objects.exclude(proof_url__isnull=True)
+            .exclude(proof_url="")
+            .filter(
+                Q(proof_status="unchecked")
+                | Q(proof_checked_at__isnull=True)
+                | Q(proof_checked_at__lt=stale_before)
+            )
+            .order_by("pk")
+        )
+        last_id = 0
+        checked = 0
+
+        while True:
+            batch = list(
+                pending.filter(pk__gt=last_id).values_list("pk", "proof_url")[
+                    :batch_size
+                ]
+            )
+            if not batch:
+                break
+            results = asyncio.run(verifier.verify_many(url for _, url in batch))
+
+            by_status = {}
+            for pk, url in batch:
+                ids, urls = by_status.setdefault(results[url], ([], set()))
+                ids.append(pk)
+                urls.add(url)
+            checked_at = timezone.now()
+            for status, (ids, urls) in by_status.items():
+                # Links edited while the batch ran were reset to unchecked
+                # and must not be stamped with the old link's result
+                Contribution.objects.filter(pk__in=ids, proof_url__in=urls).update(
+                    proof_status=status, proof_checked_at=checked_at
+                )
+
+            invalidate_public_feed()
+            checked += len(batch)
+            last_id = batch[-1][0]
+        return checked
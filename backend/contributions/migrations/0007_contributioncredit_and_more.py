@@ -0,0 +1,29 @@
+# Generated by Django 5.0.3 on 2026-10-16 22:34
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contributions', '0006_contributionrequest_created_at_and_more'),
+        ('users', '0003_userstats'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ContributionCredit',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='contribution_credit', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('available', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='contributionrequest',
+            index=models.Index(fields=['recipient', 'accepted', 'used', 'created_at'], name='contrib_req_entitlement_idx'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.0.3 on 2026-10-16 22:34
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contributions', '0007_contributioncredit_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='contribution',
+            index=models.Index(fields=['user', 'created_at'], name='contrib_user_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='contribution',
+            index=models.Index(fields=['user', 'contribution_type', 'created_at'], name='contrib_user_type_created_idx'),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.0.3 on 2026-10-16 22:36
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contributions', '0008_contribution_contrib_user_created_idx_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='contribution',
+            index=models.Index(condition=models.Q(('is_public', True)), fields=['-created_at', '-id'], name='contrib_public_feed_idx'),
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.0.3 on 2026-10-16 22:38
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contributions', '0009_contribution_contrib_public_feed_idx'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ContributionDailyRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('contribution_type', models.CharField(choices=[('code', 'Code'), ('bugfix', 'Bug Fix'), ('docs', 'Documentation'), ('mentorship', 'Mentorship'), ('resume', 'Resume Generator'), ('community', 'Community Help'), ('codereview', 'Code Review')], max_length=32)),
+                ('count', models.PositiveIntegerField(default=0)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='contribution_rollups', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='contributiondailyrollup',
+            constraint=models.UniqueConstraint(fields=('user', 'day', 'contribution_type'), name='contrib_rollup_user_day_type_uniq'),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.0.3 on 2026-10-16 22:42
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contributions', '0010_contributiondailyrollup_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='contribution',
+            name='proof_checked_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='contribution',
+            name='proof_status',
+            field=models.CharField(choices=[('unchecked', 'Not checked yet'), ('ok', 'Reachable'), ('broken', 'Broken link'), ('unreachable', 'Unreachable'), ('blocked', 'Blocked host')], default='unchecked', max_length=16),
+        ),
+        migrations.AddIndex(
+            model_name='contribution',
+            index=models.Index(fields=['proof_status', 'proof_checked_at'], name='contrib_proof_check_idx'),
+        ),
+    ]
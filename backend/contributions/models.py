@@ -4,6 +4,14 @@ from django.db import models
 
 # Predefined types of contributions to maintain consistency
 class Contribution(models.Model):
+    PROOF_STATUS_CHOICES = [
+        ("unchecked", "Not checked yet"),
+        ("ok", "Reachable"),
+        ("broken", "Broken link"),
+        ("unreachable", "Unreachable"),
+        ("blocked", "Blocked host"),
+    ]
+
     TYPE_CHOICES = [
         ("code", "Code"),
         ("bugfix", "Bug Fix"),
@@ -30,6 +38,11 @@ class Contribution(models.Model):
     proof_url = models.URLField(
         blank=True, null=True
     )  # Optional link to proof (e.g., GitHub PR, issue link)
+    # Result of the background link check (see contributions/proofs.py)
+    proof_status = models.CharField(
+        max_length=16, choices=PROOF_STATUS_CHOICES, default="unchecked"
+    )
+    proof_checked_at = models.DateTimeField(blank=True, null=True)
     # Visibility control
     is_public = models.BooleanField(default=True)  # If False, contribution is private
     # Auto-managed timestamps
@@ -38,11 +51,63 @@ class Contribution(models.Model):
     )  # When the contribution was created
     updated_at = models.DateTimeField(auto_now=True)  # Updated whenever saved
 
+    class Meta:
+        indexes = [
+            # Keyset pagination of a user's history, optionally by type
+            models.Index(fields=["user", "created_at"], name="contrib_user_created_idx"),
+            models.Index(
+                fields=["user", "contribution_type", "created_at"],
+                name="contrib_user_type_created_idx",
+            ),
+            # Verifier work queue: unchecked or stale proof links
+            models.Index(
+                fields=["proof_status", "proof_checked_at"],
+                name="contrib_proof_check_idx",
+            ),
+            # Global public feed; only public rows are indexed
+            models.Index(
+                fields=["-created_at", "-id"],
+                condition=models.Q(is_public=True),
+                name="contrib_public_feed_idx",
+            ),
+        ]
+
     def __str__(self):
         # Returns a readable string like: "username - Fix Login Bug"
         return f"{self.user.username} - {self.title}"
 
 
+class ContributionDailyRollup(models.Model):
+    """
+    Per-user, per-day, per-type contribution counts for activity heatmaps.
+    Maintained incrementally by contributions/rollups.py; days are local
+    dates in the project TIME_ZONE.
+    """
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="contribution_rollups",
+    )
+    day = models.DateField()
+    contribution_type = models.CharField(
+        max_length=32, choices=Contribution.TYPE_CHOICES
+    )
+    count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            # Also serves the (user, day range) time-series reads
+            models.UniqueConstraint(
+                fields=["user", "day", "contribution_type"],
+                name="contrib_rollup_user_day_type_uniq",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.user_id} {self.day} {self.contribution_type}: {self.count}"
+
+
 class ContributionRequest(models.Model):
     # Users involved in the request
     sender = models.ForeignKey(
@@ -68,6 +133,35 @@ class ContributionRequest(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)  # When request was created
     updated_at = models.DateTimeField(auto_now=True)  # Last updated time
 
+    class Meta:
+        indexes = [
+            # Backs the entitlement lookups: a user's accepted, unused requests, oldest first
+            models.Index(
+                fields=["recipient", "accepted", "used", "created_at"],
+                name="contrib_req_entitlement_idx",
+            ),
+        ]
+
     def __str__(self):
         # Shows: "sender → recipient (accepted/pending)"
         return f"{self.sender} → {self.recipient} ({'accepted' if self.accepted else 'pending'})"
+
+
+class ContributionCredit(models.Model):
+    """
+    Number of accepted, unused contribution requests a user can still spend.
+    Maintained by contributions/entitlements.py and consumed with a single
+    conditional UPDATE when a contribution is logged.
+    """
+
+    user = models.OneToOneField(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="contribution_credit",
+    )
+    available = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.user_id}: {self.available} credit(s)"
@@ -0,0 +1,174 @@
+"""
+Background verification of contribution proof links.
+
+`ProofVerifier` checks many URLs concurrently with an asyncio HTTP client.
+Concurrency is bounded by a semaphore, requests to the same host are
+spaced at least `per_host_interval` seconds apart, and definitive results
+(ok / broken) are cached by URL so links shared between contributions are
+only fetched once per cache period. Redirects are followed by hand so that
+every hop is checked against the private-address block list, and each
+request is sent to the exact address that was checked (with the original
+Host header and TLS server name), so a DNS answer that changes between
+the check and the connection cannot redirect it to an internal host.
+
+The `verify_proof_urls` management command drives it in batches.
+"""
+
+import asyncio
+import hashlib
+import ipaddress
+import socket
+from urllib.parse import urljoin, urlsplit
+
+import httpx
+from django.core.cache import cache
+
+PROOF_RESULT_CACHE_TIMEOUT = 60 * 60
+
+# Only definitive answers are cached; transient failures are retried
+CACHEABLE_STATUSES = ("ok", "broken")
+
+MAX_REDIRECTS = 5
+
+REQUEST_TIMEOUT = 10.0
+
+USER_AGENT = "DevCred-ProofVerifier/1.0"
+
+
+def _result_key(url):
+    return "contributions:proof:" + hashlib.sha256(url.encode()).hexdigest()
+
+
+def _status_for(status_code):
+    if status_code < 400:
+        return "ok"
+    if status_code < 500:
+        return "broken"
+    return "unreachable"
+
+
+class ProofVerifier:
+    """
+    Check proof URLs and classify them as ok, broken, unreachable or blocked.
+
+    Pass `allow_private_hosts=True` to verify links on loopback or private
+    networks (e.g. a local stub server in tests), and `transport` to swap
+    the httpx transport.
+    """
+
+    def __init__(
+        self,
+        concurrency=10,
+        per_host_interval=1.0,
+        timeout=REQUEST_TIMEOUT,
+        allow_private_hosts=False,
+        transport=None,
+        cache_timeout=PROOF_RESULT_CACHE_TIMEOUT,
+    ):
+        self.concurrency = concurrency
+        self.per_host_interval = per_host_interval
+        self.timeout = timeout
+        self.allow_private_hosts = allow_private_hosts
+        self.transport = transport
+        self.cache_timeout = cache_timeout
+
+    async def verify_many(self, urls):
+        """Return a dict mapping each distinct URL to its status."""
+        urls = list(dict.fromkeys(urls))
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+        self._host_locks = {}
+        self._next_slot = {}
+        async with httpx.AsyncClient(
+            timeout=self.timeout,
+            follow_redirects=False,
+            headers={"User-Agent": USER_AGENT},
+            transport=self.transport,
+        ) as client:
+            statuses = await asyncio.gather(*(self._verify(client, url) for url in urls))
+        return dict(zip(urls, statuses))
+
+    async def _verify(self, client, url):
+        key = _result_key(url)
+        status = await cache.aget(key)
+        if status is not None:
+            return status
+        status = await self._check(client, url)
+        if status in CACHEABLE_STATUSES:
+            await cache.aset(key, status, self.cache_timeout)
+        return status
+
+    async def _check(self, client, url):
+        for _ in range(MAX_REDIRECTS + 1):
+            parts = urlsplit(url)
+            if parts.scheme not in ("http", "https") or not parts.hostname:
+                return "broken"
+            try:
+                addresses = await _resolve(parts.hostname)
+                if not addresses:
+                    return "unreachable"
+                if not self.allow_private_hosts and not all(
+                    address.is_global for address in addresses
+                ):
+                    return "blocked"
+                await self._wait_for_host(parts.hostname)
+                async with self._semaphore:
+                    response = await self._fetch(client, url, addresses[0])
+            except (httpx.HTTPError, OSError, ValueError):
+                return "unreachable"
+
+            if not response.is_redirect:
+                return _status_for(response.status_code)
+            location = response.headers.get("location")
+            if not location:
+                return "broken"
+            url = urljoin(url, location)
+        # Redirect loop or an unreasonably long chain
+        return "broken"
+
+    async def _fetch(self, client, url, address):
+        response = await client.send(_pinned_request(client, "HEAD", url, address))
+        if response.status_code in (405, 501):
+            # Some hosts do not implement HEAD; fall back to GET without
+            # downloading the body
+            request = _pinned_request(client, "GET", url, address)
+            response = await client.send(request, stream=True)
+            await response.aclose()
+        return response
+
+    async def _wait_for_host(self, host):
+        """Space requests to the same host `per_host_interval` seconds apart."""
+        lock = self._host_locks.setdefault(host, asyncio.Lock())
+        loop = asyncio.get_running_loop()
+        async with lock:
+            delay = self._next_slot.get(host, 0) - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            self._next_slot[host] = loop.time() + self.per_host_interval
+
+
+async def _resolve(hostname):
+    """Return the addresses `hostname` resolves to, in resolver order."""
+    try:
+        return [ipaddress.ip_address(hostname)]
+    except ValueError:
+        pass
+    loop = asyncio.get_running_loop()
+    infos = await loop.getaddrinfo(hostname, None, type=socket.SOCK_STREAM)
+    # Drop IPv6 scope ids ("fe80::1%eth0"), which ip_address() rejects
+    addresses = [ipaddress.ip_address(info[4][0].split("%")[0]) for info in infos]
+    return list(dict.fromkeys(addresses))
+
+
+def _pinned_request(client, method, url, address):
+    """
+    Build a request that connects to `address` while presenting the URL's
+    own host in the Host header and as the TLS server name, so the
+    certificate is still checked against the hostname.
+    """
+    original = httpx.URL(url)
+    return client.build_request(
+        method,
+        original.copy_with(host=str(address)),
+        headers={"Host": original.netloc.decode("ascii")},
+        extensions={"sni_hostname": original.raw_host.decode("ascii")},
+    )
@@ -0,0 +1,90 @@
+"""
+Incremental maintenance of ContributionDailyRollup.
+
+Signal handlers turn contribution writes into (user, day, type) deltas and
+apply them here with one UPDATE per touched bucket, inserting the bucket
+on first use. `rebuild_rollups` recomputes whole users with a single
+GROUP BY and backs the `backfill_contribution_rollups` command.
+"""
+
+from collections import Counter
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F
+from django.db.models.functions import Greatest, TruncDate
+from django.utils import timezone
+
+from .models import Contribution, ContributionDailyRollup
+
+
+def rollup_key(user_id, created_at, contribution_type):
+    """Bucket for a contribution: its owner, local day and type."""
+    return (user_id, timezone.localdate(created_at), contribution_type)
+
+
+def apply_rollup_deltas(deltas):
+    """
+    Apply {(user_id, day, contribution_type): delta} to the rollup table.
+    Counts never drop below zero; empty buckets are left in place.
+    """
+    for (user_id, day, contribution_type), delta in deltas.items():
+        if not delta:
+            continue
+        bucket = ContributionDailyRollup.objects.filter(
+            user_id=user_id, day=day, contribution_type=contribution_type
+        )
+        if delta < 0:
+            bucket.update(count=Greatest(F("count") + delta, 0))
+            continue
+        if bucket.update(count=F("count") + delta):
+            continue
+        try:
+            with transaction.atomic():
+                ContributionDailyRollup.objects.create(
+                    user_id=user_id,
+                    day=day,
+                    contribution_type=contribution_type,
+                    count=delta,
+                )
+        except IntegrityError:
+            # Another writer inserted the bucket first
+            bucket.update(count=F("count") + delta)
+
+
+def record_contributions(contributions, sign=1):
+    """Count (sign=1) or uncount (sign=-1) a batch of contributions."""
+    deltas = Counter()
+    for contribution in contributions:
+        key = rollup_key(
+            contribution.user_id, contribution.created_at, contribution.contribution_type
+        )
+        deltas[key] += sign
+    apply_rollup_deltas(deltas)
+
+
+def rebuild_rollups(user_ids):
+    """
+    Recompute all rollups for the given users with one GROUP BY query and
+    replace their existing rows.
+    """
+    user_ids = list(user_ids)
+    rows = (
+        Contribution.objects.filter(user_id__in=user_ids)
+        .annotate(day=TruncDate("created_at"))
+        .order_by()
+        .values("user_id", "day", "contribution_type")
+        .annotate(total=Count("id"))
+    )
+    rollups = [
+        ContributionDailyRollup(
+            user_id=row["user_id"],
+            day=row["day"],
+            contribution_type=row["contribution_type"],
+            count=row["total"],
+        )
+        for row in rows
+    ]
+    with transaction.atomic():
+        ContributionDailyRollup.objects.filter(user_id__in=user_ids).delete()
+        ContributionDailyRollup.objects.bulk_create(rollups, batch_size=1000)
+    return len(rollups)
@@ -21,12 +21,21 @@ class ContributionSerializer(serializers.ModelSerializer):
             "description",
             "contribution_type",
             "proof_url",
+            "proof_status",
+            "proof_checked_at",
             "is_public",
             "created_at",
             "updated_at",
         ]
         # These fields should never be directly set by client input
-        read_only_fields = ["id", "user", "created_at", "updated_at"]
+        read_only_fields = [
+            "id",
+            "user",
+            "proof_status",
+            "proof_checked_at",
+            "created_at",
+            "updated_at",
+        ]
 
     def create(self, validated_data):
         """
@@ -41,6 +50,38 @@ class ContributionSerializer(serializers.ModelSerializer):
         return super().create(validated_data)
 
 
+class PublicContributionSerializer(ContributionSerializer):
+    """
+    Read-only representation used by the global public feed.
+    Adds the author's id and username for linking to their profile.
+    """
+
+    user_id = serializers.ReadOnlyField()
+    username = serializers.ReadOnlyField(source="user.username")
+
+    class Meta(ContributionSerializer.Meta):
+        fields = ContributionSerializer.Meta.fields + ["user_id", "username"]
+        read_only_fields = fields
+
+
+class ContributionImportSerializer(ContributionSerializer):
+    """
+    Validates one row of a bulk import. Identical to ContributionSerializer
+    except that an optional historical `created_at` may be supplied.
+    """
+
+    created_at = serializers.DateTimeField(required=False)
+
+    class Meta(ContributionSerializer.Meta):
+        read_only_fields = [
+            "id",
+            "user",
+            "proof_status",
+            "proof_checked_at",
+            "updated_at",
+        ]
+
+
 class ContributionRequestSerializer(serializers.ModelSerializer):
     """
     Serializer for the ContributionRequest model.
@@ -48,19 +89,65 @@ class ContributionRequestSerializer(serializers.ModelSerializer):
     from the client side.
     """
 
-    # Show user-friendly string instead of raw user ID
+    # Show user-friendly string instead of raw user ID; querysets should
+    # select_related("sender", "recipient") to avoid a query per row
     sender = serializers.StringRelatedField(read_only=True)
     recipient = serializers.StringRelatedField(read_only=True)
+    status = serializers.SerializerMethodField()
 
     class Meta:
         model = ContributionRequest
         fields = [
             "id",
             "sender",
+            "sender_id",
             "recipient",
+            "recipient_id",
             "accepted",
             "via_message",
+            "used",
+            "status",
+            "created_at",
         ]
         # All fields are read-only in this serializer to ensure requests
         # are only created/updated via controlled logic (e.g., viewsets/services)
-        read_only_fields = ["id", "sender", "recipient", "accepted", "via_message"]
+        read_only_fields = fields
+
+    def get_status(self, obj):
+        # pending → accepted → used
+        if obj.used:
+            return "used"
+        return "accepted" if obj.accepted else "pending"
+
+
+class ContributionRequestFilterSerializer(serializers.Serializer):
+    """Selects the recipient's requests by status and creation time."""
+
+    status = serializers.ChoiceField(
+        choices=["pending", "accepted", "used"], required=False
+    )
+    created_before = serializers.DateTimeField(required=False)
+    created_after = serializers.DateTimeField(required=False)
+
+
+class ContributionRequestBatchSerializer(serializers.Serializer):
+    """
+    Input for batch accept/reject: an action plus either explicit request
+    ids or a filter (e.g. all pending requests created before a date).
+    """
+
+    MAX_IDS = 1000
+
+    action = serializers.ChoiceField(choices=["accept", "reject"])
+    ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        required=False,
+        allow_empty=False,
+        max_length=MAX_IDS,
+    )
+    filter = ContributionRequestFilterSerializer(required=False)
+
+    def validate(self, attrs):
+        if ("ids" in attrs) == ("filter" in attrs):
+            raise serializers.ValidationError("Provide either ids or filter.")
+        return attrs
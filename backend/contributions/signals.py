@@ -0,0 +1,116 @@
+from django.db.models.signals import post_delete, post_init, post_save, pre_save
+from django.dispatch import Signal, receiver
+
+from users.profiles import invalidate_profile_document
+from users.recommendations import mark_recommendations_stale
+from users.stats import adjust_user_stats
+from .entitlements import grant_credits, rebuild_credit, revoke_credits
+from .feed import invalidate_public_feed
+from .models import Contribution, ContributionRequest
+from .rollups import apply_rollup_deltas, record_contributions, rollup_key
+
+# Sent after bulk_create writes contributions, since bulk inserts skip post_save.
+# Arguments: user_id, contributions (the created Contribution objects)
+contributions_bulk_created = Signal()
+
+# Marks a field that was deferred when the instance was loaded
+_DEFERRED = object()
+
+
+@receiver(post_init, sender=Contribution)
+def remember_rollup_bucket(sender, instance, **kwargs):
+    # Read from __dict__ so deferred fields are not fetched
+    created_at = instance.__dict__.get("created_at")
+    contribution_type = instance.__dict__.get("contribution_type")
+    instance._rollup_key = (
+        rollup_key(instance.__dict__.get("user_id"), created_at, contribution_type)
+        if created_at and contribution_type
+        else None
+    )
+    instance._loaded_proof_url = instance.__dict__.get("proof_url", _DEFERRED)
+
+
+@receiver(pre_save, sender=Contribution)
+def reset_proof_check(sender, instance, raw=False, **kwargs):
+    # An edited link has to be verified again
+    proof_url = instance.__dict__.get("proof_url", _DEFERRED)
+    if raw or proof_url is _DEFERRED or proof_url == instance._loaded_proof_url:
+        return
+    instance.proof_status = "unchecked"
+    instance.proof_checked_at = None
+
+
+@receiver(post_save, sender=Contribution)
+def contribution_saved(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    current_key = rollup_key(
+        instance.user_id, instance.created_at, instance.contribution_type
+    )
+    if created:
+        adjust_user_stats(instance.user_id, contribution_count=1)
+        invalidate_profile_document(instance.user_id)
+        record_contributions([instance])
+        mark_recommendations_stale(instance.user_id)
+    elif instance._rollup_key is not None and instance._rollup_key != current_key:
+        # Type changed: move the contribution to its new bucket
+        apply_rollup_deltas({instance._rollup_key: -1, current_key: 1})
+        mark_recommendations_stale(instance.user_id)
+    instance._rollup_key = current_key
+    instance._loaded_proof_url = instance.__dict__.get("proof_url", _DEFERRED)
+    # Any edit may change what the public feed shows
+    invalidate_public_feed()
+
+
+@receiver(contributions_bulk_created, sender=Contribution)
+def contributions_imported(sender, user_id, contributions, **kwargs):
+    adjust_user_stats(user_id, contribution_count=len(contributions))
+    invalidate_profile_document(user_id)
+    invalidate_public_feed()
+    record_contributions(contributions)
+    mark_recommendations_stale(user_id)
+
+
+@receiver(post_delete, sender=Contribution)
+def contribution_deleted(sender, instance, **kwargs):
+    adjust_user_stats(instance.user_id, contribution_count=-1)
+    invalidate_profile_document(instance.user_id)
+    invalidate_public_feed()
+    record_contributions([instance], sign=-1)
+    mark_recommendations_stale(instance.user_id)
+
+
+def _grants_credit(accepted, used):
+    return bool(accepted) and not used
+
+
+@receiver(post_init, sender=ContributionRequest)
+def remember_request_state(sender, instance, **kwargs):
+    # Read from __dict__ so deferred fields are not fetched
+    instance._was_available = (
+        _grants_credit(instance.__dict__.get("accepted"), instance.__dict__.get("used"))
+        if "accepted" in instance.__dict__ and "used" in instance.__dict__
+        else None
+    )
+
+
+@receiver(post_save, sender=ContributionRequest)
+def contribution_request_saved(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    now_available = _grants_credit(instance.accepted, instance.used)
+    was_available = False if created else instance._was_available
+    if was_available is None:
+        # Previous state unknown (deferred fields); recount instead
+        rebuild_credit(instance.recipient_id)
+    elif now_available and not was_available:
+        grant_credits(instance.recipient_id)
+    elif was_available and not now_available:
+        revoke_credits(instance.recipient_id)
+    instance._was_available = now_available
+
+
+@receiver(post_delete, sender=ContributionRequest)
+def contribution_request_deleted(sender, instance, **kwargs):
+    if _grants_credit(instance.accepted, instance.used):
+        revoke_credits(instance.recipient_id)
@@ -1,3 +1,528 @@
+import asyncio
+import csv
+import gzip
+import ipaddress
+import json
+import threading
+import time
+from datetime import datetime, timedelta
+from datetime import timezone as dt_timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import StringIO
+from unittest import mock
+from urllib.parse import urlencode
+
+from django.core.cache import cache
+from django.core.management import call_command
 from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from devcred.testing import make_user, walk_pages
+from . import batch, proofs
+from .batch import respond_to_requests
+from .entitlements import available_credits, available_requests
+from .exports import EXPORT_FIELDS
+from .models import Contribution, ContributionDailyRollup, ContributionRequest
+
+
+class ContributionListPaginationTests(TestCase):
+    def setUp(self):
+        self.user = make_user("alice")
+        other = make_user("bob")
+        now = timezone.now()
+        self.contributions = []
+        for i, contribution_type in enumerate(["code", "docs", "code", "code", "bugfix"]):
+            contribution = Contribution.objects.create(
+                user=self.user,
+                title=f"#{i}",
+                contribution_type=contribution_type,
+                is_public=i % 2 == 0,
+            )
+            # Two share a timestamp so the id tie-breaker is exercised
+            contribution.created_at = now - timedelta(days=min(i, 3))
+            Contribution.objects.filter(pk=contribution.pk).update(
+                created_at=contribution.created_at
+            )
+            self.contributions.append(contribution)
+        Contribution.objects.create(user=other, title="not mine", contribution_type="code")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def expected(self, keep=lambda c: True):
+        rows = sorted(
+            filter(keep, self.contributions), key=lambda c: (c.created_at, c.pk), reverse=True
+        )
+        return [c.pk for c in rows]
+
+    def test_pages_cover_own_contributions_newest_first(self):
+        rows = walk_pages(self.client, "/api/contributions/?page_size=2")
+        self.assertEqual([row["id"] for row in rows], self.expected())
+
+    def test_filters_apply_across_pages(self):
+        rows = walk_pages(
+            self.client, "/api/contributions/?page_size=1&contribution_type=code&is_public=true"
+        )
+        self.assertEqual(
+            [row["id"] for row in rows],
+            self.expected(lambda c: c.contribution_type == "code" and c.is_public),
+        )
+
+    def test_date_range_filters(self):
+        after = timezone.localdate(self.contributions[2].created_at)
+        before = timezone.localdate(self.contributions[1].created_at)
+        query = urlencode(
+            {"page_size": 1, "created_after": after.isoformat(), "created_before": before.isoformat()}
+        )
+        rows = walk_pages(self.client, f"/api/contributions/?{query}")
+        # A bare created_before date includes that whole day
+        self.assertEqual(
+            [row["id"] for row in rows],
+            self.expected(lambda c: after <= timezone.localdate(c.created_at) <= before),
+        )
+
+        # A datetime bound is inclusive to the instant
+        cutoff = self.contributions[3].created_at
+        query = urlencode({"created_before": cutoff.isoformat()})
+        rows = walk_pages(self.client, f"/api/contributions/?{query}")
+        self.assertEqual(
+            [row["id"] for row in rows], self.expected(lambda c: c.created_at <= cutoff)
+        )
+
+    def test_unknown_filter_value_is_rejected(self):
+        response = self.client.get("/api/contributions/?contribution_type=poetry")
+        self.assertEqual(response.status_code, 400)
+        response = self.client.get("/api/contributions/?created_after=yesterday")
+        self.assertEqual(response.status_code, 400)
+
+
+class ContributionRequestInboxTests(TestCase):
+    def setUp(self):
+        self.owner = make_user("owner")
+        self.others = [make_user(f"user{i}") for i in range(3)]
+        self.incoming = [
+            ContributionRequest.objects.create(sender=other, recipient=self.owner)
+            for other in self.others
+        ]
+        self.outgoing = ContributionRequest.objects.create(
+            sender=self.owner, recipient=self.others[0]
+        )
+        respond_to_requests(self.owner, "accept", ids=[self.incoming[0].pk])
+        self.client = APIClient()
+        self.client.force_authenticate(self.owner)
+
+    def test_directions_page_through_every_request_once(self):
+        incoming = walk_pages(
+            self.client, "/api/contributions/requests/inbox/?direction=incoming&page_size=2"
+        )
+        self.assertEqual(
+            sorted(row["id"] for row in incoming), sorted(r.pk for r in self.incoming)
+        )
+        everything = walk_pages(self.client, "/api/contributions/requests/inbox/?page_size=1")
+        self.assertEqual(len(everything), 4)
+        self.assertEqual(len({row["id"] for row in everything}), 4)
+
+    def test_counts_cover_both_directions(self):
+        counts = self.client.get("/api/contributions/requests/inbox/?page_size=1").data["counts"]
+        self.assertEqual(counts["incoming"], {"pending": 2, "accepted": 1, "used": 0})
+        self.assertEqual(counts["outgoing"], {"pending": 1, "accepted": 0, "used": 0})
+
+    def test_unknown_direction_is_rejected(self):
+        response = self.client.get("/api/contributions/requests/inbox/?direction=sideways")
+        self.assertEqual(response.status_code, 400)
+
+
+class BatchRespondTests(TestCase):
+    def setUp(self):
+        self.owner = make_user("owner")
+        self.senders = [make_user(f"sender{i}") for i in range(3)]
+        self.pending = [
+            ContributionRequest.objects.create(sender=sender, recipient=self.owner)
+            for sender in self.senders
+        ]
+
+    def assertCreditsMatchRequests(self):
+        self.assertEqual(
+            available_credits(self.owner.pk), available_requests(self.owner.pk).count()
+        )
+
+    def test_accept_then_reject_keeps_credits_in_step(self):
+        other = ContributionRequest.objects.create(sender=self.owner, recipient=self.senders[0])
+        ids = [r.pk for r in self.pending] + [other.pk]
+
+        results = respond_to_requests(self.owner, "accept", ids=ids)
+        self.assertEqual([results[r.pk] for r in self.pending], ["accepted"] * 3)
+        self.assertEqual(results[other.pk], "not_found")
+        self.assertEqual(available_credits(self.owner.pk), 3)
+
+        # Responding again changes nothing and grants nothing
+        results = respond_to_requests(self.owner, "accept", ids=ids)
+        self.assertEqual(results[self.pending[0].pk], "unchanged")
+        self.assertEqual(available_credits(self.owner.pk), 3)
+
+        spent = ContributionRequest.objects.get(pk=self.pending[0].pk)
+        spent.used = True
+        spent.save()
+        respond_to_requests(self.owner, "reject", filters={})
+        self.assertCreditsMatchRequests()
+        self.assertEqual(available_credits(self.owner.pk), 0)
+
+    def test_rows_matching_after_the_lock_are_left_alone(self):
+        real_now = timezone.now
+        late = []
+
+        def now_with_concurrent_insert():
+            # Runs between the locked read and the UPDATE
+            if not late:
+                late.append(None)
+                late[0] = ContributionRequest.objects.create(
+                    sender=self.senders[0], recipient=self.owner
+                )
+            return real_now()
+
+        with mock.patch.object(batch.timezone, "now", now_with_concurrent_insert):
+            results = respond_to_requests(self.owner, "accept", filters={"status": "pending"})
+
+        self.assertNotIn(late[0].pk, results)
+        late[0].refresh_from_db()
+        self.assertFalse(late[0].accepted)
+        self.assertCreditsMatchRequests()
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    """Canned responses for the proof verifier tests, keyed by path."""
+
+    def _respond(self, with_body):
+        self.server.requests.append((self.command, self.path, self.headers.get("Host")))
+        if self.path == "/live":
+            self.send_response(200)
+        elif self.path == "/redirect":
+            self.send_response(302)
+            self.send_header("Location", "/live")
+        elif self.path == "/loop":
+            self.send_response(302)
+            self.send_header("Location", "/loop")
+        elif self.path == "/slow":
+            time.sleep(self.server.slow_seconds)
+            self.send_response(200)
+        elif self.path == "/get-only" and self.command == "HEAD":
+            self.send_response(405)
+        elif self.path == "/get-only":
+            self.send_response(200)
+        else:
+            self.send_response(404)
+        self.send_header("Content-Length", "2" if with_body else "0")
+        self.end_headers()
+        if with_body:
+            self.wfile.write(b"ok")
+
+    def do_HEAD(self):
+        self._respond(with_body=False)
+
+    def do_GET(self):
+        self._respond(with_body=True)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class ProofStubServer:
+    """A local HTTP server on a free port that the proof verifier can check."""
+
+    slow_seconds = 1.0
+
+    def start(self):
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), _StubHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.requests = []
+        self.httpd.slow_seconds = self.slow_seconds
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    @property
+    def requests(self):
+        return self.httpd.requests
+
+    def url(self, path, host="127.0.0.1"):
+        return f"http://{host}:{self.httpd.server_address[1]}{path}"
+
+
+class ProofVerifierTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.stub = ProofStubServer()
+        self.stub.start()
+        self.addCleanup(self.stub.stop)
+
+    def verify(self, *paths, **options):
+        options = {
+            "allow_private_hosts": True,
+            "per_host_interval": 0,
+            "timeout": 0.3,
+            **options,
+        }
+        urls = [self.stub.url(path) for path in paths]
+        results = asyncio.run(proofs.ProofVerifier(**options).verify_many(urls))
+        return [results[url] for url in urls]
+
+    def test_live_dead_redirect_and_timeout(self):
+        self.assertEqual(
+            self.verify("/live", "/missing", "/redirect", "/slow"),
+            ["ok", "broken", "ok", "unreachable"],
+        )
+
+    def test_head_fallback_and_redirect_loop(self):
+        self.assertEqual(self.verify("/get-only", "/loop"), ["ok", "broken"])
+
+    def test_private_hosts_are_blocked_without_a_request(self):
+        self.assertEqual(self.verify("/live", allow_private_hosts=False), ["blocked"])
+        self.assertEqual(self.stub.requests, [])
+
+    def test_definitive_results_are_cached(self):
+        self.verify("/live")
+        self.verify("/live")
+        self.assertEqual(len(self.stub.requests), 1)
+
+    def test_connects_to_the_checked_address(self):
+        # proof.test never resolves; the request must go to the address the
+        # check returned, with the original host in the Host header
+        async def resolve(hostname):
+            return [ipaddress.ip_address("127.0.0.1")]
+
+        url = self.stub.url("/live", host="proof.test")
+        verifier = proofs.ProofVerifier(allow_private_hosts=True, per_host_interval=0)
+        with mock.patch.object(proofs, "_resolve", resolve):
+            results = asyncio.run(verifier.verify_many([url]))
+
+        self.assertEqual(results[url], "ok")
+        port = self.stub.httpd.server_address[1]
+        self.assertEqual(self.stub.requests, [("HEAD", "/live", f"proof.test:{port}")])
+
+    def test_command_records_statuses(self):
+        user = make_user("alice")
+        live, dead = (
+            Contribution.objects.create(
+                user=user, title=path, contribution_type="code", proof_url=self.stub.url(path)
+            )
+            for path in ("/live", "/gone")
+        )
+        call_command(
+            "verify_proof_urls",
+            "--allow-private-hosts",
+            "--per-host-interval=0",
+            stdout=StringIO(),
+        )
+        live.refresh_from_db()
+        dead.refresh_from_db()
+        self.assertEqual((live.proof_status, dead.proof_status), ("ok", "broken"))
+        self.assertIsNotNone(live.proof_checked_at)
+
+
+class ContributionImportTests(TestCase):
+    def setUp(self):
+        self.user = make_user("alice")
+        for sender in (make_user("bob"), make_user("carol")):
+            ContributionRequest.objects.create(sender=sender, recipient=self.user, accepted=True)
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def post(self, body, content_type):
+        return self.client.post(
+            "/api/contributions/import/", data=body.encode(), content_type=content_type
+        )
+
+    def test_ndjson_rows_are_reported_and_spend_credits(self):
+        body = "\n".join(
+            [
+                '{"title": "Old fix", "contribution_type": "bugfix", '
+                '"created_at": "2023-01-05T10:00:00Z"}',
+                '{"title": "Bad type", "contribution_type": "gardening"}',
+                "not json",
+                "",
+                '{"title": "Docs", "contribution_type": "docs"}',
+                '{"title": "One too many", "contribution_type": "code"}',
+            ]
+        )
+        response = self.post(body, "application/x-ndjson")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual((response.data["created"], response.data["failed"]), (2, 3))
+        self.assertFalse(response.data["errors_truncated"])
+        errors = {error["row"]: error["errors"] for error in response.data["errors"]}
+        self.assertEqual(sorted(errors), [2, 3, 6])
+        self.assertIn("contribution_type", errors[2])
+        self.assertEqual(
+            errors[6], {"non_field_errors": ["No contribution credit available."]}
+        )
+
+        self.assertEqual(available_credits(self.user.pk), 0)
+        self.assertEqual(available_requests(self.user.pk).count(), 0)
+        old = Contribution.objects.get(user=self.user, title="Old fix")
+        self.assertEqual(old.created_at, datetime(2023, 1, 5, 10, tzinfo=dt_timezone.utc))
+        self.assertEqual(
+            ContributionDailyRollup.objects.get(user=self.user, contribution_type="bugfix").day,
+            timezone.localdate(old.created_at),
+        )
+
+    def test_csv_rows_are_numbered_from_the_header(self):
+        body = (
+            "title,contribution_type,is_public\r\n"
+            "Guide,docs,false\r\n"
+            ",code,true\r\n"
+        )
+        response = self.post(body, "text/csv")
+
+        self.assertEqual((response.data["created"], response.data["failed"]), (1, 1))
+        self.assertEqual(response.data["errors"][0]["row"], 3)
+        self.assertIn("title", response.data["errors"][0]["errors"])
+        self.assertFalse(Contribution.objects.get(user=self.user).is_public)
+        self.assertEqual(available_credits(self.user.pk), 1)
+
+    def test_unsupported_content_type_is_rejected(self):
+        response = self.post('{"title": "x"}', "application/json")
+        self.assertEqual(response.status_code, 415)
+        self.assertFalse(Contribution.objects.exists())
+
+
+class ContributionExportTests(TestCase):
+    def setUp(self):
+        self.user = make_user("alice")
+        now = timezone.now()
+        self.contributions = []
+        for i, contribution_type in enumerate(["code", "docs", "code"]):
+            contribution = Contribution.objects.create(
+                user=self.user, title=f"#{i}, \"quoted\"", contribution_type=contribution_type
+            )
+            Contribution.objects.filter(pk=contribution.pk).update(
+                created_at=now - timedelta(days=3 - i)
+            )
+            self.contributions.append(contribution)
+        Contribution.objects.create(
+            user=make_user("bob"), title="not mine", contribution_type="code"
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def download(self, url):
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return response, b"".join(response.streaming_content)
+
+    def test_csv_lists_own_rows_oldest_first(self):
+        response, body = self.download("/api/contributions/export/csv/")
+
+        self.assertEqual(response["Content-Type"], "text/csv")
+        self.assertIn('filename="contributions.csv"', response["Content-Disposition"])
+        rows = list(csv.DictReader(StringIO(body.decode())))
+        self.assertEqual([int(row["id"]) for row in rows], [c.pk for c in self.contributions])
+        self.assertEqual(rows[0]["title"], '#0, "quoted"')
+        self.assertEqual(set(rows[0]), set(EXPORT_FIELDS))
+
+    def test_gzipped_ndjson_applies_filters(self):
+        response, body = self.download(
+            "/api/contributions/export/ndjson.gz/?contribution_type=code"
+        )
+
+        self.assertEqual(response["Content-Type"], "application/gzip")
+        self.assertIn('filename="contributions.ndjson.gz"', response["Content-Disposition"])
+        rows = [json.loads(line) for line in gzip.decompress(body).decode().splitlines()]
+        self.assertEqual(
+            [row["id"] for row in rows], [self.contributions[0].pk, self.contributions[2].pk]
+        )
+        self.assertEqual({row["contribution_type"] for row in rows}, {"code"})
+
+    def test_unknown_format_is_not_found(self):
+        for export_format in ("xml", "csv.zip"):
+            response = self.client.get(f"/api/contributions/export/{export_format}/")
+            self.assertEqual(response.status_code, 404)
+
+
+class PublicFeedCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = make_user("alice")
+        self.first = Contribution.objects.create(
+            user=self.user, title="first", contribution_type="code"
+        )
+        self.client = APIClient()
+
+    def titles(self):
+        response = self.client.get("/api/contributions/public/")
+        return [row["title"] for row in response.data["results"]]
+
+    def test_first_page_is_cached_until_a_write(self):
+        self.assertEqual(self.titles(), ["first"])
+        with self.assertNumQueries(0):
+            self.assertEqual(self.titles(), ["first"])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Contribution.objects.create(
+                user=self.user, title="second", contribution_type="docs"
+            )
+        self.assertEqual(self.titles(), ["second", "first"])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.first.is_public = False
+            self.first.save()
+        self.assertEqual(self.titles(), ["second"])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Contribution.objects.filter(title="second").delete()
+        self.assertEqual(self.titles(), [])
+
+    def test_requests_with_parameters_bypass_the_cache(self):
+        self.titles()
+        Contribution.objects.create(user=self.user, title="second", contribution_type="docs")
+        rows = self.client.get("/api/contributions/public/?page_size=5").data["results"]
+        self.assertEqual([row["title"] for row in rows], ["second", "first"])
+
+
+class ContributionActivityTests(TestCase):
+    def setUp(self):
+        self.user = make_user("alice")
+        self.today = timezone.localdate()
+        self.contributions = [
+            Contribution.objects.create(user=self.user, title=f"#{i}", contribution_type=kind)
+            for i, kind in enumerate(["code", "code", "docs", "bugfix"])
+        ]
+        Contribution.objects.create(
+            user=make_user("bob"), title="not mine", contribution_type="code"
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def activity(self, query=""):
+        response = self.client.get(f"/api/contributions/activity/{query}")
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def test_writes_move_contributions_between_buckets(self):
+        # Retyped, moved ten days back, and deleted
+        self.contributions[2].contribution_type = "code"
+        self.contributions[2].save()
+        self.contributions[3].created_at = timezone.now() - timedelta(days=10)
+        self.contributions[3].save()
+        self.contributions[1].delete()
+
+        data = self.activity("?days=30")
+        self.assertEqual(data["total"], 3)
+        self.assertEqual(data["by_type"], {"code": 2, "bugfix": 1})
+        self.assertEqual(
+            [(row["day"], row["count"]) for row in data["days"]],
+            [(self.today - timedelta(days=10), 1), (self.today, 2)],
+        )
+        self.assertEqual(data["end"], self.today)
+        self.assertEqual(data["start"], self.today - timedelta(days=29))
+
+        week = self.activity("?days=7&contribution_type=code")
+        self.assertEqual((week["total"], week["by_type"]), (2, {"code": 2}))
+        self.assertEqual([row["day"] for row in week["days"]], [self.today])
 
-# Create your tests here.
+    def test_days_is_validated_and_clamped(self):
+        response = self.client.get("/api/contributions/activity/?days=week")
+        self.assertEqual(response.status_code, 400)
+        data = self.activity("?days=5000")
+        self.assertEqual(data["start"], self.today - timedelta(days=365))
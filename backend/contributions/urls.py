@@ -4,6 +4,10 @@ from . import views
 urlpatterns = [    
     # Contributions CRUD
     path("", views.ContributionListCreateView.as_view(), name="contribution-list-create"),
+    path("public/", views.PublicContributionFeedView.as_view(), name="contribution-public-feed"),
+    path("activity/", views.ContributionActivityView.as_view(), name="contribution-activity"),
+    path("export/<str:export_format>/", views.ContributionExportView.as_view(), name="contribution-export"),
+    path("import/", views.ContributionImportView.as_view(), name="contribution-import"),
 
     # Requests - list all requests involving the user (incoming/outgoing)
     path("requests/", views.ContributionRequestListCreateView.as_view(), name="contribution-requests"),
@@ -12,10 +16,16 @@ urlpatterns = [
     path("requests/accepted/", views.ContributionRequestAcceptedCheck.as_view(), name="contribution-request-accepted"),
     path("requests/allowed/", views.HasAcceptedRequestView.as_view(), name="contribution-request-allowed"),
 
+    # Incoming + outgoing with status counts in one round trip
+    path("requests/inbox/", views.ContributionRequestInboxView.as_view(), name="contribution-request-inbox"),
+
     # Incoming/outgoing helpers
     path("requests/incoming/", views.incoming_requests, name="incoming-requests"),
     path("requests/outgoing/", views.outgoing_requests, name="outgoing-requests"),
 
+    # Accept / Reject many requests at once (by ids or filter)
+    path("requests/batch/", views.ContributionRequestBatchView.as_view(), name="contribution-request-batch"),
+
     # Accept / Reject specific request
     path("requests/<int:pk>/accept/", views.ContributionRequestAcceptView.as_view(), name="accept-request"),
     path("requests/<int:pk>/reject/", views.ContributionRequestRejectView.as_view(), name="reject-request"),
@@ -1,13 +1,33 @@
+import codecs
+import csv
+from datetime import timedelta
+
 from rest_framework import generics, permissions, status
 from rest_framework.response import Response
 from rest_framework.views import APIView
+from django.http import StreamingHttpResponse
 from django.shortcuts import get_object_or_404
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
-from django.db.models import Q
-
-from .models import Contribution, ContributionRequest
-from .serializers import ContributionSerializer, ContributionRequestSerializer
+from rest_framework.exceptions import PermissionDenied, ValidationError
+from django.db import transaction
+from django.db.models import Count, Q, Sum
+from django.utils import timezone
+
+from devcred.pagination import CreatedAtCursorPagination
+from .batch import respond_to_requests
+from .entitlements import consume_credits, is_contribution_allowed
+from .feed import cache_first_page, get_cached_first_page
+from .exports import EXPORT_FORMATS, export_stream
+from .filters import filter_contributions
+from .importers import ContributionImporter, iter_csv_rows, iter_ndjson_rows
+from .models import Contribution, ContributionDailyRollup, ContributionRequest
+from .serializers import (
+    ContributionSerializer,
+    ContributionRequestBatchSerializer,
+    ContributionRequestSerializer,
+    PublicContributionSerializer,
+)
 
 
 @api_view(["GET"])
@@ -19,41 +39,194 @@ def allowed_request_view(request):
       - Allowed if user has at least one accepted request (accepted=True, used=False).
       - Locked if all accepted requests are already used.
     """
-    has_valid_request = ContributionRequest.objects.filter(
-        recipient=request.user, accepted=True, used=False
-    ).exists()
-    return Response({"allowed": has_valid_request})
+    return Response({"allowed": is_contribution_allowed(request.user)})
 
 
 class ContributionListCreateView(generics.ListCreateAPIView):
     """
     List and create contributions for the logged-in user.
-    - GET → return only the current user's contributions.
-    - POST → create a new contribution and consume an unused request.
+    - GET → return the current user's contributions, newest first, with
+      cursor pagination and optional filters: contribution_type,
+      is_public, created_after, created_before.
+    - POST → consume an unused accepted request and create a new contribution.
     """
 
     serializer_class = ContributionSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = CreatedAtCursorPagination
 
     def get_queryset(self):
         # Users can only view their own contributions
-        return Contribution.objects.filter(user=self.request.user)
+        queryset = Contribution.objects.filter(user=self.request.user).select_related(
+            "user"
+        )
+        return filter_contributions(queryset, self.request.query_params)
 
     def perform_create(self, serializer):
-        # Save contribution with current user as the owner
-        serializer.save(user=self.request.user)
+        with transaction.atomic():
+            # Spend one credit (and the oldest accepted request) atomically
+            if not consume_credits(self.request.user.pk):
+                raise PermissionDenied(
+                    "You need an accepted contribution request to log a contribution."
+                )
+            # Save contribution with current user as the owner
+            serializer.save(user=self.request.user)
+
+
+class PublicContributionFeedView(generics.ListAPIView):
+    """
+    Global feed of public contributions, newest first, with cursor pagination.
+    Open to anonymous visitors. The default first page is served from a
+    short-lived cache that is dropped on every contribution write.
+    """
+
+    serializer_class = PublicContributionSerializer
+    permission_classes = [permissions.AllowAny]
+    authentication_classes = []
+    pagination_class = CreatedAtCursorPagination
+
+    def get_queryset(self):
+        return Contribution.objects.filter(is_public=True).select_related("user")
 
-        # Consume the oldest accepted request (mark it as used)
-        req = (
-            ContributionRequest.objects.filter(
-                recipient=self.request.user, accepted=True, used=False
+    def list(self, request, *args, **kwargs):
+        # Only the plain landing-page request is cached
+        if request.query_params:
+            return super().list(request, *args, **kwargs)
+
+        data = get_cached_first_page()
+        if data is None:
+            data = super().list(request, *args, **kwargs).data
+            cache_first_page(data)
+        return Response(data)
+
+
+class ContributionActivityView(APIView):
+    """
+    GET /api/contributions/activity/?days=365[&contribution_type=code]
+    Daily contribution counts for the logged-in user's activity heatmap,
+    read from the precomputed rollups: one row per active day plus
+    per-type totals for the same window.
+    """
+
+    permission_classes = [permissions.IsAuthenticated]
+
+    max_days = 366
+
+    def get(self, request):
+        try:
+            days = int(request.query_params.get("days", 365))
+        except ValueError:
+            return Response({"detail": "days must be an integer."}, status=400)
+        days = max(1, min(days, self.max_days))
+
+        end = timezone.localdate()
+        start = end - timedelta(days=days - 1)
+        rollups = ContributionDailyRollup.objects.filter(
+            user=request.user, day__gte=start, day__lte=end, count__gt=0
+        )
+
+        contribution_type = request.query_params.get("contribution_type")
+        if contribution_type:
+            rollups = rollups.filter(contribution_type=contribution_type)
+
+        series = (
+            rollups.order_by("day").values("day").annotate(count=Sum("count"))
+        )
+        by_type = dict(
+            rollups.order_by()
+            .values("contribution_type")
+            .annotate(total=Sum("count"))
+            .values_list("contribution_type", "total")
+        )
+        return Response(
+            {
+                "start": start,
+                "end": end,
+                "total": sum(by_type.values()),
+                "by_type": by_type,
+                "days": list(series),
+            }
+        )
+
+
+class ContributionExportView(APIView):
+    """
+    GET /api/contributions/export/<format>/
+    Download the logged-in user's full contribution ledger as csv, ndjson
+    or json, or gzip-compressed with a ".gz" suffix (e.g. csv.gz).
+    Accepts the same filters as the listing. The response is streamed, so
+    memory use does not grow with the number of rows.
+    """
+
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request, export_format):
+        base_format, _, suffix = export_format.partition(".")
+        if base_format not in EXPORT_FORMATS or suffix not in ("", "gz"):
+            return Response(
+                {"detail": "Use csv, ndjson or json, optionally with .gz."},
+                status=status.HTTP_404_NOT_FOUND,
             )
-            .order_by("created_at")
-            .first()
+        compress = suffix == "gz"
+
+        queryset = filter_contributions(
+            Contribution.objects.filter(user=request.user), request.query_params
+        ).order_by("created_at", "id")
+
+        _, content_type, extension = EXPORT_FORMATS[base_format]
+        filename = f"contributions.{extension}"
+        if compress:
+            content_type = "application/gzip"
+            filename += ".gz"
+
+        response = StreamingHttpResponse(
+            export_stream(queryset, base_format, compress=compress),
+            content_type=content_type,
         )
-        if req:
-            req.used = True
-            req.save()
+        response["Content-Disposition"] = f'attachment; filename="{filename}"'
+        return response
+
+
+class ContributionImportView(APIView):
+    """
+    Bulk-import contributions for the logged-in user.
+    POST a body of newline-delimited JSON (Content-Type: application/x-ndjson)
+    or CSV with a header row (Content-Type: text/csv). Each row takes the
+    same fields as a single contribution plus an optional `created_at`,
+    and consumes one contribution credit. The body is parsed as a stream
+    and written in batches; the response reports per-row errors.
+    """
+
+    permission_classes = [permissions.IsAuthenticated]
+
+    readers = {
+        "application/x-ndjson": iter_ndjson_rows,
+        "application/ndjson": iter_ndjson_rows,
+        "application/jsonl": iter_ndjson_rows,
+        "text/csv": iter_csv_rows,
+    }
+
+    def post(self, request):
+        content_type = request.content_type.split(";")[0].strip().lower()
+        reader = self.readers.get(content_type)
+        if reader is None:
+            return Response(
+                {"detail": "Send application/x-ndjson or text/csv."},
+                status=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            )
+
+        # Read the raw body line by line instead of letting DRF buffer and parse it
+        lines = codecs.iterdecode(request.stream or [], "utf-8-sig")
+        importer = ContributionImporter(request.user, context={"request": request})
+        try:
+            report = importer.run(reader(lines))
+        except (UnicodeDecodeError, csv.Error) as e:
+            # Batches written before the bad line are kept and reported
+            return Response(
+                {**importer.report, "detail": f"Could not read body: {e}"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        return Response(report)
 
 
 class SendContributionRequestView(APIView):
@@ -117,17 +290,14 @@ class RespondContributionRequestView(APIView):
 
 class HasAcceptedRequestView(APIView):
     """
-    Checks if the current user has at least one accepted request.
+    Checks if the current user has at least one accepted, unused request.
     Useful for gating contribution creation.
     """
 
     permission_classes = [permissions.IsAuthenticated]
 
     def get(self, request):
-        has_request = ContributionRequest.objects.filter(
-            recipient=request.user, accepted=True
-        ).exists()
-        return Response({"allowed": has_request})
+        return Response({"allowed": is_contribution_allowed(request.user)})
 
 
 class ContributionRequestListView(generics.ListAPIView):
@@ -139,8 +309,10 @@ class ContributionRequestListView(generics.ListAPIView):
     permission_classes = [permissions.IsAuthenticated]
 
     def get_queryset(self):
-        return ContributionRequest.objects.filter(recipient=self.request.user).order_by(
-            "-created_at"
+        return (
+            ContributionRequest.objects.filter(recipient=self.request.user)
+            .select_related("sender", "recipient")
+            .order_by("-created_at")
         )
 
 
@@ -150,8 +322,10 @@ def incoming_requests(request):
     """
     Returns all requests where the logged-in user is the recipient.
     """
-    qs = ContributionRequest.objects.filter(recipient=request.user).order_by(
-        "-created_at"
+    qs = (
+        ContributionRequest.objects.filter(recipient=request.user)
+        .select_related("sender", "recipient")
+        .order_by("-created_at")
     )
     return Response(ContributionRequestSerializer(qs, many=True).data)
 
@@ -162,23 +336,79 @@ def outgoing_requests(request):
     """
     Returns all requests sent by the logged-in user.
     """
-    qs = ContributionRequest.objects.filter(sender=request.user).order_by("-created_at")
+    qs = (
+        ContributionRequest.objects.filter(sender=request.user)
+        .select_related("sender", "recipient")
+        .order_by("-created_at")
+    )
     return Response(ContributionRequestSerializer(qs, many=True).data)
 
 
+class ContributionRequestInboxView(generics.ListAPIView):
+    """
+    GET /api/contributions/requests/inbox/?direction=all|incoming|outgoing
+    One round trip for the requests page: a cursor-paginated list of the
+    user's incoming and/or outgoing requests, plus pending/accepted/used
+    counts for both directions computed in a single aggregate query.
+    """
+
+    serializer_class = ContributionRequestSerializer
+    permission_classes = [permissions.IsAuthenticated]
+    pagination_class = CreatedAtCursorPagination
+
+    directions = {
+        "incoming": lambda user: Q(recipient=user),
+        "outgoing": lambda user: Q(sender=user),
+        "all": lambda user: Q(sender=user) | Q(recipient=user),
+    }
+
+    def get_queryset(self):
+        user = self.request.user
+        direction = self.request.query_params.get("direction", "all")
+        if direction not in self.directions:
+            raise ValidationError({"direction": "Use all, incoming or outgoing."})
+        return ContributionRequest.objects.filter(
+            self.directions[direction](user)
+        ).select_related("sender", "recipient")
+
+    def get_status_counts(self):
+        user = self.request.user
+        statuses = {
+            "pending": Q(accepted=False, used=False),
+            "accepted": Q(accepted=True, used=False),
+            "used": Q(used=True),
+        }
+        sides = {"incoming": Q(recipient=user), "outgoing": Q(sender=user)}
+        totals = ContributionRequest.objects.filter(
+            Q(sender=user) | Q(recipient=user)
+        ).aggregate(
+            **{
+                f"{side}_{name}": Count("id", filter=side_q & status_q)
+                for side, side_q in sides.items()
+                for name, status_q in statuses.items()
+            }
+        )
+        return {
+            side: {name: totals[f"{side}_{name}"] for name in statuses}
+            for side in sides
+        }
+
+    def list(self, request, *args, **kwargs):
+        response = super().list(request, *args, **kwargs)
+        response.data["counts"] = self.get_status_counts()
+        return response
+
+
 class ContributionRequestAcceptedCheck(APIView):
     """
-    GET /api/contribution-requests/accepted/
-    Returns whether the current user has at least one accepted request.
+    GET /api/contributions/requests/accepted/
+    Returns whether the current user has at least one accepted, unused request.
     """
 
     permission_classes = [permissions.IsAuthenticated]
 
     def get(self, request):
-        has_request = ContributionRequest.objects.filter(
-            recipient=request.user, accepted=True
-        ).exists()
-        return Response({"allowed": has_request})
+        return Response({"allowed": is_contribution_allowed(request.user)})
 
 
 class ContributionRequestRejectView(APIView):
@@ -217,6 +447,32 @@ class ContributionRequestAcceptView(APIView):
         return Response({"status": "accepted"})
 
 
+class ContributionRequestBatchView(APIView):
+    """
+    POST /api/contributions/requests/batch/
+    Accept or reject many incoming requests in one transaction.
+    Body: {"action": "accept"|"reject", "ids": [1, 2, ...]}
+       or {"action": ..., "filter": {"status": "pending", "created_before": "..."}}
+    Returns a map of request id → accepted / rejected / unchanged / not_found.
+    """
+
+    permission_classes = [permissions.IsAuthenticated]
+
+    def post(self, request):
+        serializer = ContributionRequestBatchSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+
+        results = respond_to_requests(
+            request.user,
+            data["action"],
+            ids=data.get("ids"),
+            filters=data.get("filter"),
+        )
+        changed = sum(1 for outcome in results.values() if outcome in ("accepted", "rejected"))
+        return Response({"action": data["action"], "changed": changed, "results": results})
+
+
 class ContributionRequestListCreateView(generics.ListCreateAPIView):
     """
     GET → List requests where the user is sender or recipient.
@@ -228,9 +484,11 @@ class ContributionRequestListCreateView(generics.ListCreateAPIView):
 
     def get_queryset(self):
         user = self.request.user
-        return ContributionRequest.objects.filter(
-            Q(sender=user) | Q(recipient=user)
-        ).order_by("-created_at")
+        return (
+            ContributionRequest.objects.filter(Q(sender=user) | Q(recipient=user))
+            .select_related("sender", "recipient")
+            .order_by("-created_at")
+        )
 
     def perform_create(self, serializer):
         recipient_id = self.request.data.get("recipient_id")
@@ -242,18 +500,13 @@ class ContributionRequestListCreateView(generics.ListCreateAPIView):
 class ContributionRequestCheckView(APIView):
     """
     Checks if the user is allowed to add contributions.
-    Allowed only if there is an accepted ContributionRequest created via messaging.
+    Allowed if there is an accepted, unused ContributionRequest.
     """
 
     permission_classes = [permissions.IsAuthenticated]
 
     def get(self, request):
-        allowed = ContributionRequest.objects.filter(
-            recipient=request.user,
-            accepted=True,
-            via_message=True,
-        ).exists()
-        return Response({"allowed": allowed})
+        return Response({"allowed": is_contribution_allowed(request.user)})
 
 
 class ContributionDetailView(generics.RetrieveUpdateDestroyAPIView):
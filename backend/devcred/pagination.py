@@ -0,0 +1,45 @@
+"""
+Shared DRF pagination classes.
+
+Cursor (keyset) pagination keeps every page at constant cost: the database
+seeks to the cursor position through an index instead of counting and
+skipping rows like OFFSET does.
+"""
+
+from rest_framework.pagination import CursorPagination
+
+
+class CreatedAtCursorPagination(CursorPagination):
+    """Newest-first keyset pagination for models with a `created_at` column."""
+
+    ordering = ("-created_at", "-id")
+    page_size = 50
+    page_size_query_param = "page_size"
+    max_page_size = 200
+
+
+class CredibilityCursorPagination(CursorPagination):
+    """Most credible first; backs the endorsement leaderboard (UserStats rows)."""
+
+    ordering = ("-credibility_score", "-pk")
+    page_size = 50
+    page_size_query_param = "page_size"
+    max_page_size = 200
+
+
+class UserCursorPagination(CursorPagination):
+    """Newest-first keyset pagination for the user directory."""
+
+    ordering = ("-date_joined", "-id")
+    page_size = 50
+    page_size_query_param = "page_size"
+    max_page_size = 200
+
+
+class ConversationCursorPagination(CursorPagination):
+    """Most recently active conversation first."""
+
+    ordering = ("-updated_at", "-id")
+    page_size = 30
+    page_size_query_param = "page_size"
+    max_page_size = 100
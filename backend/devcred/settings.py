@@ -12,6 +12,9 @@ import os
 
 GITHUB_TOKEN = os.getenv("GITHUB_TOKEN", "")
 
+# Seconds before a cached GitHub repo count is refreshed in the background
+GITHUB_REPO_COUNT_TTL = config("GITHUB_REPO_COUNT_TTL", default=3600, cast=int)
+
 # Root path of the project
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -54,6 +57,7 @@ INSTALLED_APPS = [
     'integrations',
     'corsheaders',
     'messaging',
+    'search',
 ]
 
 
@@ -104,6 +108,16 @@ DATABASES = {
         'PORT': config("DB_PORT"),
     }
 }
+
+# Process-local cache by default; point this at Redis/Memcached in production
+# so every worker shares cached values and refresh locks
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'devcred',
+    }
+}
+
 CORS_ALLOWED_ORIGINS=[
     'http://localhost:3000',
 
@@ -0,0 +1,23 @@
+"""
+Helpers shared by the apps' test modules.
+"""
+
+from django.contrib.auth import get_user_model
+
+
+def make_user(username, **fields):
+    """Create a user with a unique email and a throwaway password."""
+    return get_user_model().objects.create_user(
+        username=username, email=f"{username}@example.com", password="pw-12345678", **fields
+    )
+
+
+def walk_pages(client, url):
+    """GET `url` and every `next` page after it; returns all result rows."""
+    rows = []
+    while url:
+        response = client.get(url)
+        assert response.status_code == 200, response.data
+        rows.extend(response.data["results"])
+        url = response.data["next"]
+    return rows
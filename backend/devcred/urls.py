@@ -17,6 +17,7 @@ urlpatterns = [
     path('api/integrations/', include('integrations.urls')),    # GitHub API integrations
     path('api/resume/', include('resume.urls')),                # resume generator
     path('api/messaging/', include('messaging.urls')),          # chat/messages
+    path('api/search/', include('search.urls')),                # unified search
 
     # For media streaming
     path('', include('videos.urls')),  # so /media-stream works
@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class EndorsementsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'endorsements'
+
+    def ready(self):
+        # Register signal handlers
+        from . import signals  # noqa: F401
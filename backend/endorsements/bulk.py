@@ -0,0 +1,80 @@
+"""
+Endorse many of a user's contributions in one request.
+
+Targets are validated and existing endorsements found with one query each,
+the rest are inserted with a single bulk_create, and the endorsed user's
+counters are updated once for the whole batch. bulk_create skips
+post_save, so the work of the endorsement signal handlers is done here
+explicitly.
+"""
+
+from django.db import IntegrityError, transaction
+
+from contributions.models import Contribution
+from users.profiles import invalidate_profile_document
+from users.recommendations import mark_recommendations_stale
+from users.stats import adjust_user_stats
+from .models import Endorsement
+
+# Re-checks after a concurrent duplicate before the request fails
+INSERT_ATTEMPTS = 3
+
+
+def endorse_contributions(endorser, endorsed_user_id, contribution_ids, message=""):
+    """
+    Endorse the given contributions of `endorsed_user_id` on behalf of
+    `endorser`. Returns {contribution_id: outcome}, where outcome is
+    "created", "duplicate" (already endorsed by this user) or "not_found"
+    (no such contribution owned by the endorsed user).
+    """
+    contribution_ids = list(dict.fromkeys(contribution_ids))
+    valid = set(
+        Contribution.objects.filter(
+            pk__in=contribution_ids, user_id=endorsed_user_id
+        ).values_list("pk", flat=True)
+    )
+
+    with transaction.atomic():
+        for attempt in range(INSERT_ATTEMPTS):
+            existing = set(
+                Endorsement.objects.filter(
+                    endorsed_user_id=endorsed_user_id,
+                    endorsed_by=endorser,
+                    contribution_id__in=valid,
+                ).values_list("contribution_id", flat=True)
+            )
+            new_ids = [pk for pk in contribution_ids if pk in valid and pk not in existing]
+            try:
+                # No ignore_conflicts: every row that goes in is ours, so the
+                # outcomes and the score delta are exact. A concurrent
+                # duplicate fails the statement and the batch is re-checked.
+                with transaction.atomic():
+                    Endorsement.objects.bulk_create(
+                        [
+                            Endorsement(
+                                endorsed_user_id=endorsed_user_id,
+                                endorsed_by=endorser,
+                                contribution_id=pk,
+                                message=message,
+                            )
+                            for pk in new_ids
+                        ]
+                    )
+                break
+            except IntegrityError:
+                if attempt == INSERT_ATTEMPTS - 1:
+                    raise
+        if new_ids:
+            adjust_user_stats(endorsed_user_id, endorsement_score=len(new_ids))
+            invalidate_profile_document(endorsed_user_id)
+            mark_recommendations_stale(endorsed_user_id, endorser.pk)
+
+    results = {}
+    for pk in contribution_ids:
+        if pk not in valid:
+            results[pk] = "not_found"
+        elif pk in existing:
+            results[pk] = "duplicate"
+        else:
+            results[pk] = "created"
+    return results
@@ -0,0 +1,61 @@
+import logging
+import time
+
+from django.core.management.base import BaseCommand
+
+from endorsements.credibility import graph_fingerprint, refresh_credibility
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    """
+    Recompute every user's credibility score from the endorsement graph.
+    Starts from a uniform vector unless --warm-start is given. With --loop
+    the command keeps running and re-ranks (warm-started) only when the
+    endorsement table changed since the previous pass, so any number of
+    new endorsements between passes costs a single refresh.
+    """
+
+    help = "Recompute endorsement-graph credibility scores for all users."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--warm-start",
+            action="store_true",
+            help="Start from the stored scores instead of a uniform vector.",
+        )
+        parser.add_argument(
+            "--loop",
+            type=int,
+            default=0,
+            metavar="SECONDS",
+            help="Run continuously, checking for endorsement changes this often.",
+        )
+
+    def handle(self, *args, **options):
+        if not options["loop"]:
+            self.report(refresh_credibility(warm_start=options["warm_start"]))
+            return
+
+        warm_start = options["warm_start"]
+        last_fingerprint = None
+        while True:
+            try:
+                fingerprint = graph_fingerprint()
+                if fingerprint != last_fingerprint:
+                    self.report(refresh_credibility(warm_start=warm_start))
+                    last_fingerprint = fingerprint
+                    warm_start = True
+            except Exception:
+                # Keep the worker alive; the next pass retries
+                logger.exception("Credibility refresh failed")
+            time.sleep(options["loop"])
+
+    def report(self, summary):
+        self.stdout.write(
+            self.style.SUCCESS(
+                "Ranked {users} users over {edges} edges in {iterations} "
+                "iterations ({updated} updated, {seconds}s).".format(**summary)
+            )
+        )
@@ -0,0 +1,24 @@
+# Generated by Django 5.0.3 on 2026-10-16 22:47
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contributions', '0011_contribution_proof_checked_at_and_more'),
+        ('endorsements', '0002_alter_endorsement_unique_together_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='endorsement',
+            index=models.Index(fields=['endorsed_user', 'created_at'], name='endorse_user_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='endorsement',
+            index=models.Index(fields=['endorsed_by', 'created_at'], name='endorse_by_created_idx'),
+        ),
+    ]
@@ -42,6 +42,15 @@ class Endorsement(models.Model):
         # Prevent duplicate endorsements: same endorser cannot endorse same user
         # for the same contribution more than once
         unique_together = ("endorsed_user", "endorsed_by", "contribution")
+        indexes = [
+            # Keyset pagination of received and given endorsements
+            models.Index(
+                fields=["endorsed_user", "created_at"], name="endorse_user_created_idx"
+            ),
+            models.Index(
+                fields=["endorsed_by", "created_at"], name="endorse_by_created_idx"
+            ),
+        ]
 
     def __str__(self):
         # Example: "alice -> bob (Contribution object)"
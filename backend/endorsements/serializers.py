@@ -1,19 +1,31 @@
 from rest_framework import serializers
+from django.contrib.auth import get_user_model
+from contributions.models import Contribution
+from users.models import UserStats
 from .models import Endorsement
 
+User = get_user_model()
+
 
 class EndorsementSerializer(serializers.ModelSerializer):
     """
     Serializer for the Endorsement model.
-    Handles both read-only username fields and validation to prevent self-endorsement.
+    Handles both read-only username fields and validation that an endorsed
+    contribution belongs to the endorsed user.
     """
 
     # Display human-readable usernames instead of raw user IDs
     endorsed_by_username = serializers.ReadOnlyField(source="endorsed_by.username")
     endorsed_user_username = serializers.ReadOnlyField(source="endorsed_user.username")
 
-    # Contribution should be handled as a PrimaryKey (id), not a CharField
-    contribution = serializers.CharField(required=False, allow_blank=True)
+    # Contribution is written and rendered by id; its title comes from the
+    # list view's select_related
+    contribution = serializers.PrimaryKeyRelatedField(
+        queryset=Contribution.objects.all(), required=False, allow_null=True
+    )
+    contribution_title = serializers.CharField(
+        source="contribution.title", read_only=True, allow_null=True
+    )
     message = serializers.CharField(required=False, allow_blank=True)
 
     class Meta:
@@ -25,7 +37,50 @@ class EndorsementSerializer(serializers.ModelSerializer):
             "endorsed_by",
             "endorsed_by_username",
             "contribution",
+            "contribution_title",
             "message",
             "created_at",
         ]
         read_only_fields = ["id", "endorsed_by", "created_at"]
+
+    def validate(self, attrs):
+        endorsed_user = attrs.get("endorsed_user", getattr(self.instance, "endorsed_user", None))
+        contribution = attrs.get("contribution")
+        if contribution is not None and contribution.user_id != getattr(endorsed_user, "pk", None):
+            raise serializers.ValidationError(
+                {"contribution": "This contribution does not belong to the endorsed user."}
+            )
+        return attrs
+
+
+class LeaderboardEntrySerializer(serializers.ModelSerializer):
+    """A user's row on the credibility leaderboard, read from their UserStats."""
+
+    id = serializers.IntegerField(source="user_id", read_only=True)
+    username = serializers.CharField(source="user.username", read_only=True)
+    profile_image = serializers.ImageField(source="user.profile_image", read_only=True)
+
+    class Meta:
+        model = UserStats
+        fields = [
+            "id",
+            "username",
+            "profile_image",
+            "endorsement_score",
+            "credibility_score",
+        ]
+        read_only_fields = fields
+
+
+class BulkEndorsementSerializer(serializers.Serializer):
+    """Input for endorsing several of one user's contributions at once."""
+
+    MAX_CONTRIBUTIONS = 200
+
+    endorsed_user = serializers.PrimaryKeyRelatedField(queryset=User.objects.all())
+    contributions = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        allow_empty=False,
+        max_length=MAX_CONTRIBUTIONS,
+    )
+    message = serializers.CharField(required=False, allow_blank=True, default="")
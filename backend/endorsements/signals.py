@@ -0,0 +1,24 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from users.profiles import invalidate_profile_document
+from users.recommendations import mark_recommendations_stale
+from users.stats import adjust_user_stats
+from .models import Endorsement
+
+
+@receiver(post_save, sender=Endorsement)
+def endorsement_saved(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        adjust_user_stats(instance.endorsed_user_id, endorsement_score=1)
+        invalidate_profile_document(instance.endorsed_user_id)
+        mark_recommendations_stale(instance.endorsed_user_id, instance.endorsed_by_id)
+
+
+@receiver(post_delete, sender=Endorsement)
+def endorsement_deleted(sender, instance, **kwargs):
+    # Also fires for cascades (deleted endorser or contribution), inside
+    # the deletion's transaction
+    adjust_user_stats(instance.endorsed_user_id, endorsement_score=-1)
+    invalidate_profile_document(instance.endorsed_user_id)
+    mark_recommendations_stale(instance.endorsed_user_id, instance.endorsed_by_id)
@@ -1,3 +1,236 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from contributions.models import Contribution
+from devcred.testing import make_user, walk_pages
+from users.models import UserStats
+from users.stats import rebuild_user_stats
+from .bulk import endorse_contributions
+from .credibility import graph_fingerprint, load_graph, refresh_credibility
+from .models import Endorsement
+
+User = get_user_model()
+
+
+def endorsement_score(user):
+    return UserStats.objects.get(pk=user.pk).endorsement_score
+
+
+class EndorsementScoreTests(TestCase):
+    def setUp(self):
+        self.alice = make_user("alice")
+        self.bob = make_user("bob")
+        self.carol = make_user("carol")
+        self.client = APIClient()
+        self.client.force_authenticate(self.bob)
+
+    def assertMatchesRecount(self, user):
+        self.assertEqual(
+            endorsement_score(user), rebuild_user_stats([user.pk])[0].endorsement_score
+        )
+
+    def test_score_follows_endorsements_and_cascades(self):
+        response = self.client.post("/api/endorsements/", {"endorsed_user": self.alice.pk})
+        self.assertEqual(response.status_code, 201)
+        Endorsement.objects.create(endorsed_user=self.alice, endorsed_by=self.carol)
+        self.assertEqual(endorsement_score(self.alice), 2)
+
+        # Deleting the endorser cascades to their endorsements
+        self.carol.delete()
+        self.assertEqual(endorsement_score(self.alice), 1)
+        self.assertMatchesRecount(self.alice)
+
+    def test_self_endorsement_is_rejected_without_counting(self):
+        response = self.client.post("/api/endorsements/", {"endorsed_user": self.bob.pk})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(endorsement_score(self.bob), 0)
+
+    def test_full_user_save_keeps_the_score(self):
+        stale = User.objects.get(pk=self.alice.pk)
+        Endorsement.objects.create(endorsed_user=self.alice, endorsed_by=self.bob)
+        # A profile edit from an instance loaded before the endorsement
+        stale.bio = "hello"
+        stale.save()
+        self.assertEqual(endorsement_score(self.alice), 1)
+
+    def test_api_reports_the_score(self):
+        contribution = Contribution.objects.create(
+            user=self.alice, title="PR", contribution_type="code"
+        )
+        Endorsement.objects.create(
+            endorsed_user=self.alice, endorsed_by=self.bob, contribution=contribution
+        )
+        response = self.client.get(f"/api/users/{self.alice.pk}/")
+        self.assertEqual(response.data["endorsement_score"], 1)
+        dashboard = APIClient()
+        dashboard.force_authenticate(self.alice)
+        self.assertEqual(dashboard.get("/api/users/dashboard/").data["endorsement_score"], 1)
+
+
+class EndorsementListTests(TestCase):
+    def setUp(self):
+        self.alice = make_user("alice")
+        self.bob = make_user("bob")
+        self.carol = make_user("carol")
+        self.contribution = Contribution.objects.create(
+            user=self.alice, title="PR", contribution_type="code"
+        )
+        self.received = [
+            Endorsement.objects.create(
+                endorsed_user=self.alice, endorsed_by=endorser, contribution=self.contribution
+            )
+            for endorser in (self.bob, self.carol)
+        ]
+        self.given = [Endorsement.objects.create(endorsed_user=self.bob, endorsed_by=self.alice)]
+        # Between other users; never listed for alice
+        Endorsement.objects.create(endorsed_user=self.carol, endorsed_by=self.bob)
+        self.client = APIClient()
+        self.client.force_authenticate(self.alice)
+
+    def ids(self, url):
+        return [row["id"] for row in walk_pages(self.client, url)]
+
+    def test_lists_both_sides_newest_first(self):
+        expected = sorted(self.received + self.given, key=lambda e: (e.created_at, e.pk))
+        self.assertEqual(
+            self.ids("/api/endorsements/?page_size=1"), [e.pk for e in reversed(expected)]
+        )
+
+    def test_role_narrows_to_one_side(self):
+        self.assertEqual(
+            set(self.ids("/api/endorsements/?role=received")), {e.pk for e in self.received}
+        )
+        self.assertEqual(self.ids("/api/endorsements/?role=given"), [self.given[0].pk])
+        response = self.client.get("/api/endorsements/?role=everyone")
+        self.assertEqual(response.status_code, 400)
+
+    def test_page_cost_does_not_grow_with_page_size(self):
+        with CaptureQueriesContext(connection) as small:
+            rows = self.client.get("/api/endorsements/?page_size=1").data["results"]
+        with CaptureQueriesContext(connection) as large:
+            self.client.get("/api/endorsements/?page_size=3")
+        self.assertEqual(len(small), len(large))
+        self.assertIn("contribution_title", rows[0])
+
+    def test_contribution_must_belong_to_the_endorsed_user(self):
+        self.client.force_authenticate(self.bob)
+        response = self.client.post(
+            "/api/endorsements/",
+            {"endorsed_user": self.carol.pk, "contribution": self.contribution.pk},
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("contribution", response.data)
+        self.assertFalse(Endorsement.objects.filter(contribution__user=self.carol).exists())
+
+        docs = Contribution.objects.create(user=self.alice, title="Docs", contribution_type="docs")
+        response = self.client.post(
+            "/api/endorsements/", {"endorsed_user": self.alice.pk, "contribution": docs.pk}
+        )
+        self.assertEqual(response.status_code, 201)
+
+
+class BulkEndorsementTests(TestCase):
+    def setUp(self):
+        self.alice = make_user("alice")
+        self.bob = make_user("bob")
+        self.contributions = [
+            Contribution.objects.create(user=self.alice, title=f"PR {i}", contribution_type="code")
+            for i in range(3)
+        ]
+        self.ids = [c.pk for c in self.contributions]
+
+    def assertScoreMatchesRecount(self):
+        self.assertEqual(
+            endorsement_score(self.alice), rebuild_user_stats([self.alice.pk])[0].endorsement_score
+        )
+
+    def test_outcomes_and_score_count_each_endorsement_once(self):
+        Endorsement.objects.create(
+            endorsed_user=self.alice, endorsed_by=self.bob, contribution=self.contributions[0]
+        )
+        results = endorse_contributions(self.bob, self.alice.pk, self.ids + [0])
+        self.assertEqual(
+            [results[pk] for pk in self.ids + [0]],
+            ["duplicate", "created", "created", "not_found"],
+        )
+        self.assertEqual(endorsement_score(self.alice), 3)
+        self.assertScoreMatchesRecount()
+
+    def test_concurrent_duplicate_is_not_counted_twice(self):
+        # Another request endorses the first contribution after this batch
+        # looked for existing endorsements but before it inserted
+        Endorsement.objects.create(
+            endorsed_user=self.alice, endorsed_by=self.bob, contribution=self.contributions[0]
+        )
+        real_filter = Endorsement.objects.filter
+        reads = []
+
+        def first_read_misses_it(*args, **kwargs):
+            reads.append(None)
+            queryset = real_filter(*args, **kwargs)
+            return queryset.none() if len(reads) == 1 else queryset
+
+        with mock.patch.object(Endorsement.objects, "filter", first_read_misses_it):
+            results = endorse_contributions(self.bob, self.alice.pk, self.ids)
+
+        self.assertEqual(results[self.ids[0]], "duplicate")
+        self.assertEqual(endorsement_score(self.alice), 3)
+        self.assertScoreMatchesRecount()
+
+
+class CredibilityTests(TestCase):
+    def setUp(self):
+        self.alice = make_user("alice")
+        self.bob = make_user("bob")
+        self.carol = make_user("carol")
+        Endorsement.objects.create(endorsed_user=self.alice, endorsed_by=self.bob)
+        Endorsement.objects.create(endorsed_user=self.alice, endorsed_by=self.carol)
+
+    def test_refresh_writes_stats_and_orders_the_leaderboard(self):
+        summary = refresh_credibility(warm_start=False)
+        self.assertEqual((summary["users"], summary["edges"]), (3, 2))
+
+        client = APIClient()
+        client.force_authenticate(self.bob)
+        rows = client.get("/api/endorsements/leaderboard/").data["results"]
+        self.assertEqual(rows[0]["id"], self.alice.pk)
+        self.assertEqual(rows[0]["endorsement_score"], 2)
+        self.assertGreater(rows[0]["credibility_score"], rows[1]["credibility_score"])
+
+    def test_user_signing_up_mid_load_is_left_for_the_next_pass(self):
+        loaded = [self.alice.pk, self.bob.pk, self.carol.pk]
+        dave = make_user("dave")
+        Endorsement.objects.create(endorsed_user=self.alice, endorsed_by=dave)
+        Endorsement.objects.create(endorsed_user=dave, endorsed_by=self.bob)
+
+        # The user list was read before dave's rows committed
+        with mock.patch("endorsements.credibility.User") as user_model:
+            user_model.objects.order_by.return_value.values_list.return_value = loaded
+            user_ids, sources, targets = load_graph()
+        self.assertEqual(user_ids.tolist(), loaded)
+        self.assertEqual(sorted(zip(sources.tolist(), targets.tolist())), [(1, 0), (2, 0)])
+
+    def test_full_user_save_keeps_the_score(self):
+        stale = User.objects.get(pk=self.alice.pk)
+        refresh_credibility(warm_start=False)
+        stale.bio = "hello"
+        stale.save()
+        self.assertGreater(UserStats.objects.get(pk=self.alice.pk).credibility_score, 1)
+
+    def test_endorsing_does_not_rank_in_the_request(self):
+        with mock.patch("endorsements.credibility.refresh_credibility") as refresh:
+            Endorsement.objects.create(endorsed_user=self.bob, endorsed_by=self.alice)
+        refresh.assert_not_called()
 
-# Create your tests here.
+    def test_fingerprint_changes_on_add_and_delete(self):
+        before = graph_fingerprint()
+        endorsement = Endorsement.objects.create(endorsed_user=self.bob, endorsed_by=self.alice)
+        added = graph_fingerprint()
+        endorsement.delete()
+        self.assertNotEqual(before, added)
+        self.assertNotEqual(added, graph_fingerprint())
@@ -1,7 +1,15 @@
 from django.urls import path
-from .views import EndorsementListCreateView
+from .views import (
+    BulkEndorsementView,
+    CredibilityLeaderboardView,
+    EndorsementListCreateView,
+)
 
 urlpatterns = [
     # Endpoint for listing all endorsements and creating a new one
     path("", EndorsementListCreateView.as_view(), name="endorsement-list-create"),
+    # Endorse several contributions of one user at once
+    path("bulk/", BulkEndorsementView.as_view(), name="endorsement-bulk"),
+    # Users ranked by credibility score
+    path("leaderboard/", CredibilityLeaderboardView.as_view(), name="endorsement-leaderboard"),
 ]
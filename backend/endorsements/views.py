@@ -1,7 +1,16 @@
 from rest_framework import generics, permissions, serializers
-from django.db import models
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from django.db import models, transaction
+from users.models import UserStats
 from .models import Endorsement
-from .serializers import EndorsementSerializer
+from .bulk import endorse_contributions
+from .serializers import (
+    BulkEndorsementSerializer,
+    EndorsementSerializer,
+    LeaderboardEntrySerializer,
+)
+from devcred.pagination import CreatedAtCursorPagination, CredibilityCursorPagination
 from django.contrib.auth import get_user_model
 
 User = get_user_model()
@@ -9,19 +18,32 @@ User = get_user_model()
 
 class EndorsementListCreateView(generics.ListCreateAPIView):
     """
-    List endorsements for the logged-in user (either given or received).
+    List endorsements for the logged-in user, newest first with cursor
+    pagination. `?role=given` or `?role=received` narrows the list to one
+    side; each is served by its own (user, created_at) index.
     Allow creating a new endorsement, but prevent self-endorsement.
-    Automatically updates endorsement_score of the endorsed user.
+    The endorsed user's UserStats.endorsement_score is incremented by a
+    signal handler in the same transaction as the insert.
     """
 
     permission_classes = [permissions.IsAuthenticated]
     serializer_class = EndorsementSerializer
+    pagination_class = CreatedAtCursorPagination
 
     def get_queryset(self):
         user = self.request.user
-        return Endorsement.objects.filter(
-            models.Q(endorsed_user=user) | models.Q(endorsed_by=user)
-        ).order_by("-created_at")
+        role = self.request.query_params.get("role")
+        if role == "received":
+            queryset = Endorsement.objects.filter(endorsed_user=user)
+        elif role == "given":
+            queryset = Endorsement.objects.filter(endorsed_by=user)
+        elif role in (None, ""):
+            queryset = Endorsement.objects.filter(
+                models.Q(endorsed_user=user) | models.Q(endorsed_by=user)
+            )
+        else:
+            raise serializers.ValidationError({"role": "Expected 'given' or 'received'."})
+        return queryset.select_related("endorsed_user", "endorsed_by", "contribution")
 
     def perform_create(self, serializer):
         endorsed_user = serializer.validated_data.get("endorsed_user")
@@ -30,11 +52,48 @@ class EndorsementListCreateView(generics.ListCreateAPIView):
         if self.request.user == endorsed_user:
             raise serializers.ValidationError("You cannot endorse yourself.")
 
-        # Save endorsement with current user as endorser
-        endorsement = serializer.save(endorsed_by=self.request.user)
+        # Save endorsement with current user as endorser; the score update
+        # commits or rolls back together with it
+        with transaction.atomic():
+            serializer.save(endorsed_by=self.request.user)
 
-        # Update endorsement score for the endorsed user
-        endorsed_user.endorsement_score = Endorsement.objects.filter(
-            endorsed_user=endorsed_user
-        ).count()
-        endorsed_user.save()
+
+class BulkEndorsementView(APIView):
+    """
+    POST /api/endorsements/bulk/
+    Endorse several of one user's contributions in a single transaction.
+    Body: {"endorsed_user": 7, "contributions": [1, 2, ...], "message": "..."}
+    Returns a map of contribution id → created / duplicate / not_found.
+    """
+
+    permission_classes = [permissions.IsAuthenticated]
+
+    def post(self, request):
+        serializer = BulkEndorsementSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+        endorsed_user = data["endorsed_user"]
+
+        if request.user == endorsed_user:
+            raise serializers.ValidationError("You cannot endorse yourself.")
+
+        results = endorse_contributions(
+            request.user, endorsed_user.pk, data["contributions"], data["message"]
+        )
+        created = sum(1 for outcome in results.values() if outcome == "created")
+        return Response(
+            {"endorsed_user": endorsed_user.pk, "created": created, "results": results}
+        )
+
+
+class CredibilityLeaderboardView(generics.ListAPIView):
+    """
+    Users ranked by endorsement-graph credibility, most credible first.
+    Served from the indexed UserStats.credibility_score column with cursor
+    pagination.
+    """
+
+    permission_classes = [permissions.IsAuthenticated]
+    serializer_class = LeaderboardEntrySerializer
+    pagination_class = CredibilityCursorPagination
+    queryset = UserStats.objects.select_related("user")
@@ -1,5 +1,14 @@
+import logging
+import re
 import requests
 
+logger = logging.getLogger(__name__)
+
+
+class GitHubUserNotFound(Exception):
+    """GitHub has no account with the requested username."""
+
+
 def fetch_github_repos(username: str):
     url = f"https://api.github.com/users/{username}/repos"
     response = requests.get(url)
@@ -25,3 +34,29 @@ def fetch_github_repos(username: str):
         "total_repos": len(project_repos),
         "projects": project_repos,
     }
+
+
+def scrape_github_repo_count(username: str):
+    """
+    Scrape the public repository count from a GitHub profile page.
+    Returns None when the page cannot be fetched or parsed, so callers
+    can keep their last known value, and raises GitHubUserNotFound when
+    the account does not exist.
+    """
+    url = f"https://github.com/{username}?tab=repositories"
+    try:
+        res = requests.get(url, timeout=5)
+    except requests.RequestException as e:
+        logger.warning("GitHub scrape failed for %s: %s", username, e)
+        return None
+    if res.status_code == 404:
+        raise GitHubUserNotFound(username)
+    if res.status_code == 200:
+        # "1 repository", "12 repositories", "1,024 repositories"
+        match = re.search(r"(\d[\d,]*)\s+repositor(?:y|ies)", res.text)
+        if match:
+            return int(match.group(1).replace(",", ""))
+    logger.warning(
+        "GitHub scrape found no repository count for %s (HTTP %s)", username, res.status_code
+    )
+    return None
@@ -0,0 +1,121 @@
+"""
+Cached GitHub repository counts with stale-while-revalidate semantics.
+
+`get_repo_count` never waits on GitHub: it returns the last known count
+(or None on a cold miss, so callers can tell "not fetched yet" from zero
+repositories) straight from the cache and hands stale or missing entries
+to a small background thread pool for refreshing. Entries are stored
+without expiry so a slow or failing GitHub never blanks a value, and a
+failed refresh holds its lock for REFRESH_ERROR_BACKOFF so an outage does
+not turn every request into another scrape. A username GitHub does not
+know is cached as NOT_FOUND, which is a result like any count and is
+rechecked on the same schedule, rather than being retried as pending.
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.cache import cache
+
+from .github_service import GitHubUserNotFound, scrape_github_repo_count
+
+REPO_COUNT_TTL = getattr(settings, "GITHUB_REPO_COUNT_TTL", 60 * 60)
+
+# Upper bound on how long a refresh may hold its lock before another
+# request is allowed to schedule it again
+REFRESH_LOCK_TIMEOUT = 60
+
+# After a failed refresh, no new one is scheduled for this long
+REFRESH_ERROR_BACKOFF = getattr(settings, "GITHUB_REPO_COUNT_ERROR_BACKOFF", 5 * 60)
+
+# Returned by get_repo_count for usernames GitHub does not know
+NOT_FOUND = "not_found"
+
+METRIC_NAMES = ("hit", "stale", "miss", "refresh", "refresh_error")
+
+_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="github-repo-count")
+
+
+def _entry_key(username):
+    return f"github:repo_count:{username.lower()}"
+
+
+def _lock_key(username):
+    return f"github:repo_count:refreshing:{username.lower()}"
+
+
+def _metric_key(name):
+    return f"github:repo_count:metrics:{name}"
+
+
+def _record(name):
+    key = _metric_key(name)
+    cache.add(key, 0, timeout=None)
+    try:
+        cache.incr(key)
+    except ValueError:
+        # Key evicted between add() and incr(); losing one sample is fine
+        pass
+
+
+def get_repo_count(username: str):
+    """
+    Return the cached repo count for a GitHub user without blocking,
+    NOT_FOUND if GitHub has no such user, or None if it has not been
+    fetched yet. Stale and missing entries are refreshed in the background.
+    """
+    entry = cache.get(_entry_key(username))
+    if entry is None:
+        _record("miss")
+        schedule_refresh(username)
+        return None
+
+    if time.time() - entry["fetched_at"] > REPO_COUNT_TTL:
+        _record("stale")
+        schedule_refresh(username)
+    else:
+        _record("hit")
+    return entry["count"]
+
+
+def schedule_refresh(username: str) -> bool:
+    """
+    Queue a background refresh unless one is already in flight.
+    Returns True if a refresh was scheduled.
+    """
+    if not cache.add(_lock_key(username), True, timeout=REFRESH_LOCK_TIMEOUT):
+        return False
+    _executor.submit(refresh_repo_count, username)
+    return True
+
+
+def refresh_repo_count(username: str):
+    """
+    Fetch the repo count from GitHub and store it. On failure the previous
+    value is kept and the refresh lock is held for REFRESH_ERROR_BACKOFF
+    instead of being released.
+    """
+    try:
+        count = scrape_github_repo_count(username)
+    except GitHubUserNotFound:
+        count = NOT_FOUND
+    if count is None:
+        _record("refresh_error")
+        # Keep the lock so requests do not schedule another scrape meanwhile
+        cache.set(_lock_key(username), True, timeout=REFRESH_ERROR_BACKOFF)
+        return None
+    cache.set(
+        _entry_key(username),
+        {"count": count, "fetched_at": time.time()},
+        timeout=None,
+    )
+    cache.delete(_lock_key(username))
+    _record("refresh")
+    return count
+
+
+def get_repo_count_metrics() -> dict:
+    """Return hit/stale/miss/refresh counters for the repo-count cache."""
+    values = cache.get_many([_metric_key(name) for name in METRIC_NAMES])
+    return {name: values.get(_metric_key(name), 0) for name in METRIC_NAMES}
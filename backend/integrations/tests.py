@@ -1,3 +1,74 @@
+from unittest import mock
+
+from django.core.cache import cache
 from django.test import TestCase
 
-# Create your tests here.
+from . import github_service, repo_counts
+
+
+@mock.patch.object(repo_counts, "_executor")
+class RepoCountCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_cold_miss_is_pending_not_zero(self, executor):
+        self.assertIsNone(repo_counts.get_repo_count("octocat"))
+        executor.submit.assert_called_once_with(repo_counts.refresh_repo_count, "octocat")
+
+    @mock.patch.object(repo_counts, "scrape_github_repo_count", return_value=0)
+    def test_zero_repositories_is_a_value(self, scrape, executor):
+        repo_counts.refresh_repo_count("octocat")
+        self.assertEqual(repo_counts.get_repo_count("octocat"), 0)
+
+    @mock.patch.object(
+        repo_counts,
+        "scrape_github_repo_count",
+        side_effect=github_service.GitHubUserNotFound("nobody"),
+    )
+    def test_unknown_user_is_cached_as_not_found(self, scrape, executor):
+        repo_counts.get_repo_count("nobody")
+        repo_counts.refresh_repo_count("nobody")
+        executor.reset_mock()
+
+        self.assertEqual(repo_counts.get_repo_count("nobody"), repo_counts.NOT_FOUND)
+        executor.submit.assert_not_called()
+        self.assertEqual(repo_counts.get_repo_count_metrics()["refresh_error"], 0)
+
+    @mock.patch.object(repo_counts, "scrape_github_repo_count", return_value=None)
+    def test_failed_refresh_backs_off(self, scrape, executor):
+        repo_counts.get_repo_count("octocat")
+        repo_counts.refresh_repo_count("octocat")
+        executor.reset_mock()
+
+        for _ in range(3):
+            self.assertIsNone(repo_counts.get_repo_count("octocat"))
+        executor.submit.assert_not_called()
+        self.assertEqual(repo_counts.get_repo_count_metrics()["refresh_error"], 1)
+
+
+@mock.patch.object(github_service.requests, "get")
+class RepoCountScrapeTests(TestCase):
+    def respond(self, get, status_code, text=""):
+        get.return_value = mock.Mock(status_code=status_code, text=text)
+
+    def test_singular_plural_and_grouped_counts(self, get):
+        for text, count in [
+            ("1 repository", 1),
+            ("12 repositories", 12),
+            ("1,024\n  repositories", 1024),
+        ]:
+            self.respond(get, 200, f"<span>{text}</span>")
+            self.assertEqual(github_service.scrape_github_repo_count("octocat"), count)
+
+    def test_missing_user_raises(self, get):
+        self.respond(get, 404)
+        with self.assertRaises(github_service.GitHubUserNotFound):
+            github_service.scrape_github_repo_count("nobody")
+
+    def test_failures_are_logged_and_return_none(self, get):
+        self.respond(get, 200, "no count here")
+        with self.assertLogs(github_service.logger, "WARNING"):
+            self.assertIsNone(github_service.scrape_github_repo_count("octocat"))
+        get.side_effect = github_service.requests.ConnectionError("down")
+        with self.assertLogs(github_service.logger, "WARNING"):
+            self.assertIsNone(github_service.scrape_github_repo_count("octocat"))
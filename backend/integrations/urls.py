@@ -1,10 +1,12 @@
 from django.urls import path
 from .views import GitHubProfileView
 from .views import GitHubRepoView
+from .views import GitHubRepoCountMetricsView
 
 
 urlpatterns = [
     path('github/', GitHubProfileView.as_view(), name='github-profile'),
     path("github-repos/", GitHubRepoView.as_view(), name="github-repos"),
+    path("github/repo-count/metrics/", GitHubRepoCountMetricsView.as_view(), name="github-repo-count-metrics"),
 
 ]
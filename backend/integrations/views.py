@@ -1,8 +1,10 @@
 from rest_framework.views import APIView
 from rest_framework.response import Response
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.permissions import IsAdminUser, IsAuthenticated
 import requests
 
+from .repo_counts import get_repo_count_metrics
+
 
 class GitHubProfileView(APIView):
     """
@@ -71,3 +73,14 @@ class GitHubRepoView(APIView):
             "total_repos": len(repo_list),
             "repositories": repo_list
         })
+
+
+class GitHubRepoCountMetricsView(APIView):
+    """
+    Exposes hit/miss/refresh counters for the cached dashboard repo counts.
+    Admin only.
+    """
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        return Response(get_repo_count_metrics())
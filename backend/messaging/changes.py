@@ -0,0 +1,104 @@
+"""
+Change values for delta sync of messages.
+
+Every insert or edit of a message stamps it with a change value
+(`Message.change_seq`), and every delete leaves a MessageTombstone with
+one. Clients page through changes in (change_seq, id) order with an
+opaque "<change_seq>-<id>" cursor, so several rows may share a value (a
+bulk mark-read stamps them all with one) and a page may end inside it.
+
+On PostgreSQL values come from a plain sequence, so writers never wait
+for each other. Values are handed out in call order but commit in any
+order, and a client must not move its cursor past a value whose
+transaction may still commit: `committed_change_seq` returns a mark at
+or below which every writer has finished, and sync only serves rows up
+to it. Writers take a transaction id before drawing a value, so when a
+snapshot taken after reading the sequence shows no transaction in
+progress, everything up to that reading is settled. When transactions
+are in progress, the mark falls back to an earlier reading whose racing
+transactions have all ended since. A long-running writing transaction
+anywhere in the database therefore delays sync until it ends, but never
+makes a client skip a change.
+
+Other databases (SQLite for local development) serialize writers, so the
+next value is the highest in use plus one, read once the write lock is
+held, and everything visible is settled.
+"""
+
+import threading
+from collections import deque
+
+from django.db import connection, transaction
+from django.db.models import Max
+
+from .models import Message, MessageTombstone
+
+CHANGE_SEQUENCE = "messaging_message_change_seq"
+
+# Sequence readings kept while waiting for their racing transactions to end
+MAX_PENDING_READINGS = 1000
+
+_lock = threading.Lock()
+# (sequence value, snapshot xmax) readings not yet known to be settled
+_pending = deque(maxlen=MAX_PENDING_READINGS)
+_settled = 0
+
+
+def next_change_seq(after=0):
+    """
+    Draw the next change value. Must run inside the transaction that
+    writes it. `after` is a value the new one must exceed even though its
+    row may be gone, such as a deleted message's own value.
+    """
+    if not transaction.get_connection().in_atomic_block:
+        raise RuntimeError("Change values must be drawn inside a transaction.")
+    with connection.cursor() as cursor:
+        if connection.vendor == "postgresql":
+            # Take a transaction id first, so a reader's snapshot shows the
+            # value's transaction as in progress until it ends
+            cursor.execute(
+                "SELECT nextval(%s::regclass) WHERE pg_current_xact_id() IS NOT NULL",
+                [CHANGE_SEQUENCE],
+            )
+            return cursor.fetchone()[0]
+        # A no-op write takes the database write lock before the read
+        cursor.execute(f"UPDATE {Message._meta.db_table} SET id = id WHERE 0 = 1")
+    values = [
+        Message.objects.aggregate(last=Max("change_seq"))["last"],
+        MessageTombstone.objects.aggregate(last=Max("change_seq"))["last"],
+    ]
+    return max(after, *(value or 0 for value in values)) + 1
+
+
+def committed_change_seq():
+    """
+    The highest change value clients may be sent: no transaction holding a
+    value at or below it can still commit. None when every visible value is
+    settled. Must not run inside a REPEATABLE READ transaction, which would
+    reuse an old snapshot.
+    """
+    global _settled
+    if connection.vendor != "postgresql":
+        return None
+    with connection.cursor() as cursor:
+        cursor.execute(f"SELECT last_value, is_called FROM {CHANGE_SEQUENCE}")
+        last_value, is_called = cursor.fetchone()
+        drawn = last_value if is_called else last_value - 1
+        # A separate statement, so the snapshot is taken after the reading
+        cursor.execute(
+            "SELECT pg_snapshot_xmin(s)::text::bigint, pg_snapshot_xmax(s)::text::bigint "
+            "FROM pg_current_snapshot() AS s"
+        )
+        xmin, xmax = cursor.fetchone()
+    with _lock:
+        if xmin == xmax:
+            # Nothing in progress: every drawn value has committed or rolled back
+            _pending.clear()
+            _settled = max(_settled, drawn)
+        else:
+            # Readings whose racing transactions (ids below their xmax) all ended
+            while _pending and _pending[0][1] <= xmin:
+                _settled = max(_settled, _pending.popleft()[0])
+            if not _pending or _pending[-1][0] != drawn:
+                _pending.append((drawn, xmax))
+        return _settled
@@ -0,0 +1,149 @@
+"""
+Maintenance of the materialized Conversation rows.
+
+Message signal handlers (and messaging/unread.py for bulk read changes,
+whose UPDATE skips signals) call these helpers inside the same
+transaction as the message write, so a conversation's last-message
+pointer, activity time and per-participant unread counters always agree
+with the message table.
+`rebuild_conversations` recomputes rows from messages and backs the
+`backfill_conversations` management command.
+"""
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Max, Q, Value
+from django.db.models.functions import Coalesce, Greatest, Least
+
+from .models import Conversation, Message
+
+
+def conversation_pair(user_id, other_id):
+    """The (user_a, user_b) key for two users: lower id first."""
+    return (user_id, other_id) if user_id <= other_id else (other_id, user_id)
+
+
+def _unread_field(pair, recipient_id):
+    return "unread_a" if recipient_id == pair[0] else "unread_b"
+
+
+def record_message(message):
+    """Upsert the pair's conversation for a newly created message."""
+    pair = conversation_pair(message.sender_id, message.recipient_id)
+    unread_field = _unread_field(pair, message.recipient_id)
+    unread = 0 if message.read else 1
+    updates = {
+        # Concurrent sends may commit out of order; never move backwards
+        "last_message_id": Coalesce(
+            Greatest(F("last_message_id"), Value(message.pk)), Value(message.pk)
+        ),
+        "updated_at": Greatest(F("updated_at"), Value(message.created_at)),
+        unread_field: F(unread_field) + unread,
+    }
+    conversations = Conversation.objects.filter(user_a_id=pair[0], user_b_id=pair[1])
+    if conversations.update(**updates):
+        return
+    try:
+        with transaction.atomic():
+            Conversation.objects.create(
+                user_a_id=pair[0],
+                user_b_id=pair[1],
+                last_message_id=message.pk,
+                updated_at=message.created_at,
+                **{unread_field: unread},
+            )
+    except IntegrityError:
+        # Another transaction created the row first
+        conversations.update(**updates)
+
+
+def adjust_conversation_unread(recipient_id, sender_id, delta):
+    """Shift the recipient's unread counter in the pair's conversation."""
+    if not delta:
+        return
+    pair = conversation_pair(sender_id, recipient_id)
+    unread_field = _unread_field(pair, recipient_id)
+    Conversation.objects.filter(user_a_id=pair[0], user_b_id=pair[1]).update(
+        **{unread_field: Greatest(F(unread_field) + delta, 0)}
+    )
+
+
+def message_removed(message):
+    """
+    Repoint the conversation after a message is deleted, or delete the
+    conversation when it was the pair's last message. Its unread counter
+    is adjusted by the caller through messaging/unread.py.
+    """
+    pair = conversation_pair(message.sender_id, message.recipient_id)
+    conversations = Conversation.objects.filter(user_a_id=pair[0], user_b_id=pair[1])
+    # Lock first: a concurrent send updates this row before it commits, so
+    # once the lock is ours its message is visible below
+    if not list(conversations.select_for_update().values_list("pk", flat=True)):
+        return
+    latest = (
+        Message.objects.filter(
+            Q(sender_id=pair[0], recipient_id=pair[1])
+            | Q(sender_id=pair[1], recipient_id=pair[0])
+        )
+        .exclude(pk=message.pk)
+        .order_by("-pk")
+        .values("pk", "created_at")
+        .first()
+    )
+    if latest is None:
+        conversations.delete()
+        return
+    # SET_NULL cleared the pointer if this was the last message; repoint it
+    # and move the activity time back to the new last message
+    conversations.filter(last_message__isnull=True).update(
+        last_message_id=latest["pk"], updated_at=latest["created_at"]
+    )
+
+
+def rebuild_conversations(user_ids):
+    """
+    Recompute the conversations whose lower-id participant is in
+    `user_ids` with one grouped query, then upsert them. Returns the
+    number of conversations written.
+    """
+    user_ids = list(user_ids)
+    if not user_ids:
+        return 0
+    rows = (
+        # The sender/recipient filter is indexed; the pair filter is not
+        Message.objects.filter(Q(sender_id__in=user_ids) | Q(recipient_id__in=user_ids))
+        .annotate(
+            pair_a=Least("sender_id", "recipient_id"),
+            pair_b=Greatest("sender_id", "recipient_id"),
+        )
+        .filter(pair_a__in=user_ids)
+        .order_by()
+        .values("pair_a", "pair_b")
+        .annotate(
+            last_id=Max("pk"),
+            last_at=Max("created_at"),
+            unread_a=Count("pk", filter=Q(read=False, recipient_id=F("pair_a"))),
+            # A note-to-self conversation counts its unread messages on side a only
+            unread_b=Count(
+                "pk",
+                filter=Q(read=False, recipient_id=F("pair_b")) & ~Q(sender_id=F("pair_b")),
+            ),
+        )
+    )
+    conversations = [
+        Conversation(
+            user_a_id=row["pair_a"],
+            user_b_id=row["pair_b"],
+            last_message_id=row["last_id"],
+            updated_at=row["last_at"],
+            unread_a=row["unread_a"],
+            unread_b=row["unread_b"],
+        )
+        for row in rows
+    ]
+    Conversation.objects.bulk_create(
+        conversations,
+        update_conflicts=True,
+        unique_fields=["user_a", "user_b"],
+        update_fields=["last_message", "updated_at", "unread_a", "unread_b"],
+    )
+    return len(conversations)
@@ -0,0 +1,43 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+
+from messaging.conversations import rebuild_conversations
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    """
+    Repair the materialized Conversation rows from the message table
+    (migration 0009 does the initial build). Users are processed in id-ordered batches; each batch rebuilds
+    the conversations whose lower-id participant is in the batch with one
+    grouped query and a single upsert.
+    """
+
+    help = "Recompute conversation last-message pointers and unread counters."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Number of users processed per batch (default: 1000).",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        last_id = 0
+        total = 0
+
+        while True:
+            user_ids = list(
+                User.objects.filter(pk__gt=last_id)
+                .order_by("pk")
+                .values_list("pk", flat=True)[:batch_size]
+            )
+            if not user_ids:
+                break
+            total += rebuild_conversations(user_ids)
+            last_id = user_ids[-1]
+
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {total} conversations."))
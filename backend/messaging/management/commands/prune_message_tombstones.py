@@ -0,0 +1,45 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from messaging.models import MessageTombstone
+
+
+class Command(BaseCommand):
+    """
+    Delete message tombstones older than the retention period. A client
+    whose sync cursor is older than that may miss deletions and must sync
+    again from "0"; the web client keeps its cursor only for the lifetime
+    of the page. Tombstones are deleted in id-ordered batches so no single
+    statement holds locks on the whole table.
+    """
+
+    help = "Delete message tombstones older than --days."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=30,
+            help="Keep tombstones for this many days (default: 30).",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=5000,
+            help="Number of tombstones deleted per batch (default: 5000).",
+        )
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(days=options["days"])
+        expired = MessageTombstone.objects.filter(deleted_at__lt=cutoff).order_by("pk")
+        total = 0
+
+        while True:
+            ids = list(expired.values_list("pk", flat=True)[: options["batch_size"]])
+            if not ids:
+                break
+            total += MessageTombstone.objects.filter(pk__in=ids).delete()[0]
+
+        self.stdout.write(self.style.SUCCESS(f"Deleted {total} message tombstones."))
@@ -0,0 +1,64 @@
+# Generated by Django 5.0.3 on 2026-10-16 22:54
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import F
+
+CHANGE_SEQUENCE = "messaging_message_change_seq"
+
+
+def create_change_sequence(apps, schema_editor):
+    # Existing messages count as changed when they were created
+    Message = apps.get_model("messaging", "Message")
+    Message.objects.update(change_seq=F("id"))
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute(f"CREATE SEQUENCE {CHANGE_SEQUENCE}")
+    schema_editor.execute(
+        f"SELECT setval('{CHANGE_SEQUENCE}', "
+        f"(SELECT coalesce(max(change_seq), 0) + 1 FROM messaging_message), false)"
+    )
+
+
+def drop_change_sequence(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute(f"DROP SEQUENCE IF EXISTS {CHANGE_SEQUENCE}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('messaging', '0005_message_thread_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='message',
+            name='change_seq',
+            field=models.BigIntegerField(default=0),
+        ),
+        migrations.AddIndex(
+            model_name='message',
+            index=models.Index(fields=['sender', 'change_seq'], name='msg_sender_change_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='message',
+            index=models.Index(fields=['recipient', 'change_seq'], name='msg_recipient_change_idx'),
+        ),
+        migrations.CreateModel(
+            name='MessageTombstone',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('message_id', models.BigIntegerField()),
+                ('sender_id', models.BigIntegerField()),
+                ('recipient_id', models.BigIntegerField()),
+                ('change_seq', models.BigIntegerField()),
+                ('deleted_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['sender_id', 'change_seq'], name='tomb_sender_change_idx'), models.Index(fields=['recipient_id', 'change_seq'], name='tomb_recipient_change_idx')],
+            },
+        ),
+        migrations.RunPython(create_change_sequence, drop_change_sequence),
+    ]
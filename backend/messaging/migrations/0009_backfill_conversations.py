@@ -0,0 +1,72 @@
+from django.conf import settings
+from django.db import migrations
+from django.db.models import Count, F, Max, Q
+from django.db.models.functions import Greatest, Least
+
+BATCH_SIZE = 1000
+
+
+def backfill_conversations(apps, schema_editor):
+    # Same grouping as messaging.conversations.rebuild_conversations, on
+    # the historical models, so the conversation list is complete as soon
+    # as 0008 is applied
+    User = apps.get_model(*settings.AUTH_USER_MODEL.split("."))
+    Message = apps.get_model("messaging", "Message")
+    Conversation = apps.get_model("messaging", "Conversation")
+    last_id = 0
+    while True:
+        user_ids = list(
+            User.objects.filter(pk__gt=last_id)
+            .order_by("pk")
+            .values_list("pk", flat=True)[:BATCH_SIZE]
+        )
+        if not user_ids:
+            return
+        rows = (
+            Message.objects.filter(Q(sender_id__in=user_ids) | Q(recipient_id__in=user_ids))
+            .annotate(
+                pair_a=Least("sender_id", "recipient_id"),
+                pair_b=Greatest("sender_id", "recipient_id"),
+            )
+            .filter(pair_a__in=user_ids)
+            .order_by()
+            .values("pair_a", "pair_b")
+            .annotate(
+                last_id=Max("pk"),
+                last_at=Max("created_at"),
+                unread_a=Count("pk", filter=Q(read=False, recipient_id=F("pair_a"))),
+                unread_b=Count(
+                    "pk",
+                    filter=Q(read=False, recipient_id=F("pair_b")) & ~Q(sender_id=F("pair_b")),
+                ),
+            )
+        )
+        Conversation.objects.bulk_create(
+            [
+                Conversation(
+                    user_a_id=row["pair_a"],
+                    user_b_id=row["pair_b"],
+                    last_message_id=row["last_id"],
+                    updated_at=row["last_at"],
+                    unread_a=row["unread_a"],
+                    unread_b=row["unread_b"],
+                )
+                for row in rows
+            ],
+            update_conflicts=True,
+            unique_fields=["user_a", "user_b"],
+            update_fields=["last_message", "updated_at", "unread_a", "unread_b"],
+        )
+        last_id = user_ids[-1]
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('messaging', '0008_materialized_conversations'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_conversations, migrations.RunPython.noop),
+    ]
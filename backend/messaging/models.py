@@ -1,15 +1,52 @@
-from django.db import models
+from django.db import models, transaction
 from django.conf import settings
 
 
 class Conversation(models.Model):
     """
-    Represents a conversation between two or more users.
-    A conversation can have multiple participants.
+    Materialized summary of the messages between two users.
+    The pair is stored ordered (user_a has the lower id) so each pair has
+    exactly one row. Signal handlers keep the last-message pointer, the
+    activity time and each side's unread counter current on every send,
+    read and delete (see messaging/conversations.py), so conversation
+    lists and badges never scan the message table.
     """
 
-    participants = models.ManyToManyField(settings.AUTH_USER_MODEL)
+    user_a = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="+",
+    )
+    user_b = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="+",
+    )
+    last_message = models.ForeignKey(
+        "Message",
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="+",
+    )
+    # Messages user_a / user_b have received in this conversation and not read
+    unread_a = models.PositiveIntegerField(default=0)
+    unread_b = models.PositiveIntegerField(default=0)
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["user_a", "user_b"], name="conversation_pair_uniq"),
+        ]
+        indexes = [
+            # A user's conversations by recent activity, from either side
+            models.Index(fields=["user_a", "-updated_at"], name="conversation_a_recent_idx"),
+            models.Index(fields=["user_b", "-updated_at"], name="conversation_b_recent_idx"),
+        ]
+
+    def __str__(self):
+        return f"Conversation {self.user_a_id} <-> {self.user_b_id}"
 
 
 class Message(models.Model):
@@ -40,6 +77,60 @@ class Message(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     read = models.BooleanField(default=False)
     status = models.CharField(max_length=10, choices=STATUS_CHOICES, default="pending")
+    # Bumped on every insert or edit (see messaging/changes.py); drives
+    # `?since=` delta sync
+    change_seq = models.BigIntegerField(default=0)
+
+    class Meta:
+        indexes = [
+            # Delta sync: a user's sent and received changes after a cursor
+            models.Index(fields=["sender", "change_seq"], name="msg_sender_change_idx"),
+            models.Index(
+                fields=["recipient", "change_seq"], name="msg_recipient_change_idx"
+            ),
+            # Only unread rows: bulk mark-read and unread counts per peer
+            models.Index(
+                fields=["recipient", "sender", "id"],
+                condition=models.Q(read=False),
+                name="msg_unread_idx",
+            ),
+            # Serves each direction of a two-party thread in time order
+            models.Index(
+                fields=["sender", "recipient", "created_at"], name="msg_thread_idx"
+            ),
+        ]
 
     def __str__(self):
         return f"Message from {self.sender} to {self.recipient} ({self.status})"
+
+    def save(self, *args, **kwargs):
+        # The change value drawn in pre_save must commit with the row
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+
+
+class MessageTombstone(models.Model):
+    """
+    Record of a deleted message, so delta-syncing clients learn about the
+    removal. Plain id columns rather than foreign keys: the participants
+    may be deleted in the same transaction that writes the tombstone.
+    """
+
+    message_id = models.BigIntegerField()
+    sender_id = models.BigIntegerField()
+    recipient_id = models.BigIntegerField()
+    change_seq = models.BigIntegerField()
+    deleted_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            # Same delta-sync lookups as the message table
+            models.Index(fields=["sender_id", "change_seq"], name="tomb_sender_change_idx"),
+            models.Index(
+                fields=["recipient_id", "change_seq"], name="tomb_recipient_change_idx"
+            ),
+        ]
+
+    def __str__(self):
+        return f"Deleted message {self.message_id}"
+
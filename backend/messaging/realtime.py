@@ -0,0 +1,196 @@
+"""
+Push channel for message events.
+
+Signal handlers publish per-user events (new messages, read receipts and
+unread-count changes) once the surrounding transaction commits, and the
+server-sent events stream in messaging/views.py relays them to every
+connected tab of that user.
+
+The broker is pluggable: `settings.MESSAGING_BROKER` names a class
+implementing `publish` and `subscribe`. The default `InMemoryBroker` only
+reaches clients connected to the same process, which is enough for a
+single ASGI worker and for tests; multi-process deployments should plug in
+a broker backed by a shared pub/sub service.
+
+Browsers' EventSource cannot send an Authorization header, so the stream
+is opened with a stream ticket: a signed, single-use token that names the
+user and expires after STREAM_TICKET_MAX_AGE seconds. Single use is
+enforced through the cache, so it spans processes only with a shared
+cache backend.
+"""
+
+import asyncio
+import secrets
+import threading
+
+from django.conf import settings
+from django.core import signing
+from django.core.cache import cache
+from django.db import transaction
+from django.utils.module_loading import import_string
+
+from users.models import UserStats
+
+DEFAULT_BROKER = "messaging.realtime.InMemoryBroker"
+
+STREAM_TICKET_MAX_AGE = 30
+
+_STREAM_TICKET_SALT = "messaging.realtime.stream-ticket"
+
+
+class BaseBroker:
+    """Interface for message event brokers."""
+
+    def publish(self, user_id, event):
+        """Deliver `event` (a JSON-serializable dict) to the user's subscribers."""
+        raise NotImplementedError
+
+    def subscribe(self, user_id):
+        """
+        Return a subscription for the user, created inside the consuming
+        event loop. It must provide `async get(timeout)` and `close()`.
+        """
+        raise NotImplementedError
+
+
+class InMemorySubscription:
+    """One connected client's queue of events, owned by its event loop."""
+
+    def __init__(self, broker, user_id, max_pending):
+        self.broker = broker
+        self.user_id = user_id
+        self.loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue(maxsize=max_pending)
+
+    def deliver(self, event):
+        # publish() may run on any thread; hand the event to our loop
+        try:
+            self.loop.call_soon_threadsafe(self._put, event)
+        except RuntimeError:
+            # The loop is gone; the stream will close this subscription
+            pass
+
+    def _put(self, event):
+        if self.queue.full():
+            # Slow client: drop its oldest event rather than grow unbounded
+            self.queue.get_nowait()
+        self.queue.put_nowait(event)
+
+    async def get(self, timeout):
+        """Wait up to `timeout` seconds for the next event (TimeoutError otherwise)."""
+        return await asyncio.wait_for(self.queue.get(), timeout)
+
+    def close(self):
+        self.broker.unsubscribe(self)
+
+
+class InMemoryBroker(BaseBroker):
+    """Process-local broker: a set of subscriber queues per user."""
+
+    MAX_PENDING = 100
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscribers = {}
+
+    def subscribe(self, user_id):
+        subscription = InMemorySubscription(self, user_id, self.MAX_PENDING)
+        with self._lock:
+            self._subscribers.setdefault(user_id, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            subscribers = self._subscribers.get(subscription.user_id)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._subscribers[subscription.user_id]
+
+    def publish(self, user_id, event):
+        with self._lock:
+            subscribers = list(self._subscribers.get(user_id, ()))
+        for subscription in subscribers:
+            subscription.deliver(event)
+
+
+_broker = None
+_broker_lock = threading.Lock()
+
+
+def get_broker():
+    """Return the process-wide broker configured by MESSAGING_BROKER."""
+    global _broker
+    if _broker is None:
+        with _broker_lock:
+            if _broker is None:
+                path = getattr(settings, "MESSAGING_BROKER", DEFAULT_BROKER)
+                _broker = import_string(path)()
+    return _broker
+
+
+def publish_event(user_ids, event_type, data):
+    """Publish an event to each of `user_ids` after the current transaction commits."""
+    event = {"type": event_type, "data": data}
+
+    def send():
+        broker = get_broker()
+        for user_id in set(user_ids):
+            broker.publish(user_id, event)
+
+    transaction.on_commit(send)
+
+
+def publish_unread_count(user_id):
+    """Push the user's committed unread count after the current transaction."""
+
+    def send():
+        unread = (
+            UserStats.objects.filter(pk=user_id)
+            .values_list("unread_count", flat=True)
+            .first()
+        )
+        if unread is not None:
+            get_broker().publish(
+                user_id, {"type": "unread", "data": {"unread_count": unread}}
+            )
+
+    transaction.on_commit(send)
+
+
+def message_payload(message):
+    """The fields of a message pushed to clients; needs no extra queries."""
+    return {
+        "id": message.pk,
+        "sender": message.sender_id,
+        "recipient": message.recipient_id,
+        "text": message.text,
+        "file": message.file.url if message.file else None,
+        "image": message.image.url if message.image else None,
+        "created_at": message.created_at.isoformat(),
+        "read": message.read,
+        "status": message.status,
+        "change_seq": message.change_seq,
+    }
+
+
+def issue_stream_ticket(user_id):
+    """A ticket that opens one event stream for the user."""
+    return signing.dumps(
+        {"user": user_id, "nonce": secrets.token_urlsafe(16)}, salt=_STREAM_TICKET_SALT
+    )
+
+
+def redeem_stream_ticket(ticket):
+    """
+    Return the user id of a valid, unexpired ticket and mark it used, or
+    None when it is forged, expired or already redeemed.
+    """
+    try:
+        payload = signing.loads(ticket, salt=_STREAM_TICKET_SALT, max_age=STREAM_TICKET_MAX_AGE)
+    except signing.BadSignature:
+        return None
+    # The first redemption claims the nonce until the ticket expires anyway
+    if not cache.add(f"stream-ticket:{payload['nonce']}", True, STREAM_TICKET_MAX_AGE):
+        return None
+    return payload["user"]
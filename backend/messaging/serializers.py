@@ -29,8 +29,16 @@ class MessageSerializer(serializers.ModelSerializer):
             "created_at",
             "read",
             "status",
+            "change_seq",
+        ]
+        read_only_fields = [
+            "id",
+            "sender",
+            "recipient",
+            "created_at",
+            "status",
+            "change_seq",
         ]
-        read_only_fields = ["id", "sender", "recipient", "created_at", "status"]
 
     def create(self, validated_data):
         """
@@ -54,25 +62,57 @@ class MessageSerializer(serializers.ModelSerializer):
         return super().create(validated_data)
 
 
-class ConversationSerializer(serializers.ModelSerializer):
+class ConversationSummarySerializer(serializers.ModelSerializer):
     """
-    Serializer for the Conversation model.
-    Expands participants into usernames and nests related messages.
+    One row of the conversation list, seen from the requesting user:
+    the other participant, the last message and the user's unread count.
     """
 
-    participants_usernames = serializers.SerializerMethodField()
-    messages = MessageSerializer(many=True, read_only=True)
+    PREVIEW_LENGTH = 120
+
+    peer_id = serializers.SerializerMethodField()
+    peer_username = serializers.SerializerMethodField()
+    last_message_id = serializers.IntegerField(read_only=True)
+    last_message_at = serializers.DateTimeField(source="updated_at", read_only=True)
+    last_message_sender_id = serializers.SerializerMethodField()
+    last_message_preview = serializers.SerializerMethodField()
+    unread_count = serializers.SerializerMethodField()
 
     class Meta:
         model = Conversation
         fields = [
             "id",
-            "participants",
-            "participants_usernames",
-            "created_at",
-            "messages",
+            "peer_id",
+            "peer_username",
+            "last_message_id",
+            "last_message_at",
+            "last_message_sender_id",
+            "last_message_preview",
+            "unread_count",
         ]
 
-    def get_participants_usernames(self, obj):
-        # Convert participants into a list of usernames
-        return [u.username for u in obj.participants.all()]
+    def _is_user_a(self, conversation):
+        return conversation.user_a_id == self.context["request"].user.pk
+
+    def _peer(self, conversation):
+        return conversation.user_b if self._is_user_a(conversation) else conversation.user_a
+
+    def get_peer_id(self, conversation):
+        return self._peer(conversation).pk
+
+    def get_peer_username(self, conversation):
+        return self._peer(conversation).username
+
+    def get_last_message_sender_id(self, conversation):
+        message = conversation.last_message
+        return message.sender_id if message else None
+
+    def get_last_message_preview(self, conversation):
+        message = conversation.last_message
+        text = message.text if message else ""
+        if len(text) > self.PREVIEW_LENGTH:
+            return text[: self.PREVIEW_LENGTH - 1] + "…"
+        return text
+
+    def get_unread_count(self, conversation):
+        return conversation.unread_a if self._is_user_a(conversation) else conversation.unread_b
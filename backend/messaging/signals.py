@@ -0,0 +1,68 @@
+from django.db.models.signals import post_delete, post_init, post_save, pre_save
+from django.dispatch import receiver
+
+from users.stats import adjust_user_stats
+from .changes import next_change_seq
+from .conversations import message_removed, record_message
+from .models import Message, MessageTombstone
+from .realtime import message_payload, publish_event, publish_unread_count
+from .unread import unread_changed
+
+
+@receiver(post_init, sender=Message)
+def remember_read_state(sender, instance, **kwargs):
+    # Read from __dict__ so a deferred `read` field is not fetched
+    instance._was_read = instance.__dict__.get("read")
+
+
+@receiver(pre_save, sender=Message)
+def bump_change_seq(sender, instance, raw=False, **kwargs):
+    # Every insert or edit is a change delta-syncing clients must pick up
+    if not raw:
+        instance.change_seq = next_change_seq()
+
+
+@receiver(post_save, sender=Message)
+def message_saved(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    if created:
+        record_message(instance)
+        if not instance.read:
+            # record_message already counted it on the conversation
+            adjust_user_stats(instance.recipient_id, unread_count=1)
+            publish_unread_count(instance.recipient_id)
+        # Both sides, so the sender's other tabs see it too
+        publish_event(
+            [instance.sender_id, instance.recipient_id],
+            "message",
+            message_payload(instance),
+        )
+    elif instance._was_read is not None and instance._was_read != instance.read:
+        # Read flag toggled on an existing message
+        unread_changed(instance.recipient_id, instance.sender_id, -1 if instance.read else 1)
+        publish_event(
+            [instance.sender_id],
+            "read",
+            {
+                "message_id": instance.pk,
+                "read": instance.read,
+                "change_seq": instance.change_seq,
+            },
+        )
+    instance._was_read = instance.read
+
+
+@receiver(post_delete, sender=Message)
+def message_deleted(sender, instance, **kwargs):
+    # Deletes run in the collector's transaction; the tombstone tells
+    # delta-syncing clients to drop the message
+    MessageTombstone.objects.create(
+        message_id=instance.pk,
+        sender_id=instance.sender_id,
+        recipient_id=instance.recipient_id,
+        change_seq=next_change_seq(after=instance.change_seq),
+    )
+    message_removed(instance)
+    if not instance.read:
+        unread_changed(instance.recipient_id, instance.sender_id, -1)
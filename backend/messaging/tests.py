@@ -1,3 +1,425 @@
-from django.test import TestCase
+import asyncio
+import time
+from datetime import timedelta
+from importlib import import_module
+from io import StringIO
+from unittest import mock
 
-# Create your tests here.
+from django.apps import apps
+from django.core.management import call_command
+from django.db import connection
+from django.test import AsyncRequestFactory, SimpleTestCase, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from rest_framework.test import APIClient
+
+from devcred.testing import make_user, walk_pages
+from .models import Conversation, Message, MessageTombstone
+from .realtime import (
+    STREAM_TICKET_MAX_AGE,
+    InMemoryBroker,
+    get_broker,
+    issue_stream_ticket,
+    redeem_stream_ticket,
+)
+from .unread import set_messages_read
+from .views import MessageListCreateView, message_events
+
+
+class DeltaSyncTests(TestCase):
+    def setUp(self):
+        self.alice = make_user("alice")
+        self.bob = make_user("bob")
+        self.client = APIClient()
+        self.client.force_authenticate(self.alice)
+
+    def sync(self, since):
+        """Follow has_more from `since`; returns (messages by id, deleted ids, cursor)."""
+        messages, deleted = {}, set()
+        while True:
+            data = self.client.get("/api/messaging/messages/", {"since": since}).data
+            for row in data["results"]:
+                messages[row["id"]] = row
+                deleted.discard(row["id"])
+            for message_id in data["deleted"]:
+                messages.pop(message_id, None)
+                deleted.add(message_id)
+            since = data["cursor"]
+            if not data["has_more"]:
+                return messages, deleted, since
+
+    def test_every_write_draws_a_higher_value(self):
+        first = Message.objects.create(sender=self.bob, recipient=self.alice, text="one")
+        second = Message.objects.create(sender=self.alice, recipient=self.bob, text="two")
+        self.assertGreater(second.change_seq, first.change_seq)
+        first.status = "accepted"
+        first.save()
+        self.assertGreater(first.change_seq, second.change_seq)
+        first.delete()
+        tombstone = MessageTombstone.objects.get()
+        self.assertGreater(tombstone.change_seq, first.change_seq)
+
+    @mock.patch.object(MessageListCreateView, "SYNC_PAGE_SIZE", 2)
+    def test_sync_picks_up_creates_edits_reads_and_deletes(self):
+        kept = Message.objects.create(sender=self.bob, recipient=self.alice, text="kept")
+        gone = Message.objects.create(sender=self.alice, recipient=self.bob, text="gone")
+        gone_id = gone.pk
+        messages, deleted, cursor = self.sync(0)
+        self.assertEqual(set(messages), {kept.pk, gone_id})
+
+        others = [
+            Message.objects.create(sender=self.bob, recipient=self.alice, text=str(i))
+            for i in range(3)
+        ]
+        gone.delete()
+        set_messages_read(Message.objects.filter(recipient=self.alice))
+        # A conversation between other users is never sent
+        carol = make_user("carol")
+        Message.objects.create(sender=self.bob, recipient=carol, text="private").delete()
+
+        changes, deleted, cursor = self.sync(cursor)
+        self.assertEqual(set(changes), {kept.pk, *(m.pk for m in others)})
+        self.assertTrue(all(row["read"] for row in changes.values()))
+        self.assertEqual(deleted, {gone_id})
+
+        # Nothing new: the cursor stays put
+        data = self.client.get("/api/messaging/messages/", {"since": cursor}).data
+        self.assertEqual((data["results"], data["deleted"], data["cursor"]), ([], [], cursor))
+
+    @mock.patch.object(MessageListCreateView, "SYNC_PAGE_SIZE", 2)
+    def test_pages_split_rows_sharing_a_value(self):
+        for text in ("one", "two", "three"):
+            Message.objects.create(sender=self.bob, recipient=self.alice, text=text)
+        _, _, cursor = self.sync(0)
+        set_messages_read(Message.objects.filter(recipient=self.alice))
+        self.assertEqual(Message.objects.values("change_seq").distinct().count(), 1)
+
+        changes, _, _ = self.sync(cursor)
+        self.assertEqual(len(changes), 3)
+        self.assertTrue(all(row["read"] for row in changes.values()))
+
+    def test_values_that_may_still_commit_are_held_back(self):
+        first = Message.objects.create(sender=self.bob, recipient=self.alice, text="one")
+        Message.objects.create(sender=self.bob, recipient=self.alice, text="two")
+        with mock.patch(
+            "messaging.views.committed_change_seq", return_value=first.change_seq
+        ):
+            held, _, cursor = self.sync(0)
+        self.assertEqual(set(held), {first.pk})
+        self.assertEqual(cursor, f"{first.change_seq}-{first.pk}")
+        self.assertEqual(len(self.sync(cursor)[0]), 1)
+
+    def test_malformed_cursor_is_rejected(self):
+        for since in ("abc", "1-x", "-"):
+            response = self.client.get("/api/messaging/messages/", {"since": since})
+            self.assertEqual(response.status_code, 400, since)
+
+    def test_prune_deletes_only_expired_tombstones(self):
+        for text in ("old", "new"):
+            Message.objects.create(sender=self.bob, recipient=self.alice, text=text).delete()
+        MessageTombstone.objects.filter(pk=MessageTombstone.objects.order_by("pk")[0].pk).update(
+            deleted_at=timezone.now() - timedelta(days=31)
+        )
+        call_command("prune_message_tombstones", "--days", "30", stdout=StringIO())
+        self.assertEqual(MessageTombstone.objects.count(), 1)
+        self.assertEqual(self.sync(0)[1], {MessageTombstone.objects.get().message_id})
+
+
+class ConversationInvariantTests(TestCase):
+    """Conversation rows must always match what the message table implies."""
+
+    def setUp(self):
+        self.alice = make_user("alice")
+        self.bob = make_user("bob")
+
+    def send(self, sender, recipient, text, minutes_ago=0):
+        message = Message.objects.create(sender=sender, recipient=recipient, text=text)
+        if minutes_ago:
+            # created_at is auto_now_add; backdate the row itself
+            Message.objects.filter(pk=message.pk).update(
+                created_at=message.created_at - timedelta(minutes=minutes_ago)
+            )
+            message.refresh_from_db()
+        return message
+
+    def snapshot(self):
+        return sorted(
+            Conversation.objects.values_list(
+                "user_a", "user_b", "last_message", "updated_at", "unread_a", "unread_b"
+            )
+        )
+
+    def test_deleting_the_last_message_moves_pointer_and_time_back(self):
+        older = self.send(self.bob, self.alice, "older", minutes_ago=10)
+        self.send(self.alice, self.bob, "newer").delete()
+
+        conversation = Conversation.objects.get()
+        self.assertEqual(conversation.last_message_id, older.pk)
+        self.assertEqual(conversation.updated_at, older.created_at)
+        self.assertEqual(
+            (conversation.unread_a, conversation.unread_b),
+            (1, 0) if conversation.user_a_id == self.alice.pk else (0, 1),
+        )
+
+    def test_deleting_every_message_removes_the_conversation(self):
+        self.send(self.bob, self.alice, "only").delete()
+        self.assertFalse(Conversation.objects.exists())
+
+        again = self.send(self.alice, self.bob, "again")
+        conversation = Conversation.objects.get()
+        self.assertEqual(conversation.last_message_id, again.pk)
+        self.assertEqual(conversation.unread_a + conversation.unread_b, 1)
+
+    def test_backfill_migration_matches_maintained_rows(self):
+        carol = make_user("carol")
+        self.send(self.bob, self.alice, "one")
+        self.send(self.alice, self.bob, "two")
+        self.send(carol, self.alice, "three")
+        self.send(self.alice, self.alice, "note")
+        set_messages_read(Message.objects.filter(text="one"))
+        maintained = self.snapshot()
+
+        Conversation.objects.all().delete()
+        migration = import_module("messaging.migrations.0009_backfill_conversations")
+        migration.backfill_conversations(apps, None)
+        self.assertEqual(self.snapshot(), maintained)
+
+
+class ConversationListTests(TestCase):
+    def setUp(self):
+        self.alice = make_user("alice")
+        self.peers = [make_user(f"peer{i}") for i in range(4)]
+        # Sent in order, so peer3 holds the most recent conversation
+        for i, peer in enumerate(self.peers):
+            Message.objects.create(sender=peer, recipient=self.alice, text=f"hi {i}")
+        # Conversations alice is not part of never show up
+        Message.objects.create(sender=self.peers[0], recipient=self.peers[1], text="elsewhere")
+        self.client = APIClient()
+        self.client.force_authenticate(self.alice)
+
+    def conversations(self, url="/api/messaging/conversations/"):
+        return walk_pages(self.client, url)
+
+    def test_pages_list_conversations_by_recent_activity(self):
+        rows = self.conversations("/api/messaging/conversations/?page_size=3")
+        self.assertEqual(
+            [row["peer_username"] for row in rows], ["peer3", "peer2", "peer1", "peer0"]
+        )
+
+        # A reply moves its conversation to the top
+        Message.objects.create(sender=self.alice, recipient=self.peers[0], text="back")
+        rows = self.conversations()
+        self.assertEqual(rows[0]["peer_id"], self.peers[0].pk)
+        self.assertEqual(rows[0]["last_message_preview"], "back")
+        self.assertEqual(rows[0]["last_message_sender_id"], self.alice.pk)
+
+    def test_query_count_does_not_grow_with_conversations(self):
+        with CaptureQueriesContext(connection) as few:
+            self.client.get("/api/messaging/conversations/?page_size=2")
+        with CaptureQueriesContext(connection) as many:
+            self.client.get("/api/messaging/conversations/?page_size=4")
+        self.assertEqual(len(few), len(many))
+
+    def test_unread_counts_are_per_participant(self):
+        Message.objects.create(sender=self.peers[2], recipient=self.alice, text="again")
+        counts = {row["peer_username"]: row["unread_count"] for row in self.conversations()}
+        self.assertEqual(counts, {"peer0": 1, "peer1": 1, "peer2": 2, "peer3": 1})
+
+        self.client.post(
+            f"/api/messaging/threads/{self.peers[2].pk}/read/",
+            {"up_to": Message.objects.get(text="again").pk},
+            format="json",
+        )
+        self.assertEqual(self.conversations()[0]["unread_count"], 0)
+
+        # The sender has nothing unread in the same conversation
+        self.client.force_authenticate(self.peers[2])
+        rows = self.conversations()
+        self.assertEqual(
+            [(row["peer_id"], row["unread_count"]) for row in rows], [(self.alice.pk, 0)]
+        )
+
+    def test_deleting_the_last_message_falls_back_to_the_previous_one(self):
+        first = Message.objects.get(text="hi 0")
+        reply = Message.objects.create(sender=self.alice, recipient=self.peers[0], text="back")
+        self.assertEqual(self.conversations()[0]["last_message_id"], reply.pk)
+
+        response = self.client.delete(f"/api/messaging/messages/{reply.pk}/")
+        self.assertEqual(response.status_code, 204)
+        rows = self.conversations()
+        self.assertEqual(rows[-1]["peer_id"], self.peers[0].pk)
+        self.assertEqual(rows[-1]["last_message_id"], first.pk)
+        self.assertEqual(rows[-1]["last_message_preview"], "hi 0")
+        self.assertEqual(parse_datetime(rows[-1]["last_message_at"]), first.created_at)
+        self.assertEqual(rows[-1]["unread_count"], 1)
+
+
+class ThreadPaginationTests(TestCase):
+    def setUp(self):
+        self.alice = make_user("alice")
+        self.bob = make_user("bob")
+        carol = make_user("carol")
+        self.thread = []
+        for i in range(7):
+            sender, recipient = (self.alice, self.bob) if i % 2 else (self.bob, self.alice)
+            self.thread.append(
+                Message.objects.create(sender=sender, recipient=recipient, text=str(i))
+            )
+        # Other conversations never show up in the thread
+        Message.objects.create(sender=carol, recipient=self.alice, text="elsewhere")
+        self.client = APIClient()
+        self.client.force_authenticate(self.alice)
+        self.url = f"/api/messaging/threads/{self.bob.pk}/"
+
+    def test_before_walks_back_through_the_whole_thread(self):
+        seen = []
+        params = {"limit": 3}
+        while True:
+            data = self.client.get(self.url, params).data
+            seen.extend(row["id"] for row in data["results"])
+            if not data["has_more"]:
+                break
+            params["before"] = seen[-1]
+        self.assertEqual(seen, [m.pk for m in reversed(self.thread)])
+
+    def test_after_returns_newer_messages_newest_first(self):
+        data = self.client.get(self.url, {"after": self.thread[2].pk, "limit": 2}).data
+        self.assertEqual(
+            [row["id"] for row in data["results"]], [self.thread[4].pk, self.thread[3].pk]
+        )
+        self.assertTrue(data["has_more"])
+
+    def test_anchor_outside_the_thread_is_rejected(self):
+        elsewhere = Message.objects.get(text="elsewhere")
+        response = self.client.get(self.url, {"before": elsewhere.pk})
+        self.assertEqual(response.status_code, 404)
+        response = self.client.get(self.url, {"before": 1, "after": 2})
+        self.assertEqual(response.status_code, 400)
+
+
+class MarkThreadReadTests(TestCase):
+    def setUp(self):
+        self.alice = make_user("alice")
+        self.bob = make_user("bob")
+        self.carol = make_user("carol")
+        self.from_bob = [
+            Message.objects.create(sender=self.bob, recipient=self.alice, text=str(i))
+            for i in range(4)
+        ]
+        Message.objects.create(sender=self.carol, recipient=self.alice, text="elsewhere")
+        Message.objects.create(sender=self.alice, recipient=self.bob, text="reply")
+        self.client = APIClient()
+        self.client.force_authenticate(self.alice)
+        self.url = f"/api/messaging/threads/{self.bob.pk}/read/"
+
+    def test_marks_the_peers_messages_up_to_the_anchor_in_one_update(self):
+        up_to = self.from_bob[2].pk
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(self.url, {"up_to": up_to}, format="json")
+        self.assertEqual(response.data, {"marked": 3, "unread_count": 2})
+        message_updates = [
+            query["sql"]
+            for query in queries.captured_queries
+            if query["sql"].startswith('UPDATE "messaging_message"')
+        ]
+        self.assertEqual(len(message_updates), 1)
+
+        read = Message.objects.filter(read=True)
+        self.assertEqual(set(read.values_list("pk", flat=True)), {m.pk for m in self.from_bob[:3]})
+        self.assertEqual(read.values("change_seq").distinct().count(), 1)
+        conversation = Conversation.objects.get(user_a=self.alice, user_b=self.bob)
+        self.assertEqual(conversation.unread_a, 1)
+
+        # Nothing left to mark up to the same anchor
+        response = self.client.post(self.url, {"up_to": up_to}, format="json")
+        self.assertEqual(response.data, {"marked": 0, "unread_count": 2})
+
+    def test_up_to_must_be_a_message_id(self):
+        response = self.client.post(self.url, {"up_to": "latest"}, format="json")
+        self.assertEqual(response.status_code, 400)
+
+
+class InMemoryBrokerTests(SimpleTestCase):
+    async def test_events_reach_every_subscription_of_the_user_only(self):
+        broker = InMemoryBroker()
+        first, second, other = broker.subscribe(1), broker.subscribe(1), broker.subscribe(2)
+        broker.publish(1, {"type": "unread"})
+        self.assertEqual(await first.get(1), {"type": "unread"})
+        self.assertEqual(await second.get(1), {"type": "unread"})
+        with self.assertRaises(asyncio.TimeoutError):
+            await other.get(0.01)
+
+    async def test_events_published_from_another_thread_are_delivered(self):
+        broker = InMemoryBroker()
+        subscription = broker.subscribe(1)
+        await asyncio.to_thread(broker.publish, 1, {"type": "message"})
+        self.assertEqual(await subscription.get(1), {"type": "message"})
+
+    async def test_slow_client_loses_its_oldest_events(self):
+        broker = InMemoryBroker()
+        broker.MAX_PENDING = 2
+        subscription = broker.subscribe(1)
+        for n in range(3):
+            broker.publish(1, {"n": n})
+        self.assertEqual([await subscription.get(1) for _ in range(2)], [{"n": 1}, {"n": 2}])
+
+    async def test_closed_subscription_is_forgotten(self):
+        broker = InMemoryBroker()
+        subscription = broker.subscribe(1)
+        subscription.close()
+        broker.publish(1, {"type": "unread"})
+        self.assertEqual(broker._subscribers, {})
+        with self.assertRaises(asyncio.TimeoutError):
+            await subscription.get(0.01)
+
+
+class EventStreamTests(TestCase):
+    url = "/api/messaging/events/"
+
+    def setUp(self):
+        self.alice = make_user("alice")
+
+    async def open_stream(self, **params):
+        request = AsyncRequestFactory().get(self.url, params)
+        return await message_events(request)
+
+    def test_ticket_is_issued_to_authenticated_users_and_redeemed_once(self):
+        client = APIClient()
+        self.assertEqual(client.post(f"{self.url}ticket/").status_code, 401)
+        client.force_authenticate(self.alice)
+        ticket = client.post(f"{self.url}ticket/").data["ticket"]
+        self.assertEqual(redeem_stream_ticket(ticket), self.alice.pk)
+        self.assertIsNone(redeem_stream_ticket(ticket))
+
+    def test_expired_or_forged_ticket_is_refused(self):
+        ticket = issue_stream_ticket(self.alice.pk)
+        later = time.time() + STREAM_TICKET_MAX_AGE + 1
+        with mock.patch("django.core.signing.time.time", return_value=later):
+            self.assertIsNone(redeem_stream_ticket(ticket))
+        self.assertIsNone(redeem_stream_ticket(ticket[:-1]))
+        self.assertIsNone(redeem_stream_ticket(""))
+
+    def test_stream_is_refused_under_wsgi(self):
+        response = self.client.get(self.url, {"ticket": issue_stream_ticket(self.alice.pk)})
+        self.assertEqual(response.status_code, 501)
+
+    async def test_stream_relays_published_events(self):
+        response = await self.open_stream(ticket=issue_stream_ticket(self.alice.pk))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "text/event-stream")
+        stream = response.streaming_content
+        self.assertEqual(await anext(stream), b"retry: 3000\n\n")
+        self.assertEqual(await anext(stream), b'event: unread\ndata: {"unread_count": 0}\n\n')
+
+        # The client is subscribed once the first events are out
+        get_broker().publish(self.alice.pk, {"type": "message", "data": {"id": 7}})
+        self.assertEqual(await anext(stream), b'event: message\ndata: {"id": 7}\n\n')
+        await stream.aclose()
+
+    async def test_reused_ticket_is_refused(self):
+        ticket = issue_stream_ticket(self.alice.pk)
+        response = await self.open_stream(ticket=ticket)
+        await response.streaming_content.aclose()
+        self.assertEqual((await self.open_stream(ticket=ticket)).status_code, 401)
+        self.assertEqual((await self.open_stream()).status_code, 401)
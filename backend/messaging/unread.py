@@ -0,0 +1,72 @@
+"""
+The single path for changes to a message's read flag.
+
+Every unread message is counted twice: in the recipient's
+`UserStats.unread_count` (the badge, UnreadCountView and the event
+stream) and on its side of the pair's Conversation row. Signal handlers
+cover inserts, single-instance saves and deletes; code that changes
+`read` on many rows must call `set_messages_read` instead of
+`.update(read=...)`, which skips signals and would leave both counters
+wrong. `mark_thread_read` covers the common case of one conversation.
+"""
+
+from collections import Counter
+
+from django.db import transaction
+
+from users.stats import adjust_user_stats
+from .changes import next_change_seq
+from .conversations import adjust_conversation_unread
+from .models import Message
+from .realtime import publish_unread_count
+
+
+def unread_changed(recipient_id, sender_id, delta):
+    """Shift every unread counter for messages from `sender_id` to `recipient_id`."""
+    if not delta:
+        return
+    adjust_user_stats(recipient_id, unread_count=delta)
+    adjust_conversation_unread(recipient_id, sender_id, delta)
+    publish_unread_count(recipient_id)
+
+
+def set_messages_read(messages, read=True):
+    """
+    Set the read flag on the messages in the `messages` queryset whose flag
+    differs, adjust the counters of each recipient/sender pair involved and
+    return the ids of the changed messages.
+    """
+    with transaction.atomic():
+        # Lock the rows so a concurrent toggle cannot be counted twice
+        rows = list(
+            messages.exclude(read=read)
+            .select_for_update()
+            .values_list("pk", "recipient_id", "sender_id")
+        )
+        if not rows:
+            return []
+        changed_ids = [pk for pk, _, _ in rows]
+        # One change value for the batch; sync pages break ties by id
+        Message.objects.filter(pk__in=changed_ids).update(
+            read=read, change_seq=next_change_seq()
+        )
+        sign = -1 if read else 1
+        pairs = Counter((recipient_id, sender_id) for _, recipient_id, sender_id in rows)
+        for (recipient_id, sender_id), count in pairs.items():
+            unread_changed(recipient_id, sender_id, sign * count)
+    return changed_ids
+
+
+def mark_thread_read(recipient_id, sender_id, up_to):
+    """
+    Mark every unread message from `sender_id` to `recipient_id` with an id
+    up to `up_to` as read with a single UPDATE, and return how many changed.
+    The UPDATE re-checks `read=False` on each row it locks, so a concurrent
+    toggle of the same rows is never counted twice.
+    """
+    with transaction.atomic():
+        marked = Message.objects.filter(
+            recipient_id=recipient_id, sender_id=sender_id, pk__lte=up_to, read=False
+        ).update(read=True, change_seq=next_change_seq())
+        unread_changed(recipient_id, sender_id, -marked)
+    return marked
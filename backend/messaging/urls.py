@@ -5,6 +5,10 @@ from .views import (
     MarkMessageReadView,
     UnreadCountView,
     ConversationListView,
+    MessageThreadView,
+    MarkThreadReadView,
+    EventStreamTicketView,
+    message_events,
     AcceptRejectMessageView,
 )
 
@@ -19,6 +23,14 @@ urlpatterns = [
     path("unread-count/", UnreadCountView.as_view(), name="unread-count"),
     # List all conversations for the user
     path("conversations/", ConversationListView.as_view(), name="conversation-list"),
+    # Messages between the user and one peer, newest first
+    path("threads/<int:peer_id>/", MessageThreadView.as_view(), name="message-thread"),
+    # Mark everything from a peer up to a message id as read
+    path("threads/<int:peer_id>/read/", MarkThreadReadView.as_view(), name="thread-read"),
+    # Server-sent events: new messages, read receipts, unread count
+    path("events/", message_events, name="message-events"),
+    # One-time ticket for opening the event stream from a browser
+    path("events/ticket/", EventStreamTicketView.as_view(), name="message-events-ticket"),
     # Accept or reject a specific message (e.g., requests)
     path(
         "messages/<int:pk>/action/",
@@ -1,12 +1,34 @@
+import asyncio
+import json
+
+from asgiref.sync import sync_to_async
 from rest_framework import generics, permissions, status
+from rest_framework.exceptions import AuthenticationFailed
 from rest_framework.views import APIView
 from rest_framework.response import Response
+from django.core.handlers.asgi import ASGIRequest
+from django.http import HttpResponseNotAllowed, JsonResponse, StreamingHttpResponse
 from django.shortcuts import get_object_or_404
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
 from django.db.models import Q
 from django.contrib.auth import get_user_model
-from .models import Message
-from .serializers import MessageSerializer
+from django.db import transaction
+from .changes import committed_change_seq
+from .models import Conversation, Message, MessageTombstone
+from .realtime import (
+    STREAM_TICKET_MAX_AGE,
+    get_broker,
+    issue_stream_ticket,
+    publish_event,
+    redeem_stream_ticket,
+)
+from .serializers import ConversationSummarySerializer, MessageSerializer
+from .unread import mark_thread_read
+from devcred.pagination import ConversationCursorPagination
+from contributions.entitlements import revoke_credits
 from contributions.models import ContributionRequest  # <-- add import
+from users.stats import get_user_stats
 
 
 User = get_user_model()
@@ -15,17 +37,84 @@ User = get_user_model()
 class MessageListCreateView(generics.ListCreateAPIView):
     """
     GET -> List all messages (sent or received by the user).
+           With `?since=<cursor>` ("0" for a first sync), only messages
+           created or changed after the cursor, oldest change first, the
+           ids of messages deleted since, and the cursor to send next.
     POST -> Send a new message (sender is always current user).
     """
 
     serializer_class = MessageSerializer
     permission_classes = [permissions.IsAuthenticated]
 
+    SYNC_PAGE_SIZE = 500
+
     def get_queryset(self):
         return Message.objects.filter(
             recipient=self.request.user
         ) | Message.objects.filter(sender=self.request.user)
 
+    @staticmethod
+    def changes_after(seq, last_id, id_field, settled):
+        """Filter for rows after the (change_seq, id) cursor, up to `settled`."""
+        after = Q(change_seq__gt=seq)
+        if last_id is not None:
+            after |= Q(change_seq=seq, **{f"{id_field}__gt": last_id})
+        if settled is not None:
+            after &= Q(change_seq__lte=settled)
+        return after
+
+    def list(self, request, *args, **kwargs):
+        if "since" not in request.query_params:
+            return super().list(request, *args, **kwargs)
+        try:
+            # "<change_seq>-<id>", or a bare value ("0" to start) for after all its rows
+            seq, _, last_id = request.query_params["since"].partition("-")
+            seq, last_id = int(seq), (int(last_id) if last_id else None)
+        except ValueError:
+            return Response(
+                {"detail": "since must be a cursor returned by an earlier sync."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        user = request.user
+        # Values whose transactions may still commit are held back
+        settled = committed_change_seq()
+        changed = list(
+            Message.objects.filter(
+                Q(sender=user) | Q(recipient=user),
+                self.changes_after(seq, last_id, "pk", settled),
+            )
+            .select_related("sender")
+            .order_by("change_seq", "pk")[: self.SYNC_PAGE_SIZE + 1]
+        )
+        removed = list(
+            MessageTombstone.objects.filter(
+                Q(sender_id=user.pk) | Q(recipient_id=user.pk),
+                self.changes_after(seq, last_id, "message_id", settled),
+            )
+            .order_by("change_seq", "message_id")
+            .values_list("change_seq", "message_id")[: self.SYNC_PAGE_SIZE + 1]
+        )
+        # Merge both feeds in cursor order and cut one page from the front
+        page = sorted(
+            [((m.change_seq, m.pk), m) for m in changed]
+            + [(key, None) for key in removed],
+            key=lambda entry: entry[0],
+        )
+        has_more = len(page) > self.SYNC_PAGE_SIZE
+        page = page[: self.SYNC_PAGE_SIZE]
+        serializer = self.get_serializer([m for _, m in page if m is not None], many=True)
+        return Response(
+            {
+                "results": serializer.data,
+                # Messages deleted since the cursor; drop them client-side
+                "deleted": [message_id for (_, message_id), m in page if m is None],
+                # Unchanged when nothing is new, so clients can keep polling with it
+                "cursor": "%d-%d" % page[-1][0] if page else request.query_params["since"],
+                "has_more": has_more,
+            }
+        )
+
     def perform_create(self, serializer):
         serializer.save(sender=self.request.user)
 
@@ -63,33 +152,142 @@ class MarkMessageReadView(APIView):
 class UnreadCountView(APIView):
     """
     Return the number of unread messages for the current user.
+    Reads UserStats.unread_count, the same counter the dashboard and the
+    event stream use; messaging/unread.py keeps it in step with read flags.
     """
 
     permission_classes = [permissions.IsAuthenticated]
 
     def get(self, request):
-        count = Message.objects.filter(recipient=request.user, read=False).count()
-        return Response({"unread_count": count})
+        return Response({"unread_count": get_user_stats(request.user).unread_count})
 
 
-class ConversationListView(APIView):
+class ConversationListView(generics.ListAPIView):
     """
-    Return a list of all conversation participants for the current user.
-    Shows usernames of people the user has exchanged messages with.
+    List the current user's conversations, most recent activity first.
+    Each row carries the peer, a preview of the last message and the
+    user's unread count for it, read from the materialized Conversation
+    table through its (participant, updated_at) indexes.
     """
 
     permission_classes = [permissions.IsAuthenticated]
+    serializer_class = ConversationSummarySerializer
+    pagination_class = ConversationCursorPagination
 
-    def get(self, request):
+    def get_queryset(self):
+        user = self.request.user
+        return Conversation.objects.filter(Q(user_a=user) | Q(user_b=user)).select_related(
+            "user_a", "user_b", "last_message"
+        )
+
+
+class MessageThreadView(APIView):
+    """
+    GET /api/messaging/threads/<peer_id>/
+    Messages between the current user and one peer, newest first.
+    `?before=<message id>` pages back through older messages and
+    `?after=<message id>` fetches newer ones (e.g. when polling);
+    `?limit=` sets the page size (default 50, max 200).
+
+    Each direction is read separately through the (sender, recipient,
+    created_at) index and the two short lists are merged, so a page never
+    touches more than 2 * (limit + 1) rows.
+    """
+
+    permission_classes = [permissions.IsAuthenticated]
+
+    PAGE_SIZE = 50
+    MAX_PAGE_SIZE = 200
+
+    def get(self, request, peer_id):
         user = request.user
-        messages = Message.objects.filter(Q(sender=user) | Q(recipient=user))
-        participants = set()
-        for m in messages:
-            participants.add(m.sender)
-            participants.add(m.recipient)
-        participants.discard(user)
-        data = [{"id": u.id, "username": u.username} for u in participants]
-        return Response(data)
+        params = request.query_params
+        if "before" in params and "after" in params:
+            return Response(
+                {"detail": "Use either before or after, not both."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        try:
+            limit = min(int(params.get("limit", self.PAGE_SIZE)), self.MAX_PAGE_SIZE)
+            anchor_id = int(params.get("before") or params.get("after") or 0)
+        except ValueError:
+            return Response(
+                {"detail": "before, after and limit must be integers."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        limit = max(limit, 1)
+        newer = "after" in params
+
+        directions = [
+            Message.objects.filter(sender=user, recipient_id=peer_id),
+            Message.objects.filter(sender_id=peer_id, recipient=user),
+        ]
+        if anchor_id:
+            anchor = (
+                Message.objects.filter(
+                    Q(sender=user, recipient_id=peer_id) | Q(sender_id=peer_id, recipient=user),
+                    pk=anchor_id,
+                )
+                .values_list("created_at", flat=True)
+                .first()
+            )
+            if anchor is None:
+                return Response(
+                    {"detail": "Unknown message in this thread."},
+                    status=status.HTTP_404_NOT_FOUND,
+                )
+            if newer:
+                position = Q(created_at__gt=anchor) | Q(created_at=anchor, pk__gt=anchor_id)
+            else:
+                position = Q(created_at__lt=anchor) | Q(created_at=anchor, pk__lt=anchor_id)
+            directions = [queryset.filter(position) for queryset in directions]
+
+        ordering = ("created_at", "pk") if newer else ("-created_at", "-pk")
+        rows = [
+            message
+            for queryset in directions
+            for message in queryset.select_related("sender").order_by(*ordering)[: limit + 1]
+        ]
+        rows.sort(key=lambda m: (m.created_at, m.pk), reverse=not newer)
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        if newer:
+            rows.reverse()
+
+        serializer = MessageSerializer(rows, many=True, context={"request": request})
+        return Response({"results": serializer.data, "has_more": has_more})
+
+
+class MarkThreadReadView(APIView):
+    """
+    POST /api/messaging/threads/<peer_id>/read/
+    Body: {"up_to": <message id>}
+    Mark every unread message from the peer up to and including `up_to`
+    as read with a single UPDATE (through messaging/unread.py, which keeps
+    the counters in step), and return the new unread count.
+    """
+
+    permission_classes = [permissions.IsAuthenticated]
+
+    def post(self, request, peer_id):
+        try:
+            up_to = int(request.data.get("up_to"))
+        except (TypeError, ValueError):
+            return Response(
+                {"detail": "up_to must be a message id."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        user = request.user
+        with transaction.atomic():
+            marked = mark_thread_read(user.pk, peer_id, up_to)
+            if marked:
+                publish_event(
+                    [peer_id], "thread_read", {"reader_id": user.pk, "up_to": up_to}
+                )
+            unread = get_user_stats(user).unread_count
+
+        return Response({"marked": marked, "unread_count": unread})
 
 
 class AcceptRejectMessageView(APIView):
@@ -122,9 +320,13 @@ class AcceptRejectMessageView(APIView):
             msg.status = "rejected"
             msg.save()
 
-            ContributionRequest.objects.filter(
+            requests = ContributionRequest.objects.filter(
                 sender=msg.sender, recipient=msg.recipient, via_message=True
-            ).update(accepted=False)
+            )
+            # Bulk updates skip signals, so revoke the unused credits explicitly
+            revoked = requests.filter(accepted=True, used=False).update(accepted=False)
+            requests.update(accepted=False)
+            revoke_credits(msg.recipient_id, revoked)
 
         else:
             return Response(
@@ -132,3 +334,101 @@ class AcceptRejectMessageView(APIView):
             )
 
         return Response({"status": msg.status})
+
+
+class EventStreamTicketView(APIView):
+    """
+    POST /api/messaging/events/ticket/
+    Issue a ticket that opens one event stream within
+    STREAM_TICKET_MAX_AGE seconds, so the access token never goes in a URL.
+    """
+
+    permission_classes = [permissions.IsAuthenticated]
+
+    def post(self, request):
+        return Response(
+            {
+                "ticket": issue_stream_ticket(request.user.pk),
+                "expires_in": STREAM_TICKET_MAX_AGE,
+            }
+        )
+
+
+EVENT_STREAM_HEARTBEAT = 15
+
+_jwt_auth = JWTAuthentication()
+
+
+def _stream_user(request):
+    """
+    Authenticate an event stream request from the Authorization header or,
+    since browsers' EventSource cannot set headers, a one-time `?ticket=`
+    issued by EventStreamTicketView.
+    """
+    header = _jwt_auth.get_header(request)
+    if header:
+        raw_token = _jwt_auth.get_raw_token(header)
+        if not raw_token:
+            return None
+        try:
+            return _jwt_auth.get_user(_jwt_auth.get_validated_token(raw_token))
+        except (InvalidToken, AuthenticationFailed):
+            return None
+    user_id = redeem_stream_ticket(request.GET.get("ticket", ""))
+    if user_id is None:
+        return None
+    return User.objects.filter(pk=user_id, is_active=True).first()
+
+
+def _sse(event_type, data):
+    return f"event: {event_type}\ndata: {json.dumps(data)}\n\n"
+
+
+async def message_events(request):
+    """
+    GET /api/messaging/events/
+    Server-sent events stream replacing the unread-count and message polls.
+    Emits `unread` (starting with the current count), `message` for new
+    messages sent or received, and `read` receipts for sent messages.
+    A comment line every EVENT_STREAM_HEARTBEAT seconds keeps proxies from
+    closing the idle connection.
+
+    Only served under ASGI: a WSGI server would buffer the endless stream
+    in a worker thread and never send an event, so it gets 501 and clients
+    fall back to polling.
+    """
+    if request.method != "GET":
+        return HttpResponseNotAllowed(["GET"])
+    if not isinstance(request, ASGIRequest):
+        return JsonResponse(
+            {"detail": "The event stream needs an ASGI server; poll instead."},
+            status=status.HTTP_501_NOT_IMPLEMENTED,
+        )
+    user = await sync_to_async(_stream_user)(request)
+    if user is None:
+        return JsonResponse(
+            {"detail": "Authentication credentials were not provided or are invalid."},
+            status=status.HTTP_401_UNAUTHORIZED,
+        )
+    stats = await sync_to_async(get_user_stats)(user)
+
+    async def stream():
+        subscription = get_broker().subscribe(user.pk)
+        try:
+            yield "retry: 3000\n\n"
+            yield _sse("unread", {"unread_count": stats.unread_count})
+            while True:
+                try:
+                    event = await subscription.get(EVENT_STREAM_HEARTBEAT)
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+                yield _sse(event["type"], event["data"])
+        finally:
+            subscription.close()
+
+    response = StreamingHttpResponse(stream(), content_type="text/event-stream")
+    response["Cache-Control"] = "no-cache"
+    # Disable proxy buffering (nginx) so events are flushed immediately
+    response["X-Accel-Buffering"] = "no"
+    return response
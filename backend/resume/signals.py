@@ -0,0 +1,16 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from users.stats import adjust_user_stats
+from .models import ResumeEntry
+
+
+@receiver(post_save, sender=ResumeEntry)
+def resume_saved(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        adjust_user_stats(instance.user_id, resume_count=1)
+
+
+@receiver(post_delete, sender=ResumeEntry)
+def resume_deleted(sender, instance, **kwargs):
+    adjust_user_stats(instance.user_id, resume_count=-1)
@@ -0,0 +1,305 @@
+"""
+Search backends for the unified search endpoint.
+
+PostgresSearchBackend queries the generated `search_vector` columns added
+by search/migrations/0001_search_vectors.py through their GIN indexes.
+Per type, the matches are ranked with ts_rank in SQL and only the top
+offset + limit rows are fetched. Common terms can match a large share of a
+table, so counting stops at MAX_COUNT matches; totals at the cap are
+reported as such. InMemorySearchBackend is a small in-process inverted
+index used on other databases (SQLite in development and tests); it is
+built lazily from the database and kept current by search/signals.py.
+
+Both return (total, capped, hits), with hits as dicts with the same keys,
+best match first.
+"""
+
+import math
+import re
+import threading
+from collections import defaultdict
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.db.models import BooleanField, FloatField
+from django.db.models.expressions import RawSQL
+
+from contributions.models import Contribution
+from videos.models import MentoringVideo
+
+User = get_user_model()
+
+SEARCH_TYPES = ("contribution", "user", "video")
+
+SNIPPET_LENGTH = 160
+
+# Matches per type that PostgresSearchBackend counts before reporting a capped total
+MAX_COUNT = 1000
+
+
+def _snippet(text):
+    text = (text or "").strip()
+    if len(text) <= SNIPPET_LENGTH:
+        return text
+    return text[:SNIPPET_LENGTH].rsplit(" ", 1)[0] + "…"
+
+
+def _contribution_hit(row, rank):
+    return {
+        "type": "contribution",
+        "id": row["id"],
+        "title": row["title"],
+        "snippet": _snippet(row["description"]),
+        "user_id": row["user_id"],
+        "username": row["user__username"],
+        "rank": rank,
+    }
+
+
+def _user_hit(row, rank):
+    return {
+        "type": "user",
+        "id": row["id"],
+        "title": row["username"],
+        "snippet": _snippet(row["bio"]),
+        "user_id": row["id"],
+        "username": row["username"],
+        "rank": rank,
+    }
+
+
+def _video_hit(row, rank):
+    return {
+        "type": "video",
+        "id": row["id"],
+        "title": row["title"],
+        "snippet": _snippet(row["description"]),
+        "user_id": row["user_id"],
+        "username": row["user__username"],
+        "rank": rank,
+    }
+
+
+# type -> (queryset factory, values() fields, hit builder)
+SOURCES = {
+    "contribution": (
+        lambda: Contribution.objects.filter(is_public=True),
+        ("id", "title", "description", "user_id", "user__username"),
+        _contribution_hit,
+    ),
+    "user": (
+        lambda: User.objects.filter(is_active=True),
+        ("id", "username", "bio"),
+        _user_hit,
+    ),
+    "video": (
+        lambda: MentoringVideo.objects.all(),
+        ("id", "title", "description", "user_id", "user__username"),
+        _video_hit,
+    ),
+}
+
+
+def _merge(results_by_type, offset, limit):
+    hits = [hit for hits in results_by_type for hit in hits]
+    hits.sort(key=lambda hit: (-hit["rank"], hit["type"], -hit["id"]))
+    return hits[offset:offset + limit]
+
+
+class PostgresSearchBackend:
+    """Full-text search over the GIN-indexed generated tsvector columns."""
+
+    TSQUERY = "websearch_to_tsquery('english', %s)"
+
+    def _matches(self, search_type, query):
+        make_queryset, _, _ = SOURCES[search_type]
+        model = make_queryset().model
+        column = f"{connection.ops.quote_name(model._meta.db_table)}.search_vector"
+        return make_queryset().filter(
+            RawSQL(f"{column} @@ {self.TSQUERY}", (query,), output_field=BooleanField())
+        ), column
+
+    def search(self, query, types=SEARCH_TYPES, offset=0, limit=20):
+        """
+        Return (total_count, capped, hits) for the requested page. When
+        `capped` is true some type had more than MAX_COUNT matches and
+        `total_count` is a lower bound.
+        """
+        total = 0
+        capped = False
+        results = []
+        for search_type in types:
+            matches, column = self._matches(search_type, query)
+            # Unordered, so the LIMIT stops the index scan early
+            count = matches.order_by().values("pk")[:MAX_COUNT].count()
+            total += count
+            capped = capped or count == MAX_COUNT
+            _, fields, build_hit = SOURCES[search_type]
+            # Ranked over every match, so the best rows are never cut off;
+            # each type contributes at most offset + limit of them to the merge
+            rows = (
+                matches.annotate(
+                    rank=RawSQL(
+                        f"ts_rank({column}, {self.TSQUERY})",
+                        (query,),
+                        output_field=FloatField(),
+                    )
+                )
+                .order_by("-rank", "-id")
+                .values(*fields, "rank")[: offset + limit]
+            )
+            results.append([build_hit(row, row["rank"]) for row in rows])
+        return total, capped, _merge(results, offset, limit)
+
+    def index_instance(self, search_type, instance):
+        # The generated columns are maintained by PostgreSQL itself
+        pass
+
+    def remove_instance(self, search_type, pk):
+        pass
+
+    def index_owned_by(self, user_id):
+        # Usernames are joined in at query time
+        pass
+
+
+TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+STOP_WORDS = frozenset(
+    "a an and are as at be by for from has in is it of on or that the to was with".split()
+)
+
+# Relative weight of title-like vs free-text fields, mirroring setweight A/B
+FIELD_WEIGHTS = (1.0, 0.4)
+
+
+def tokenize(text):
+    return [
+        token
+        for token in TOKEN_RE.findall((text or "").lower())
+        if token not in STOP_WORDS
+    ]
+
+
+class InMemorySearchBackend:
+    """
+    In-process inverted index: token -> {(type, id): weighted term frequency}.
+    Queries AND their terms and rank matches by TF-IDF.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._built = False
+        self._postings = defaultdict(dict)
+        self._documents = {}
+
+    def _document_fields(self, search_type, row):
+        if search_type == "user":
+            return row["username"], row["bio"]
+        return row["title"], row["description"]
+
+    def _add(self, search_type, row):
+        key = (search_type, row["id"])
+        self._remove(key)
+        weights = defaultdict(float)
+        for text, weight in zip(self._document_fields(search_type, row), FIELD_WEIGHTS):
+            for token in tokenize(text):
+                weights[token] += weight
+        for token, weight in weights.items():
+            self._postings[token][key] = weight
+        self._documents[key] = (row, list(weights))
+
+    def _remove(self, key):
+        document = self._documents.pop(key, None)
+        if document is None:
+            return
+        for token in document[1]:
+            postings = self._postings.get(token)
+            if postings is not None:
+                postings.pop(key, None)
+                if not postings:
+                    del self._postings[token]
+
+    def _ensure_built(self):
+        if self._built:
+            return
+        with self._lock:
+            if self._built:
+                return
+            for search_type, (make_queryset, fields, _) in SOURCES.items():
+                for row in make_queryset().values(*fields).iterator(chunk_size=2000):
+                    self._add(search_type, row)
+            self._built = True
+
+    def search(self, query, types=SEARCH_TYPES, offset=0, limit=20):
+        """Return (total_count, capped, hits); totals here are always exact."""
+        self._ensure_built()
+        tokens = set(tokenize(query))
+        if not tokens:
+            return 0, False, []
+
+        with self._lock:
+            postings = [self._postings.get(token, {}) for token in tokens]
+            if not all(postings):
+                return 0, False, []
+            postings.sort(key=len)
+            candidates = {key for key in postings[0] if key[0] in types}
+            for posting in postings[1:]:
+                candidates &= posting.keys()
+
+            document_count = len(self._documents) or 1
+            results = defaultdict(list)
+            for key in candidates:
+                rank = sum(
+                    posting[key] * math.log(1 + document_count / len(posting))
+                    for posting in postings
+                )
+                search_type = key[0]
+                row = self._documents[key][0]
+                results[search_type].append(SOURCES[search_type][2](row, rank))
+
+        return len(candidates), False, _merge(results.values(), offset, limit)
+
+    def index_instance(self, search_type, instance):
+        """Add or refresh one model instance; a no-op until the index is built."""
+        if not self._built:
+            return
+        make_queryset, fields, _ = SOURCES[search_type]
+        row = make_queryset().filter(pk=instance.pk).values(*fields).first()
+        with self._lock:
+            if row is None:
+                # No longer searchable (e.g. contribution made private)
+                self._remove((search_type, instance.pk))
+            else:
+                self._add(search_type, row)
+
+    def remove_instance(self, search_type, pk):
+        if not self._built:
+            return
+        with self._lock:
+            self._remove((search_type, pk))
+
+    def index_owned_by(self, user_id):
+        """Refresh the user's contributions and videos, which store their username."""
+        if not self._built:
+            return
+        for search_type in ("contribution", "video"):
+            make_queryset, fields, _ = SOURCES[search_type]
+            rows = list(make_queryset().filter(user_id=user_id).values(*fields))
+            with self._lock:
+                for row in rows:
+                    self._add(search_type, row)
+
+
+_backend = None
+
+
+def get_search_backend():
+    """Pick the backend for the default database connection."""
+    global _backend
+    if _backend is None:
+        if connection.vendor == "postgresql":
+            _backend = PostgresSearchBackend()
+        else:
+            _backend = InMemorySearchBackend()
+    return _backend
@@ -0,0 +1,60 @@
+from django.db import migrations
+
+# Generated tsvector columns keep themselves current on every INSERT/UPDATE,
+# and the GIN indexes make `@@` matches index lookups. Title-like fields are
+# weighted A and free text B so ts_rank favours title hits.
+SEARCH_VECTORS = [
+    (
+        "contributions_contribution",
+        "setweight(to_tsvector('english'::regconfig, coalesce(title, '')), 'A') || "
+        "setweight(to_tsvector('english'::regconfig, coalesce(description, '')), 'B')",
+        "contrib_search_vector_gin",
+    ),
+    (
+        "users_customuser",
+        "setweight(to_tsvector('english'::regconfig, coalesce(username, '')), 'A') || "
+        "setweight(to_tsvector('english'::regconfig, coalesce(bio, '')), 'B')",
+        "user_search_vector_gin",
+    ),
+    (
+        "videos_mentoringvideo",
+        "setweight(to_tsvector('english'::regconfig, coalesce(title, '')), 'A') || "
+        "setweight(to_tsvector('english'::regconfig, coalesce(description, '')), 'B')",
+        "video_search_vector_gin",
+    ),
+]
+
+
+def add_search_vectors(apps, schema_editor):
+    # Only PostgreSQL has tsvector; other databases use the in-process index
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for table, expression, index in SEARCH_VECTORS:
+        schema_editor.execute(
+            f"ALTER TABLE {table} ADD COLUMN search_vector tsvector "
+            f"GENERATED ALWAYS AS ({expression}) STORED"
+        )
+        schema_editor.execute(
+            f"CREATE INDEX {index} ON {table} USING gin (search_vector)"
+        )
+
+
+def remove_search_vectors(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for table, _, index in SEARCH_VECTORS:
+        schema_editor.execute(f"DROP INDEX IF EXISTS {index}")
+        schema_editor.execute(f"ALTER TABLE {table} DROP COLUMN IF EXISTS search_vector")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contributions', '0009_contribution_contrib_public_feed_idx'),
+        ('users', '0003_userstats'),
+        ('videos', '0002_alter_mentoringvideo_video_file'),
+    ]
+
+    operations = [
+        migrations.RunPython(add_search_vectors, remove_search_vectors),
+    ]
@@ -0,0 +1,72 @@
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models.signals import post_delete, post_init, post_save
+from django.dispatch import receiver
+
+from contributions.models import Contribution
+from contributions.signals import contributions_bulk_created
+from videos.models import MentoringVideo
+from .backends import get_search_backend
+
+User = get_user_model()
+
+
+def _reindex(search_type, instance):
+    transaction.on_commit(
+        lambda: get_search_backend().index_instance(search_type, instance)
+    )
+
+
+def _remove(search_type, pk):
+    transaction.on_commit(lambda: get_search_backend().remove_instance(search_type, pk))
+
+
+@receiver(post_save, sender=Contribution)
+def contribution_saved(sender, instance, raw=False, **kwargs):
+    if not raw:
+        _reindex("contribution", instance)
+
+
+@receiver(post_delete, sender=Contribution)
+def contribution_deleted(sender, instance, **kwargs):
+    _remove("contribution", instance.pk)
+
+
+@receiver(post_init, sender=User)
+def remember_username(sender, instance, **kwargs):
+    # Read from __dict__ so a deferred `username` field is not fetched
+    instance._indexed_username = instance.__dict__.get("username")
+
+
+@receiver(post_save, sender=User)
+def user_saved(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    _reindex("user", instance)
+    if not created and instance._indexed_username not in (None, instance.username):
+        # Contribution and video hits carry the owner's username
+        user_id = instance.pk
+        transaction.on_commit(lambda: get_search_backend().index_owned_by(user_id))
+    instance._indexed_username = instance.username
+
+
+@receiver(post_delete, sender=User)
+def user_deleted(sender, instance, **kwargs):
+    _remove("user", instance.pk)
+
+
+@receiver(post_save, sender=MentoringVideo)
+def video_saved(sender, instance, raw=False, **kwargs):
+    if not raw:
+        _reindex("video", instance)
+
+
+@receiver(post_delete, sender=MentoringVideo)
+def video_deleted(sender, instance, **kwargs):
+    _remove("video", instance.pk)
+
+
+@receiver(contributions_bulk_created, sender=Contribution)
+def contributions_imported(sender, contributions, **kwargs):
+    for contribution in contributions:
+        _reindex("contribution", contribution)
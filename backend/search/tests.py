@@ -0,0 +1,54 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from contributions.models import Contribution
+from resume.models import ResumeEntry
+from . import backends
+
+User = get_user_model()
+
+
+class SearchTests(TestCase):
+    def setUp(self):
+        # The in-memory index is process-wide; start each test from scratch
+        backends._backend = None
+        self.user = User.objects.create_user(
+            username="alice",
+            email="alice@example.com",
+            password="pw-12345678",
+            bio="Django developer",
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_ranked_results_follow_edits(self):
+        contribution = Contribution.objects.create(
+            user=self.user, title="Fix Django ORM bug", contribution_type="bugfix"
+        )
+        response = self.client.get("/api/search/?q=django")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["count"], 2)
+        self.assertFalse(response.data["count_capped"])
+        self.assertEqual(response.data["results"][0]["type"], "contribution")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            contribution.is_public = False
+            contribution.save()
+        response = self.client.get("/api/search/?q=django&type=contribution")
+        self.assertEqual(response.data["count"], 0)
+
+    def test_unrelated_models_do_not_reach_the_index(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            ResumeEntry.objects.create(user=self.user, content="django")
+        self.assertEqual(callbacks, [])
+
+    def test_renamed_user_content_is_found_under_the_new_name(self):
+        Contribution.objects.create(user=self.user, title="Fix ORM bug", contribution_type="bugfix")
+        self.client.get("/api/search/?q=orm")  # builds the index
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.username = "alicia"
+            self.user.save()
+        hits = self.client.get("/api/search/?q=orm&type=contribution").data["results"]
+        self.assertEqual([hit["username"] for hit in hits], ["alicia"])
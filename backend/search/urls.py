@@ -0,0 +1,7 @@
+from django.urls import path
+from .views import SearchView
+
+urlpatterns = [
+    # Unified ranked search across contributions, users and videos
+    path("", SearchView.as_view(), name="search"),
+]
@@ -0,0 +1,67 @@
+from rest_framework import permissions, status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from .backends import SEARCH_TYPES, get_search_backend
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 50
+
+# Ranked results are merged across types, so deep pages get expensive
+MAX_PAGE = 50
+
+
+def _positive_int(value, default, maximum):
+    try:
+        number = int(value)
+    except (TypeError, ValueError):
+        return default
+    return max(1, min(number, maximum))
+
+
+class SearchView(APIView):
+    """
+    GET /api/search/?q=<terms>[&type=contribution,user,video][&page=N][&page_size=N]
+    Ranked full-text search across public contributions, users and
+    mentoring videos. Results from all requested types are merged by rank.
+    For very common terms counting stops early, and `count_capped` marks
+    `count` as a lower bound.
+    """
+
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request):
+        query = request.query_params.get("q", "").strip()
+        if not query:
+            return Response(
+                {"detail": "Query parameter 'q' is required."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        types = SEARCH_TYPES
+        requested = request.query_params.get("type")
+        if requested:
+            types = tuple(t for t in requested.split(",") if t in SEARCH_TYPES)
+            if not types:
+                return Response(
+                    {"detail": f"type must be one of: {', '.join(SEARCH_TYPES)}."},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+
+        page = _positive_int(request.query_params.get("page"), 1, MAX_PAGE)
+        page_size = _positive_int(
+            request.query_params.get("page_size"), DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+        )
+        total, capped, hits = get_search_backend().search(
+            query, types=types, offset=(page - 1) * page_size, limit=page_size
+        )
+        return Response(
+            {
+                "count": total,
+                # True when `count` is a lower bound (very common terms)
+                "count_capped": capped,
+                "page": page,
+                "page_size": page_size,
+                "results": hits,
+            }
+        )
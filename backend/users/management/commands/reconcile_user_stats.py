@@ -0,0 +1,43 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+
+from users.stats import rebuild_user_stats
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    """
+    Rebuild every UserStats row from the source tables to repair drift.
+    Users are processed in id-ordered batches; each batch costs one
+    GROUP BY query per counter plus a single upsert.
+    """
+
+    help = "Recompute denormalized per-user dashboard counters."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Number of users rebuilt per batch (default: 1000).",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        last_id = 0
+        total = 0
+
+        while True:
+            user_ids = list(
+                User.objects.filter(pk__gt=last_id)
+                .order_by("pk")
+                .values_list("pk", flat=True)[:batch_size]
+            )
+            if not user_ids:
+                break
+            rebuild_user_stats(user_ids)
+            total += len(user_ids)
+            last_id = user_ids[-1]
+
+        self.stdout.write(self.style.SUCCESS(f"Reconciled stats for {total} users."))
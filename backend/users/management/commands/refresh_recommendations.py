@@ -0,0 +1,52 @@
+import logging
+import time
+
+from django.core.management.base import BaseCommand
+
+from users.recommendations import refresh_recommendations, refresh_stale_recommendations
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    """
+    Rebuild every user's collaborator recommendations from scratch. With
+    --loop the command instead keeps running and refreshes the users that
+    contribution and endorsement activity flagged stale; run the full
+    rebuild periodically to pick up drift elsewhere in the similarity space.
+    """
+
+    help = "Recompute the precomputed collaborator recommendation table."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--loop",
+            type=int,
+            default=0,
+            metavar="SECONDS",
+            help="Run continuously, refreshing stale users this often.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=5000,
+            help="Stale users refreshed per pass in --loop mode.",
+        )
+
+    def handle(self, *args, **options):
+        if not options["loop"]:
+            lists = refresh_recommendations()
+            self.stdout.write(self.style.SUCCESS(f"Rebuilt recommendations for {lists} users."))
+            return
+
+        while True:
+            try:
+                users, lists = refresh_stale_recommendations(options["batch_size"])
+                if users:
+                    self.stdout.write(
+                        f"Refreshed {lists} recommendation lists for {users} stale users."
+                    )
+            except Exception:
+                # Keep the worker alive; the users stay flagged for the next pass
+                logger.exception("Recommendation refresh failed")
+            time.sleep(options["loop"])
@@ -0,0 +1,79 @@
+# Generated by Django 5.0.3 on 2026-10-16 22:31
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count
+
+BATCH_SIZE = 1000
+
+# counter field -> (app label, model, user foreign key column, extra filters),
+# the same aggregates as users.stats.rebuild_user_stats
+STAT_SOURCES = {
+    "contribution_count": ("contributions", "Contribution", "user_id", {}),
+    "video_count": ("videos", "MentoringVideo", "user_id", {}),
+    "resume_count": ("resume", "ResumeEntry", "user_id", {}),
+    "unread_count": ("messaging", "Message", "recipient_id", {"read": False}),
+}
+
+
+def build_user_stats(apps, schema_editor):
+    # Counter updates skip users without a row, so every existing user
+    # needs one before the signal handlers take over
+    User = apps.get_model(*settings.AUTH_USER_MODEL.split("."))
+    UserStats = apps.get_model("users", "UserStats")
+    last_id = 0
+    while True:
+        user_ids = list(
+            User.objects.filter(pk__gt=last_id)
+            .order_by("pk")
+            .values_list("pk", flat=True)[:BATCH_SIZE]
+        )
+        if not user_ids:
+            return
+        counts = {}
+        for field, (app_label, model_name, user_column, filters) in STAT_SOURCES.items():
+            model = apps.get_model(app_label, model_name)
+            counts[field] = dict(
+                model.objects.filter(**{f"{user_column}__in": user_ids}, **filters)
+                .order_by()
+                .values(user_column)
+                .annotate(total=Count("pk"))
+                .values_list(user_column, "total")
+            )
+        UserStats.objects.bulk_create(
+            [
+                UserStats(
+                    user_id=user_id,
+                    **{field: counts[field].get(user_id, 0) for field in STAT_SOURCES},
+                )
+                for user_id in user_ids
+            ]
+        )
+        last_id = user_ids[-1]
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0002_customuser_github_username'),
+        ('contributions', '0001_initial'),
+        ('messaging', '0004_remove_message_conversation_alter_message_file_and_more'),
+        ('resume', '0001_initial'),
+        ('videos', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserStats',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='stats', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('contribution_count', models.PositiveIntegerField(default=0)),
+                ('video_count', models.PositiveIntegerField(default=0)),
+                ('resume_count', models.PositiveIntegerField(default=0)),
+                ('unread_count', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.RunPython(build_user_stats, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.0.3 on 2026-10-16 22:43
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_endorsement_score(apps, schema_editor):
+    UserStats = apps.get_model("users", "UserStats")
+    Endorsement = apps.get_model("endorsements", "Endorsement")
+    received = (
+        Endorsement.objects.filter(endorsed_user=OuterRef("user"))
+        .order_by()
+        .values("endorsed_user")
+        .annotate(total=Count("pk"))
+        .values("total")
+    )
+    UserStats.objects.update(endorsement_score=Coalesce(Subquery(received), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0003_userstats'),
+        ('endorsements', '0002_alter_endorsement_unique_together_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='userstats',
+            name='endorsement_score',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_endorsement_score, migrations.RunPython.noop),
+    ]
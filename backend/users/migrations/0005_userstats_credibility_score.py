@@ -0,0 +1,22 @@
+# Generated by Django 5.0.3 on 2026-10-16 22:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0004_userstats_endorsement_score'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='userstats',
+            name='credibility_score',
+            field=models.FloatField(default=0),
+        ),
+        migrations.AddIndex(
+            model_name='userstats',
+            index=models.Index(fields=['-credibility_score', '-user'], name='userstats_credibility_idx'),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.0.3 on 2026-10-16 22:49
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0005_userstats_credibility_score'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CollaboratorRecommendation',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('score', models.FloatField()),
+                ('rank', models.PositiveSmallIntegerField()),
+                ('candidate', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='collaborator_recommendations', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='collaboratorrecommendation',
+            constraint=models.UniqueConstraint(fields=('user', 'rank'), name='collab_rec_user_rank_uniq'),
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.0.3 on 2026-10-16 23:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0007_customuser_joined_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='userstats',
+            name='recommendations_stale',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddIndex(
+            model_name='userstats',
+            index=models.Index(condition=models.Q(('recommendations_stale', True)), fields=['user'], name='userstats_recs_stale_idx'),
+        ),
+    ]
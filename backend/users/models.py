@@ -23,5 +23,88 @@ class CustomUser(AbstractUser):
     # Required when creating a superuser through CLI
     REQUIRED_FIELDS = ["email"]
 
+    class Meta(AbstractUser.Meta):
+        indexes = [
+            # Keyset pagination of the user directory (UserCursorPagination)
+            models.Index(fields=["-date_joined", "-id"], name="user_joined_idx"),
+        ]
+
     def __str__(self):
         return f"{self.username}'s Profile"
+
+
+class UserStats(models.Model):
+    """
+    Denormalized per-user counters backing the dashboard.
+    Kept current by signal handlers in the owning apps (see users/stats.py);
+    `manage.py reconcile_user_stats` rebuilds them from the source tables.
+    """
+
+    user = models.OneToOneField(
+        CustomUser,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="stats",
+    )
+    contribution_count = models.PositiveIntegerField(default=0)
+    video_count = models.PositiveIntegerField(default=0)
+    resume_count = models.PositiveIntegerField(default=0)
+    unread_count = models.PositiveIntegerField(default=0)
+    # Endorsements received
+    endorsement_score = models.PositiveIntegerField(default=0)
+    # PageRank over the endorsement graph, scaled so the average user is 1.0;
+    # written by endorsements/credibility.py
+    credibility_score = models.FloatField(default=0)
+    # Set by activity that can change this user's recommendations; cleared
+    # by users/recommendations.py when the refresh worker picks them up
+    recommendations_stale = models.BooleanField(default=False)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            # Credibility leaderboard (CredibilityCursorPagination)
+            models.Index(
+                fields=["-credibility_score", "-user"], name="userstats_credibility_idx"
+            ),
+            # Refresh worker's queue; only the few flagged rows are indexed
+            models.Index(
+                fields=["user"],
+                condition=models.Q(recommendations_stale=True),
+                name="userstats_recs_stale_idx",
+            ),
+        ]
+
+    def __str__(self):
+        return f"Stats for {self.user_id}"
+
+
+class CollaboratorRecommendation(models.Model):
+    """
+    Precomputed "developers like you" neighbors: the top-K users by cosine
+    similarity of contribution-type and endorsement-neighborhood features.
+    Rebuilt by users/recommendations.py; never computed per request.
+    """
+
+    user = models.ForeignKey(
+        CustomUser,
+        on_delete=models.CASCADE,
+        related_name="collaborator_recommendations",
+    )
+    candidate = models.ForeignKey(
+        CustomUser,
+        on_delete=models.CASCADE,
+        related_name="+",
+    )
+    score = models.FloatField()
+    rank = models.PositiveSmallIntegerField()
+
+    class Meta:
+        constraints = [
+            # Also serves the endpoint's ordered read of one user's list
+            models.UniqueConstraint(
+                fields=["user", "rank"], name="collab_rec_user_rank_uniq"
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.user_id} -> {self.candidate_id} ({self.score:.3f})"
@@ -0,0 +1,193 @@
+"""
+Materialized profile documents for the public/private profile endpoints.
+
+A profile document is built once per user from UserStats and the user's
+videos and stored in the cache together with a content hash and build
+time. Documents are keyed by a per-user version token that signal
+handlers replace (after commit) whenever the user's profile,
+contributions, endorsements or videos change, and drop (with the
+username mapping) when the user is deleted. The version is read before
+any user data, so a request that rebuilds a document from pre-commit data
+while an invalidation lands stores it under the old version, where it is
+never served. Media URLs are stored relative and joined with the
+request's base URL when served.
+"""
+
+import hashlib
+import json
+import time
+import uuid
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import transaction
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+from rest_framework.response import Response
+from rest_framework.utils.encoders import JSONEncoder
+
+from videos.models import MentoringVideo
+from .stats import get_user_stats
+
+User = get_user_model()
+
+# Documents are invalidated explicitly; the timeout only bounds cache growth
+PROFILE_DOCUMENT_TIMEOUT = 60 * 60 * 24
+
+
+def _version_key(user_id):
+    return f"profile:version:{user_id}"
+
+
+def _document_key(user_id, version):
+    return f"profile:doc:{user_id}:{version}"
+
+
+def _username_key(username):
+    return f"profile:username:{username}"
+
+
+def _new_version():
+    # Random tokens, not counters: an evicted version key can never come
+    # back as a value some old document was stored under
+    return uuid.uuid4().hex
+
+
+def _document_version(user_id):
+    """Return the user's current document version, creating one if needed."""
+    version = cache.get(_version_key(user_id))
+    if version is None:
+        cache.add(_version_key(user_id), _new_version(), timeout=None)
+        version = cache.get(_version_key(user_id))
+    return version
+
+
+def build_profile_document(user, version):
+    """Build the profile document for `user` and cache it under `version`."""
+    stats = get_user_stats(user)
+    data = {
+        "id": user.id,
+        "username": user.username,
+        "bio": user.bio,
+        "github_username": user.github_username,
+        "profile_image": user.profile_image.url if user.profile_image else None,
+        "endorsement_score": stats.endorsement_score,
+        "credibility_score": stats.credibility_score,
+        "contribution_score": stats.contribution_count,
+        "videos": [
+            {
+                "id": v.id,
+                "title": v.title,
+                "description": v.description,
+                "video_file": v.video_file.url,
+                "uploaded_at": v.uploaded_at,
+            }
+            for v in MentoringVideo.objects.filter(user=user).order_by("id")
+        ],
+    }
+    payload = json.dumps(data, cls=JSONEncoder, sort_keys=True)
+    document = {
+        "data": data,
+        "etag": hashlib.sha256(payload.encode()).hexdigest()[:32],
+        "last_modified": time.time(),
+    }
+    cache.set_many(
+        {
+            _document_key(user.id, version): document,
+            _username_key(user.username): user.id,
+        },
+        timeout=PROFILE_DOCUMENT_TIMEOUT,
+    )
+    return document
+
+
+def _load_document(user_id):
+    version = _document_version(user_id)
+    document = cache.get(_document_key(user_id, version))
+    if document is None:
+        user = User.objects.filter(pk=user_id).first()
+        if user is not None:
+            document = build_profile_document(user, version)
+    return document
+
+
+def get_profile_document(user_id=None, username=None):
+    """
+    Return the profile document by user id or username, building it on a
+    cache miss, or None if there is no such user. A warm cache answers
+    without a database query.
+    """
+    if user_id is not None:
+        return _load_document(user_id)
+
+    cached_id = cache.get(_username_key(username))
+    if cached_id is not None:
+        document = _load_document(cached_id)
+        if document is not None and document["data"]["username"] == username:
+            return document
+    # Unknown or renamed: resolve the id before reading the version
+    user_id = User.objects.filter(username=username).values_list("pk", flat=True).first()
+    if user_id is None:
+        return None
+    return _load_document(user_id)
+
+
+def invalidate_profile_document(user_id):
+    """Retire the user's document once the current transaction commits."""
+    invalidate_profile_documents([user_id])
+
+
+def invalidate_profile_documents(user_ids):
+    """Retire several users' documents once the current transaction commits."""
+    keys = [_version_key(user_id) for user_id in user_ids]
+    if keys:
+        transaction.on_commit(
+            lambda: cache.set_many({key: _new_version() for key in keys}, timeout=None)
+        )
+
+
+def forget_profile_document(user_id, username):
+    """
+    Drop a deleted user's version token and username mapping once the
+    current transaction commits, so neither endpoint serves the cached
+    document again.
+    """
+    transaction.on_commit(
+        lambda: cache.delete_many([_version_key(user_id), _username_key(username)])
+    )
+
+
+def _absolute(base_url, url):
+    if not url or "://" in url:
+        return url
+    return base_url + url
+
+
+def profile_response(request, document, cache_control="private"):
+    """
+    Serve a document with a strong ETag and Last-Modified, answering
+    conditional requests with 304 Not Modified.
+    """
+    base_url = request.build_absolute_uri("/").rstrip("/")
+    # The served body embeds the base URL, so it is part of the validator
+    etag = '"%s"' % hashlib.sha256(
+        f"{document['etag']}:{base_url}".encode()
+    ).hexdigest()[:32]
+    last_modified = int(document["last_modified"])
+
+    response = get_conditional_response(
+        request, etag=etag, last_modified=last_modified
+    )
+    if response is None:
+        data = dict(document["data"])
+        data["profile_image"] = _absolute(base_url, data["profile_image"])
+        data["videos"] = [
+            {**v, "video_file": _absolute(base_url, v["video_file"])}
+            for v in data["videos"]
+        ]
+        response = Response(data)
+
+    response["ETag"] = etag
+    response["Last-Modified"] = http_date(last_modified)
+    response["Cache-Control"] = f"{cache_control}, no-cache"
+    return response
@@ -0,0 +1,192 @@
+"""
+Precomputed collaborator recommendations ("developers like you").
+
+Every user gets a compact feature vector: the log-scaled distribution of
+their contribution types, followed by the averaged distribution of their
+endorsement neighborhood (people they endorsed or were endorsed by). Rows
+are L2-normalized, so a batch of rows times the transposed matrix gives
+cosine similarities; `np.argpartition` picks the top K per row. The
+results are stored in CollaboratorRecommendation and the endpoint only
+reads that table.
+
+Contribution and endorsement signal handlers only flag users stale on
+UserStats, inside the writing transaction. `manage.py
+refresh_recommendations --loop` picks the flagged users up in batches and
+refreshes them, their endorsement neighbors and everyone currently
+recommending them, so any number of changes between passes costs one
+feature build. Without `--loop` the command rebuilds every list.
+"""
+
+import numpy as np
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import Count, F
+
+from contributions.models import Contribution
+from endorsements.credibility import dense_edges
+from endorsements.models import Endorsement
+from .models import CollaboratorRecommendation, UserStats
+
+User = get_user_model()
+
+TOP_K = 10
+
+# Weight of the endorsement-neighborhood half of the feature vector
+NEIGHBORHOOD_WEIGHT = 0.5
+
+# Working memory for one batch of rows: each row scored costs a float32
+# similarity and an int64 partition index per user
+MEMORY_BUDGET = 256 * 1024 * 1024
+BYTES_PER_SCORE = 12
+
+TYPES = [choice for choice, _ in Contribution.TYPE_CHOICES]
+
+# Stale users refreshed per pass of `refresh_stale_recommendations`
+STALE_BATCH_SIZE = 5000
+
+
+def _normalize(matrix):
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return np.divide(matrix, norms, out=np.zeros_like(matrix), where=norms > 0)
+
+
+def build_features():
+    """
+    Return (user ids, feature matrix, endorsement edges as index pairs).
+    Rows follow the sorted user ids; users with no activity get zero rows.
+    """
+    user_ids = np.fromiter(
+        User.objects.order_by("pk").values_list("pk", flat=True), dtype=np.int64
+    )
+    n = len(user_ids)
+    type_index = {name: i for i, name in enumerate(TYPES)}
+
+    counts = np.zeros((n, len(TYPES)), dtype=np.float32)
+    rows = (
+        Contribution.objects.order_by()
+        .values("user_id", "contribution_type")
+        .annotate(total=Count("pk"))
+        .values_list("user_id", "contribution_type", "total")
+    )
+    for user_id, contribution_type, total in rows:
+        column = type_index.get(contribution_type)
+        row = np.searchsorted(user_ids, user_id)
+        # Users who signed up after the id list was read wait for the next pass
+        if column is not None and row < n and user_ids[row] == user_id:
+            counts[row, column] = total
+    own = _normalize(np.log1p(counts))
+
+    pairs = (
+        Endorsement.objects.exclude(endorsed_by=F("endorsed_user"))
+        .order_by()
+        .values_list("endorsed_by_id", "endorsed_user_id")
+        .distinct()
+    )
+    edges = dense_edges(user_ids, pairs)
+    # Endorsements count in both directions for the neighborhood
+    sources = np.concatenate([edges[:, 0], edges[:, 1]])
+    targets = np.concatenate([edges[:, 1], edges[:, 0]])
+    neighborhood = np.zeros_like(own)
+    np.add.at(neighborhood, sources, own[targets])
+
+    features = np.hstack([own, NEIGHBORHOOD_WEIGHT * _normalize(neighborhood)])
+    return user_ids, _normalize(features), edges
+
+
+def top_k_neighbors(features, rows, k=TOP_K):
+    """
+    Yield (row, neighbor rows, scores) for each requested row, best first.
+    Only positive similarities are kept and a row never matches itself.
+    """
+    n = len(features)
+    k = min(k, n - 1)
+    if k <= 0:
+        return
+    batch_size = max(1, MEMORY_BUDGET // (BYTES_PER_SCORE * n))
+    for start in range(0, len(rows), batch_size):
+        batch = rows[start:start + batch_size]
+        similarity = features[batch] @ features.T
+        # Negated in place, so the partition picks the best without a copy
+        np.negative(similarity, out=similarity)
+        similarity[np.arange(len(batch)), batch] = np.inf
+        top = np.argpartition(similarity, k - 1, axis=1)[:, :k]
+        scores = -np.take_along_axis(similarity, top, axis=1)
+        order = np.argsort(-scores, axis=1)
+        top = np.take_along_axis(top, order, axis=1)
+        scores = np.take_along_axis(scores, order, axis=1)
+        for row, neighbors, row_scores in zip(batch, top, scores):
+            keep = row_scores > 0
+            yield row, neighbors[keep], row_scores[keep]
+
+
+def refresh_recommendations(user_ids=None):
+    """
+    Recompute recommendation lists for `user_ids` and the users whose lists
+    they can affect, or for everyone when `user_ids` is None. Returns the
+    number of lists rewritten.
+    """
+    all_ids, features, edges = build_features()
+    if user_ids is None:
+        rows = np.arange(len(all_ids))
+    else:
+        user_ids = list(user_ids)
+        # Lists that currently show the changed users may reorder
+        recommenders = CollaboratorRecommendation.objects.filter(
+            candidate_id__in=user_ids
+        ).values_list("user_id", flat=True)
+        changed = np.nonzero(np.isin(all_ids, user_ids))[0]
+        stale = np.nonzero(np.isin(all_ids, list(recommenders)))[0]
+        # Endorsement neighbors' feature vectors include the changed users
+        touches = np.isin(edges, changed).any(axis=1)
+        rows = np.union1d(np.union1d(changed, stale), edges[touches].ravel())
+    rows = rows.astype(np.int64)
+
+    recommendations = [
+        CollaboratorRecommendation(
+            user_id=int(all_ids[row]),
+            candidate_id=int(all_ids[neighbor]),
+            score=round(float(score), 4),
+            rank=rank,
+        )
+        for row, neighbors, scores in top_k_neighbors(features, rows)
+        for rank, (neighbor, score) in enumerate(zip(neighbors, scores), start=1)
+    ]
+    with transaction.atomic():
+        stale_lists = CollaboratorRecommendation.objects.all()
+        if user_ids is not None:
+            stale_lists = stale_lists.filter(user_id__in=all_ids[rows].tolist())
+        stale_lists.delete()
+        CollaboratorRecommendation.objects.bulk_create(recommendations, batch_size=2000)
+    return len(rows)
+
+
+def mark_recommendations_stale(*user_ids):
+    """
+    Flag these users for the next incremental refresh. Runs as part of the
+    caller's transaction, so a rolled-back write leaves no flag behind.
+    """
+    UserStats.objects.filter(pk__in=user_ids, recommendations_stale=False).update(
+        recommendations_stale=True
+    )
+
+
+def refresh_stale_recommendations(batch_size=STALE_BATCH_SIZE):
+    """
+    Refresh up to `batch_size` flagged users. The flags are cleared before
+    the refresh, so users marked while it runs are picked up next time; if
+    the refresh fails they are flagged again. Returns (users, lists).
+    """
+    user_ids = list(
+        UserStats.objects.filter(recommendations_stale=True)
+        .order_by("pk")
+        .values_list("pk", flat=True)[:batch_size]
+    )
+    if not user_ids:
+        return 0, 0
+    UserStats.objects.filter(pk__in=user_ids).update(recommendations_stale=False)
+    try:
+        lists = refresh_recommendations(user_ids)
+    except Exception:
+        mark_recommendations_stale(*user_ids)
+        raise
+    return len(user_ids), lists
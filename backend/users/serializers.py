@@ -1,10 +1,11 @@
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
 from django.contrib.auth.password_validation import validate_password
-from endorsements.models import Endorsement
 from videos.models import MentoringVideo
 from videos.serializers import MentoringVideoSerializer
 
+from .models import CollaboratorRecommendation
+
 User = get_user_model()
 
 
@@ -51,7 +52,13 @@ class UserSerializer(serializers.ModelSerializer):
     """
 
     contribution_score = serializers.SerializerMethodField()
-    endorsement_score = serializers.SerializerMethodField()
+    # Counters live on UserStats so user saves cannot overwrite them
+    endorsement_score = serializers.IntegerField(
+        source="stats.endorsement_score", read_only=True
+    )
+    credibility_score = serializers.FloatField(
+        source="stats.credibility_score", read_only=True
+    )
     videos = serializers.SerializerMethodField()
 
     class Meta:
@@ -65,19 +72,36 @@ class UserSerializer(serializers.ModelSerializer):
             "profile_image",
             "contribution_score",
             "endorsement_score",
+            "credibility_score",
             "videos",
         ]
-        read_only_fields = ["id", "username", "email"]
+        read_only_fields = [
+            "id",
+            "username",
+            "email",
+        ]
 
     def get_contribution_score(self, obj):
         # Contribution score could be annotated in queryset; default fallback is 0
         return getattr(obj, "contribution_score", 0)
 
-    def get_endorsement_score(self, obj):
-        # Count endorsements the user has received
-        return Endorsement.objects.filter(endorsed_user=obj).count()
-
     def get_videos(self, obj):
-        # Return latest mentoring videos uploaded by the user
-        qs = MentoringVideo.objects.filter(user=obj).order_by("-uploaded_at")
+        # Return latest mentoring videos uploaded by the user, using the
+        # list view's prefetch when available
+        qs = getattr(obj, "latest_videos", None)
+        if qs is None:
+            qs = MentoringVideo.objects.filter(user=obj).order_by("-uploaded_at")
         return MentoringVideoSerializer(qs, many=True).data
+
+
+class CollaboratorRecommendationSerializer(serializers.ModelSerializer):
+    """A recommended collaborator with their similarity score."""
+
+    id = serializers.IntegerField(source="candidate.id", read_only=True)
+    username = serializers.CharField(source="candidate.username", read_only=True)
+    profile_image = serializers.ImageField(source="candidate.profile_image", read_only=True)
+
+    class Meta:
+        model = CollaboratorRecommendation
+        fields = ["id", "username", "profile_image", "score"]
+        read_only_fields = fields
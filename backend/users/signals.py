@@ -0,0 +1,25 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import CustomUser, UserStats
+from .profiles import forget_profile_document, invalidate_profile_document
+
+
+@receiver(post_save, sender=CustomUser)
+def create_user_stats(sender, instance, created, raw=False, **kwargs):
+    # Every new user starts with an empty counters row
+    if created and not raw:
+        UserStats.objects.get_or_create(user=instance)
+
+
+@receiver(post_save, sender=CustomUser)
+def user_profile_changed(sender, instance, created, raw=False, **kwargs):
+    # Bio, image or username edits change the materialized profile
+    if not created and not raw:
+        invalidate_profile_document(instance.pk)
+
+
+@receiver(post_delete, sender=CustomUser)
+def user_deleted(sender, instance, **kwargs):
+    # The cached profile would otherwise outlive the account for a day
+    forget_profile_document(instance.pk, instance.username)
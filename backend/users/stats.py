@@ -0,0 +1,94 @@
+"""
+Helpers for the denormalized UserStats counters.
+
+Signal handlers in the contributions, endorsements, videos, resume and
+messaging apps call `adjust_user_stats` so the dashboard can read one row
+instead of counting five tables. The counters live on UserStats rather
+than on the user row so that a full `user.save()` (profile edits, the
+admin) can never write back a stale value over concurrent F() updates.
+`rebuild_user_stats` recomputes rows from the source tables and is shared
+by `get_user_stats` and the `reconcile_user_stats` management command.
+"""
+
+from django.db.models import Count, F
+from django.db.models.functions import Greatest
+from django.utils import timezone
+
+from contributions.models import Contribution
+from endorsements.models import Endorsement
+from messaging.models import Message
+from resume.models import ResumeEntry
+from videos.models import MentoringVideo
+from .models import UserStats
+
+# counter field -> (source model, user foreign key column, extra filters)
+STAT_SOURCES = {
+    "contribution_count": (Contribution, "user_id", {}),
+    "video_count": (MentoringVideo, "user_id", {}),
+    "resume_count": (ResumeEntry, "user_id", {}),
+    "unread_count": (Message, "recipient_id", {"read": False}),
+    "endorsement_score": (Endorsement, "endorsed_user_id", {}),
+}
+
+
+def adjust_user_stats(user_id, **deltas):
+    """
+    Apply counter deltas for one user with a single UPDATE.
+    Counters never drop below zero. A missing row is left alone; it is
+    rebuilt from the source tables the next time it is read.
+    """
+    updates = {
+        field: Greatest(F(field) + delta, 0)
+        for field, delta in deltas.items()
+        if delta
+    }
+    if not updates:
+        return
+    UserStats.objects.filter(pk=user_id).update(updated_at=timezone.now(), **updates)
+
+
+def rebuild_user_stats(user_ids):
+    """
+    Recompute the counters for the given users with one GROUP BY query per
+    source table, then upsert the rows. Returns the rebuilt UserStats objects.
+    """
+    user_ids = list(user_ids)
+    if not user_ids:
+        return []
+
+    counts = {}
+    for field, (model, user_column, filters) in STAT_SOURCES.items():
+        rows = (
+            model.objects.filter(**{f"{user_column}__in": user_ids}, **filters)
+            .order_by()
+            .values(user_column)
+            .annotate(total=Count("pk"))
+            .values_list(user_column, "total")
+        )
+        counts[field] = dict(rows)
+
+    stats = [
+        UserStats(
+            user_id=user_id,
+            **{field: counts[field].get(user_id, 0) for field in STAT_SOURCES},
+        )
+        for user_id in user_ids
+    ]
+    UserStats.objects.bulk_create(
+        stats,
+        update_conflicts=True,
+        unique_fields=["user"],
+        update_fields=[*STAT_SOURCES, "updated_at"],
+    )
+    return stats
+
+
+def get_user_stats(user):
+    """
+    Return the user's stats row with a primary-key read, rebuilding it
+    if it does not exist yet (e.g. users created before the table).
+    """
+    try:
+        return UserStats.objects.get(pk=user.pk)
+    except UserStats.DoesNotExist:
+        return rebuild_user_stats([user.pk])[0]
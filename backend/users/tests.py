@@ -1,3 +1,256 @@
+from datetime import timedelta
+from importlib import import_module
+from unittest import mock
+
+import numpy as np
+from django.apps import apps
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from contributions.models import Contribution
+from devcred.testing import make_user
+from endorsements.models import Endorsement
+from messaging.models import Conversation, Message
+from messaging.unread import set_messages_read
+from resume.models import ResumeEntry
+from . import recommendations
+from .models import CollaboratorRecommendation, UserStats
+from .profiles import _document_version, build_profile_document, get_profile_document
+from .stats import get_user_stats, rebuild_user_stats
+
+User = get_user_model()
+
+
+class UserStatsCounterTests(TestCase):
+    """The denormalized counters must always equal a recount of the source tables."""
+
+    def setUp(self):
+        self.alice = make_user("alice")
+        self.bob = make_user("bob")
+
+    def assertMatchesRecount(self, user):
+        stored = UserStats.objects.get(pk=user.pk)
+        recounted = rebuild_user_stats([user.pk])[0]
+        for field in ("contribution_count", "video_count", "resume_count", "unread_count"):
+            self.assertEqual(getattr(stored, field), getattr(recounted, field), field)
+
+    def test_new_user_gets_empty_row(self):
+        stats = get_user_stats(self.alice)
+        self.assertEqual(stats.contribution_count, 0)
+        self.assertEqual(stats.unread_count, 0)
+
+    def test_contribution_and_resume_counters_follow_creates_and_deletes(self):
+        first = Contribution.objects.create(
+            user=self.alice, title="Fix login", contribution_type="bugfix"
+        )
+        Contribution.objects.create(user=self.alice, title="Docs", contribution_type="docs")
+        ResumeEntry.objects.create(user=self.alice, content="cv")
+        first.delete()
+
+        stats = UserStats.objects.get(pk=self.alice.pk)
+        self.assertEqual(stats.contribution_count, 1)
+        self.assertEqual(stats.resume_count, 1)
+        self.assertMatchesRecount(self.alice)
+
+    def test_unread_counter_follows_sends_reads_and_deletes(self):
+        first = Message.objects.create(sender=self.bob, recipient=self.alice, text="one")
+        second = Message.objects.create(sender=self.bob, recipient=self.alice, text="two")
+        Message.objects.create(sender=self.bob, recipient=self.alice, text="three")
+        self.assertEqual(UserStats.objects.get(pk=self.alice.pk).unread_count, 3)
+
+        first.read = True
+        first.save()
+        second.delete()
+        self.assertEqual(UserStats.objects.get(pk=self.alice.pk).unread_count, 1)
+        self.assertMatchesRecount(self.alice)
+
+    def test_bulk_read_changes_keep_both_counters(self):
+        for text in ("one", "two", "three"):
+            Message.objects.create(sender=self.bob, recipient=self.alice, text=text)
+
+        changed = set_messages_read(Message.objects.filter(recipient=self.alice))
+        self.assertEqual(len(changed), 3)
+        # Already-read rows are not counted a second time
+        self.assertEqual(set_messages_read(Message.objects.filter(recipient=self.alice)), [])
+
+        self.assertEqual(UserStats.objects.get(pk=self.alice.pk).unread_count, 0)
+        conversation = Conversation.objects.get()
+        self.assertEqual((conversation.unread_a, conversation.unread_b), (0, 0))
+        self.assertMatchesRecount(self.alice)
+
+        set_messages_read(Message.objects.filter(recipient=self.alice, text="two"), read=False)
+        self.assertEqual(UserStats.objects.get(pk=self.alice.pk).unread_count, 1)
+        self.assertMatchesRecount(self.alice)
+
+    def test_migration_builds_rows_for_existing_users(self):
+        Contribution.objects.create(user=self.alice, title="Docs", contribution_type="docs")
+        ResumeEntry.objects.create(user=self.bob, content="cv")
+        Message.objects.create(sender=self.bob, recipient=self.alice, text="hi")
+
+        UserStats.objects.all().delete()
+        migration = import_module("users.migrations.0003_userstats")
+        migration.build_user_stats(apps, None)
+        self.assertEqual(UserStats.objects.count(), User.objects.count())
+        self.assertMatchesRecount(self.alice)
+        self.assertMatchesRecount(self.bob)
+
+
+class UserListPaginationTests(TestCase):
+    def setUp(self):
+        now = timezone.now()
+        self.users = [make_user(f"user{i}") for i in range(5)]
+        # Two users share a join time so the id tie-breaker is exercised
+        for i, user in enumerate(self.users):
+            user.date_joined = now - timedelta(days=min(i, 3))
+            user.save(update_fields=["date_joined"])
+        self.client = APIClient()
+        self.client.force_authenticate(self.users[0])
+
+    def test_cursor_walks_every_user_once_newest_first(self):
+        seen = []
+        url = "/api/users/?page_size=2"
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            self.assertLessEqual(len(response.data["results"]), 2)
+            seen.extend(row["id"] for row in response.data["results"])
+            url = response.data["next"]
+
+        expected = sorted(self.users, key=lambda u: (u.date_joined, u.pk), reverse=True)
+        self.assertEqual(seen, [user.pk for user in expected])
+
+    def test_page_cost_does_not_grow_with_page_size(self):
+        with CaptureQueriesContext(connection) as small:
+            self.client.get("/api/users/?page_size=1")
+        with CaptureQueriesContext(connection) as large:
+            self.client.get("/api/users/?page_size=5")
+        self.assertEqual(len(small), len(large))
+
+
+class ProfileDocumentTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = make_user("alice")
+
+    def test_warm_document_is_served_without_queries(self):
+        get_profile_document(username="alice")
+        with self.assertNumQueries(0):
+            document = get_profile_document(username="alice")
+        self.assertEqual(document["data"]["id"], self.user.pk)
+
+    def test_build_racing_an_invalidation_is_never_served(self):
+        # A reader picks up the version, then the writer commits and invalidates
+        version = _document_version(self.user.pk)
+        stale = User.objects.get(pk=self.user.pk)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.bio = "updated"
+            self.user.save()
+        # The reader finishes building from the data it loaded before the commit
+        build_profile_document(stale, version)
+
+        self.assertEqual(get_profile_document(user_id=self.user.pk)["data"]["bio"], "updated")
+
+    def test_renamed_user_is_not_served_under_the_old_name(self):
+        get_profile_document(username="alice")
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.username = "alicia"
+            self.user.save()
+        self.assertIsNone(get_profile_document(username="alice"))
+        self.assertEqual(get_profile_document(username="alicia")["data"]["id"], self.user.pk)
+
+    def test_deleted_user_is_no_longer_served(self):
+        client = APIClient()
+        self.assertEqual(client.get("/api/users/public/alice/").status_code, 200)
+        user_id = self.user.pk
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.delete()
+        self.assertEqual(client.get("/api/users/public/alice/").status_code, 404)
+        self.assertIsNone(get_profile_document(user_id=user_id))
+
+    def test_conditional_request_gets_not_modified(self):
+        client = APIClient()
+        first = client.get("/api/users/public/alice/")
+        self.assertEqual(first.status_code, 200)
+        second = client.get("/api/users/public/alice/", HTTP_IF_NONE_MATCH=first["ETag"])
+        self.assertEqual(second.status_code, 304)
+
+
+class RecommendationRefreshTests(TestCase):
+    def setUp(self):
+        self.alice = make_user("alice")
+        self.bob = make_user("bob")
+        self.carol = make_user("carol")
+
+    def stale_ids(self):
+        return set(
+            UserStats.objects.filter(recommendations_stale=True).values_list("pk", flat=True)
+        )
+
+    def test_activity_flags_users_instead_of_refreshing(self):
+        with mock.patch.object(recommendations, "refresh_recommendations") as refresh:
+            for user in (self.alice, self.bob):
+                Contribution.objects.create(user=user, title="PR", contribution_type="code")
+            Endorsement.objects.create(endorsed_user=self.alice, endorsed_by=self.carol)
+        refresh.assert_not_called()
+        self.assertEqual(self.stale_ids(), {self.alice.pk, self.bob.pk, self.carol.pk})
+
+    def test_worker_refreshes_flagged_users_once(self):
+        for user in (self.alice, self.bob):
+            Contribution.objects.create(user=user, title="PR", contribution_type="code")
+
+        self.assertEqual(recommendations.refresh_stale_recommendations()[0], 2)
+        self.assertEqual(self.stale_ids(), set())
+        self.assertTrue(
+            CollaboratorRecommendation.objects.filter(
+                user=self.alice, candidate=self.bob
+            ).exists()
+        )
+        self.assertEqual(recommendations.refresh_stale_recommendations(), (0, 0))
+
+    def test_failed_refresh_keeps_users_flagged(self):
+        Contribution.objects.create(user=self.alice, title="PR", contribution_type="code")
+        with mock.patch.object(
+            recommendations, "refresh_recommendations", side_effect=RuntimeError
+        ):
+            with self.assertRaises(RuntimeError):
+                recommendations.refresh_stale_recommendations()
+        self.assertEqual(self.stale_ids(), {self.alice.pk})
+
+    def test_user_signing_up_mid_build_is_left_for_the_next_pass(self):
+        loaded = [self.alice.pk, self.bob.pk, self.carol.pk]
+        Contribution.objects.create(user=self.alice, title="PR", contribution_type="code")
+        dave = make_user("dave")
+        Contribution.objects.create(user=dave, title="PR", contribution_type="code")
+        Endorsement.objects.create(endorsed_user=self.alice, endorsed_by=dave)
+
+        # The user list was read before dave's rows committed
+        with mock.patch.object(recommendations, "User") as user_model:
+            user_model.objects.order_by.return_value.values_list.return_value = loaded
+            user_ids, features, edges = recommendations.build_features()
+        self.assertEqual(user_ids.tolist(), loaded)
+        self.assertEqual(features.shape[0], 3)
+        self.assertEqual(len(edges), 0)
+
+    def test_batch_size_follows_the_memory_budget(self):
+        rng = np.random.default_rng(0)
+        features = rng.random((50, 8), dtype=np.float32)
+        features /= np.linalg.norm(features, axis=1, keepdims=True)
+        rows = np.arange(50)
+
+        def neighbors():
+            return [
+                (row, found.tolist(), np.round(scores, 4).tolist())
+                for row, found, scores in recommendations.top_k_neighbors(features, rows)
+            ]
 
-# Create your tests here.
+        expected = neighbors()
+        # Room for a single row per matrix product
+        with mock.patch.object(recommendations, "MEMORY_BUDGET", 50 * 12):
+            self.assertEqual(neighbors(), expected)
+        self.assertTrue(all(row not in found for row, found, _ in expected))
+        self.assertTrue(all(scores == sorted(scores, reverse=True) for _, _, scores in expected))
@@ -1,5 +1,5 @@
 from django.urls import path
-from .views import SignupView, UserProfileView, DashboardView, UserListView, UserDetailView, public_profile, private_profile, github_login, github_callback
+from .views import SignupView, UserProfileView, DashboardView, UserListView, UserDetailView, CollaboratorRecommendationView, public_profile, private_profile, github_login, github_callback
 from rest_framework_simplejwt.views import TokenObtainPairView
 
 urlpatterns = [
@@ -10,6 +10,7 @@ urlpatterns = [
     # User profile endpoints
     path("me/", UserProfileView.as_view(), name="me"),
     path("dashboard/", DashboardView.as_view(), name="dashboard"),
+    path("recommendations/", CollaboratorRecommendationView.as_view(), name="collaborator-recommendations"),
     path("", UserListView.as_view(), name="user-list"),
     path("<int:pk>/", UserDetailView.as_view(), name="user-detail"),
     
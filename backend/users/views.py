@@ -1,24 +1,23 @@
 import requests
-from users.models import CustomUser
 from rest_framework import generics, status
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.permissions import AllowAny, IsAuthenticated
-from rest_framework.decorators import api_view, permission_classes
+from rest_framework.decorators import api_view, authentication_classes, permission_classes
 from django.shortcuts import redirect
+from django.db.models import Prefetch
+from django.db.models.functions import Coalesce
 
 
 from django.conf import settings
-import re
-
 from django.contrib.auth import get_user_model
-from messaging.models import Message
-from .serializers import SignupSerializer, UserSerializer
-from videos.models import MentoringVideo
-from resume.models import ResumeEntry
-from endorsements.models import Endorsement
-from contributions.models import Contribution
+from devcred.pagination import UserCursorPagination
+from .models import CollaboratorRecommendation
+from .serializers import CollaboratorRecommendationSerializer, SignupSerializer, UserSerializer
+from .stats import get_user_stats
+from .profiles import get_profile_document, profile_response
 from videos.models import MentoringVideo
+from integrations.repo_counts import NOT_FOUND as REPO_COUNT_NOT_FOUND, get_repo_count
 from urllib.parse import urlencode
 
 # GitHub OAuth config
@@ -54,23 +53,6 @@ class UserProfileView(APIView):
         return Response(serializer.data, status=status.HTTP_200_OK)
 
 
-def get_github_repo_count(username: str) -> int:
-    """
-    Fallback method to scrape GitHub repo count if API calls fail.
-    Used for contribution stats in Dashboard.
-    """
-    try:
-        url = f"https://github.com/{username}?tab=repositories"
-        res = requests.get(url, timeout=5)
-        if res.status_code == 200:
-            match = re.search(r"(\d+)\s+repositories", res.text)
-            if match:
-                return int(match.group(1))
-    except Exception as e:
-        print(f"GitHub scrape failed for {username}: {e}")
-    return 0
-
-
 class DashboardView(APIView):
     """
     Dashboard combining counts and flags used by frontend.
@@ -80,38 +62,75 @@ class DashboardView(APIView):
 
     def get(self, request):
         user = request.user
-        video_count = MentoringVideo.objects.filter(user=user).count()
-        resume_generated = ResumeEntry.objects.filter(user=user).exists()
-        endorsement_count = Endorsement.objects.filter(endorsed_user=user).count()
-        contribution_count = Contribution.objects.filter(user=user).count()
+        # Single primary-key read of the denormalized counters
+        stats = get_user_stats(user)
 
         github_repo_count = 0
         github_username = getattr(user, "github_username", None)
         if github_username:
-            github_repo_count = get_github_repo_count(github_username)
-
-        unread_count = Message.objects.filter(recipient=user, read=False).count()
+            # Cached value; GitHub is only contacted by the background refresher.
+            # None until the first fetch completes
+            github_repo_count = get_repo_count(github_username)
+        github_user_not_found = github_repo_count == REPO_COUNT_NOT_FOUND
+        if github_user_not_found:
+            github_repo_count = 0
 
         data = {
             "username": user.username,
             "github_username": github_username,
             "email": user.email,
-            "contribution_score": contribution_count,
-            "endorsement_score": endorsement_count,
-            "video_contributions": video_count,
-            "resume_generated": resume_generated,
+            "contribution_score": stats.contribution_count,
+            "endorsement_score": stats.endorsement_score,
+            "credibility_score": stats.credibility_score,
+            "video_contributions": stats.video_count,
+            "resume_generated": stats.resume_count > 0,
             "github_repo_count": github_repo_count,
-            "unread_count": unread_count,
+            "github_repo_count_pending": github_repo_count is None,
+            "github_user_not_found": github_user_not_found,
+            "unread_count": stats.unread_count,
         }
         return Response(data, status=status.HTTP_200_OK)
 
 
 class UserListView(generics.ListAPIView):
-    """List all users (requires authentication)"""
+    """
+    List users with cursor pagination (requires authentication).
+    The contribution score is annotated from UserStats, the stats row is
+    joined for the endorsement score and videos are prefetched, so each
+    page costs a constant number of queries.
+    """
 
     permission_classes = [IsAuthenticated]
     serializer_class = UserSerializer
-    queryset = User.objects.all()
+    pagination_class = UserCursorPagination
+
+    def get_queryset(self):
+        return User.objects.select_related("stats").annotate(
+            contribution_score=Coalesce("stats__contribution_count", 0),
+        ).prefetch_related(
+            Prefetch(
+                "videos",
+                queryset=MentoringVideo.objects.order_by("-uploaded_at"),
+                to_attr="latest_videos",
+            )
+        )
+
+
+class CollaboratorRecommendationView(generics.ListAPIView):
+    """
+    "Developers like you" for the logged-in user, best match first.
+    Reads the precomputed neighbor table; similarity is never computed here.
+    """
+
+    permission_classes = [IsAuthenticated]
+    serializer_class = CollaboratorRecommendationSerializer
+
+    def get_queryset(self):
+        return (
+            CollaboratorRecommendation.objects.filter(user=self.request.user)
+            .select_related("candidate")
+            .order_by("rank")
+        )
 
 
 class UserDetailView(generics.RetrieveAPIView):
@@ -119,41 +138,21 @@ class UserDetailView(generics.RetrieveAPIView):
 
     permission_classes = [IsAuthenticated]
     serializer_class = UserSerializer
-    queryset = User.objects.all()
+    queryset = User.objects.select_related("stats")
 
 
 @api_view(["GET"])
+@authentication_classes([])
 @permission_classes([AllowAny])
 def public_profile(request, username):
-    try:
-        user = CustomUser.objects.get(username=username)
-    except CustomUser.DoesNotExist:
+    """
+    Public profile by username, served from the materialized profile
+    document. Conditional requests are answered without a database query.
+    """
+    document = get_profile_document(username=username)
+    if document is None:
         return Response({"error": "User not found"}, status=404)
-
-    data = {
-        "id": user.id,
-        "username": user.username,
-        "bio": user.bio,
-        "github_username": user.github_username,
-        "profile_image": (
-            request.build_absolute_uri(user.profile_image.url)
-            if user.profile_image
-            else None
-        ),
-        "endorsement_score": Endorsement.objects.filter(endorsed_user=user).count(),
-        "contribution_score": Contribution.objects.filter(user=user).count(),
-        "videos": [
-            {
-                "id": v.id,
-                "title": v.title,
-                "description": v.description,
-                "video_file": request.build_absolute_uri(v.video_file.url),
-                "uploaded_at": v.uploaded_at,
-            }
-            for v in MentoringVideo.objects.filter(user=user)
-        ],
-    }
-    return Response(data)
+    return profile_response(request, document, cache_control="public")
 
 
 @api_view(["GET"])
@@ -162,35 +161,10 @@ def private_profile(request, pk):
     """
     Same shape as public_profile, but fetched by user ID and requires auth.
     """
-    try:
-        user = CustomUser.objects.get(pk=pk)
-    except CustomUser.DoesNotExist:
+    document = get_profile_document(user_id=pk)
+    if document is None:
         return Response({"error": "User not found"}, status=status.HTTP_404_NOT_FOUND)
-
-    data = {
-        "id": user.id,
-        "username": user.username,
-        "bio": user.bio,
-        "github_username": user.github_username,
-        "profile_image": (
-            request.build_absolute_uri(user.profile_image.url)
-            if user.profile_image
-            else None
-        ),
-        "endorsement_score": Endorsement.objects.filter(endorsed_user=user).count(),
-        "contribution_score": Contribution.objects.filter(user=user).count(),
-        "videos": [
-            {
-                "id": v.id,
-                "title": v.title,
-                "description": v.description,
-                "video_file": request.build_absolute_uri(v.video_file.url),
-                "uploaded_at": v.uploaded_at,
-            }
-            for v in MentoringVideo.objects.filter(user=user)
-        ],
-    }
-    return Response(data, status=status.HTTP_200_OK)
+    return profile_response(request, document)
 
 
 @api_view(["GET"])
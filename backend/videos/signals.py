@@ -0,0 +1,22 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from users.profiles import invalidate_profile_document
+from users.stats import adjust_user_stats
+from .models import MentoringVideo
+
+
+@receiver(post_save, sender=MentoringVideo)
+def video_saved(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    if created:
+        adjust_user_stats(instance.user_id, video_count=1)
+    # Title/description edits show up on the profile too
+    invalidate_profile_document(instance.user_id)
+
+
+@receiver(post_delete, sender=MentoringVideo)
+def video_deleted(sender, instance, **kwargs):
+    adjust_user_stats(instance.user_id, video_count=-1)
+    invalidate_profile_document(instance.user_id)
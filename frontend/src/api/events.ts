@@ -0,0 +1,82 @@
+import api from "./axios";
+
+type Handlers = {
+    unread?: (data: {unread_count: number}) => void;
+    message?: (data: {id: number; sender: number; recipient: number}) => void;
+    read?: (data: {message_id: number; read: boolean}) => void;
+    thread_read?: (data: {reader_id: number; up_to: number}) => void;
+};
+
+// How often `poll` runs while the stream is down, and when to retry the stream
+const POLL_INTERVAL = 15000;
+const RECONNECT_DELAY = 60000;
+
+// Open the server-sent events stream for the logged-in user.
+// EventSource cannot send headers, so each connection is opened with a
+// one-time ticket fetched with the access token. When the stream is
+// unavailable (e.g. the backend runs under WSGI) or drops, `poll` is called
+// every POLL_INTERVAL until a retry reconnects.
+// Returns a function that closes the stream and stops polling.
+export const openMessageEvents = (handlers: Handlers, poll?: () => void): (() => void) => {
+    if (!localStorage.getItem("token")) return () => {};
+
+    let source: EventSource | null = null;
+    let pollTimer: number | undefined;
+    let reconnectTimer: number | undefined;
+    let closed = false;
+
+    const stopPolling = () => {
+        window.clearInterval(pollTimer);
+        pollTimer = undefined;
+    };
+
+    const fallBack = () => {
+        // A ticket only opens one connection, so never let EventSource retry
+        source?.close();
+        source = null;
+        if (closed) return;
+        if (poll && pollTimer === undefined) {
+            poll();
+            pollTimer = window.setInterval(poll, POLL_INTERVAL);
+        }
+        window.clearTimeout(reconnectTimer);
+        reconnectTimer = window.setTimeout(connect, RECONNECT_DELAY);
+    };
+
+    const connect = async () => {
+        let ticket: string;
+        try {
+            const res = await api.post("/api/messaging/events/ticket/");
+            ticket = res.data.ticket;
+        } catch {
+            fallBack();
+            return;
+        }
+        if (closed) return;
+
+        source = new EventSource(
+            `${api.defaults.baseURL}/api/messaging/events/?ticket=${encodeURIComponent(ticket)}`
+        );
+        source.onopen = () => {
+            if (pollTimer === undefined) return;
+            // Catch up on anything that happened since the last poll
+            stopPolling();
+            poll?.();
+        };
+        source.onerror = fallBack;
+        (Object.keys(handlers) as (keyof Handlers)[]).forEach((type) => {
+            source?.addEventListener(type, (event) => {
+                handlers[type]?.(JSON.parse((event as MessageEvent).data));
+            });
+        });
+    };
+
+    connect();
+
+    return () => {
+        closed = true;
+        source?.close();
+        stopPolling();
+        window.clearTimeout(reconnectTimer);
+    };
+};
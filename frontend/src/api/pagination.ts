@@ -0,0 +1,11 @@
+import api from "./axios";
+
+export type Page<T> = {results: T[]; next: string | null};
+
+// Fetch one page of a cursor-paginated DRF endpoint. To continue, pass the
+// previous page's `next` URL without params: it already carries the cursor
+// and the original query string.
+export const fetchPage = async <T>(url: string, params?: Record<string, unknown>): Promise<Page<T>> => {
+    const res: {data: Page<T>} = await api.get(url, {params});
+    return res.data;
+};
@@ -0,0 +1,10 @@
+import api from "./axios";
+
+export type UserHit = {id: number; username: string; snippet: string};
+
+// Look users up through the ranked search endpoint instead of loading the
+// whole directory. Returns at most `pageSize` users, best match first.
+export const searchUsers = async (query: string, pageSize = 20): Promise<UserHit[]> => {
+    const res = await api.get("/api/search/", {params: {q: query, type: "user", page_size: pageSize}});
+    return res.data.results;
+};
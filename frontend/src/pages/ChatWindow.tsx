@@ -1,6 +1,7 @@
 import React, {useEffect, useRef, useState} from "react";
 import {useParams} from "react-router-dom";
 import api from "../api/axios";
+import {openMessageEvents} from "../api/events";
 import {toast} from "react-toastify";
 import {FaPaperclip, FaImage, FaPaperPlane} from "react-icons/fa";
 
@@ -24,11 +25,25 @@ const ChatWindow: React.FC = () => {
     const [loading, setLoading] = useState(true);
     const messagesEndRef = useRef<HTMLDivElement | null>(null);
 
-    // Fetch messages from API
+    // Mark everything the peer sent up to the newest loaded message as read
+    const markRead = async (loaded: Message[]) => {
+        const unread = loaded.filter((m) => !m.read && m.sender.toString() === userId);
+        if (!unread.length) return;
+        try {
+            await api.post(`/api/messaging/threads/${userId}/read/`, {
+                up_to: Math.max(...unread.map((m) => m.id)),
+            });
+        } catch {
+            // Retried with the next batch of messages
+        }
+    };
+
+    // Fetch the latest page of the thread (newest first from the API)
     const fetchMessages = async () => {
         try {
-            const res = await api.get(`/api/conversations/${userId}/messages/`);
-            setMessages(res.data);
+            const res = await api.get(`/api/messaging/threads/${userId}/`);
+            setMessages([...res.data.results].reverse());
+            markRead(res.data.results);
         } catch {
             toast.error("Failed to load messages");
         } finally {
@@ -36,11 +51,49 @@ const ChatWindow: React.FC = () => {
         }
     };
 
-    // Fetch messages on mount + poll every 5s
+    // Fetch only messages newer than the last one shown
+    const fetchNewMessages = async (lastId: number) => {
+        try {
+            const res = await api.get(`/api/messaging/threads/${userId}/`, {
+                params: {after: lastId},
+            });
+            if (res.data.results.length) {
+                setMessages((prev) => [...prev, ...[...res.data.results].reverse()]);
+                markRead(res.data.results);
+            }
+        } catch {
+            // Keep the current messages; the next poll retries
+        }
+    };
+
+    // Fetch messages on mount
     useEffect(() => {
         fetchMessages();
-        const interval = setInterval(fetchMessages, 5000); // refresh every 5s
-        return () => clearInterval(interval);
+    }, [userId]);
+
+    // Id of the newest message shown, read by the event handler below
+    const lastIdRef = useRef<number | null>(null);
+    useEffect(() => {
+        lastIdRef.current = messages.length ? messages[messages.length - 1].id : null;
+    }, [messages]);
+
+    // Fetch new messages when the server pushes one from this chat, or on
+    // every poll while the stream is unavailable
+    useEffect(() => {
+        const refresh = () => {
+            const lastId = lastIdRef.current;
+            if (lastId === null) fetchMessages();
+            else fetchNewMessages(lastId);
+        };
+        return openMessageEvents(
+            {
+                message: (data) => {
+                    const peer = Number(userId);
+                    if (data.sender === peer || data.recipient === peer) refresh();
+                },
+            },
+            refresh
+        );
     }, [userId]);
 
     // Always scroll to the latest message
@@ -1,5 +1,6 @@
 import React, {useEffect, useState} from "react";
 import api from "../api/axios";
+import {searchUsers, UserHit} from "../api/search";
 import {toast} from "react-toastify";
 
 interface Request {
@@ -10,26 +11,38 @@ interface Request {
     created_at: string;
 }
 
-interface User {
-    id: number;
-    username: string;
-}
+// Delay between the last keystroke and the user search request
+const SEARCH_DELAY = 300;
 
 const ContributionRequests: React.FC = () => {
-    const [users, setUsers] = useState<User[]>([]);
+    // Users matching the recipient search box
+    const [userQuery, setUserQuery] = useState("");
+    const [users, setUsers] = useState<UserHit[]>([]);
     const [requests, setRequests] = useState<Request[]>([]);
     const [selectedUser, setSelectedUser] = useState<number | null>(null);
     const [loading, setLoading] = useState(true);
 
-    // Fetch all users (to send requests)
-    const fetchUsers = async () => {
-        try {
-            const res = await api.get("/api/users/");
-            setUsers(res.data);
-        } catch {
-            toast.error("Unable to load users");
+    // Look recipients up on the server once typing pauses
+    useEffect(() => {
+        const query = userQuery.trim();
+        if (!query) {
+            setUsers([]);
+            return;
         }
-    };
+        let current = true;
+        const timer = window.setTimeout(async () => {
+            try {
+                const hits = await searchUsers(query);
+                if (current) setUsers(hits);
+            } catch {
+                if (current) toast.error("Unable to search users");
+            }
+        }, SEARCH_DELAY);
+        return () => {
+            current = false;
+            window.clearTimeout(timer);
+        };
+    }, [userQuery]);
 
     // Fetch contribution requests
     const fetchRequests = async () => {
@@ -44,7 +57,6 @@ const ContributionRequests: React.FC = () => {
     };
 
     useEffect(() => {
-        fetchUsers();
         fetchRequests();
     }, []);
 
@@ -58,6 +70,7 @@ const ContributionRequests: React.FC = () => {
             await api.post("/api/contribution-requests/", {recipient_id: selectedUser});
             toast.success("Request sent");
             setSelectedUser(null);
+            setUserQuery("");
             fetchRequests();
         } catch (err: any) {
             toast.error(err.response?.data?.detail || "Failed to send request");
@@ -96,12 +109,19 @@ const ContributionRequests: React.FC = () => {
             <div className="bg-white p-4 rounded shadow mb-6">
                 <h3 className="font-semibold mb-2">Send a Request</h3>
                 <div className="flex gap-2">
+                    <input
+                        type="text"
+                        placeholder="Search users..."
+                        value={userQuery}
+                        onChange={(e) => setUserQuery(e.target.value)}
+                        className="flex-1 p-2 border rounded"
+                    />
                     <select
                         value={selectedUser ?? ""}
                         onChange={(e) => setSelectedUser(Number(e.target.value))}
                         className="flex-1 p-2 border rounded"
                     >
-                        <option value="">-- Select User --</option>
+                        <option value="">{users.length ? "-- Select User --" : "-- Search first --"}</option>
                         {users.map((u) => (
                             <option key={u.id} value={u.id}>
                                 {u.username}
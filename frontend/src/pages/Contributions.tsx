@@ -1,5 +1,6 @@
 import React, {useEffect, useState} from "react";
 import api from "../api/axios";
+import {fetchPage} from "../api/pagination";
 import {toast} from "react-toastify";
 
 /** Contribution item shape from backend */
@@ -24,8 +25,10 @@ type LockState = {
 const LOCK_KEY = "contrib_lock_state";
 
 const Contributions: React.FC = () => {
-    /** State: all contributions list */
+    /** State: loaded contributions (newest first) and the next page URL */
     const [items, setItems] = useState<Contribution[]>([]);
+    const [nextPage, setNextPage] = useState<string | null>(null);
+    const [loadingMore, setLoadingMore] = useState(false);
     /** Form input states */
     const [title, setTitle] = useState("");
     const [description, setDescription] = useState("");
@@ -72,11 +75,32 @@ const Contributions: React.FC = () => {
         }
     };
 
+    /** Load the newest page of contributions, replacing the list */
+    const loadFirstPage = async () => {
+        const page = await fetchPage<Contribution>("/api/contributions/");
+        setItems(page.results);
+        setNextPage(page.next);
+    };
+
+    /** Append the next (older) page of contributions */
+    const loadMore = async () => {
+        if (!nextPage) return;
+        setLoadingMore(true);
+        try {
+            const page = await fetchPage<Contribution>(nextPage);
+            setItems((prev) => [...prev, ...page.results]);
+            setNextPage(page.next);
+        } catch {
+            toast.error("Unable to fetch more contributions");
+        } finally {
+            setLoadingMore(false);
+        }
+    };
+
     /** Fetch contributions list + check permission */
     const fetchData = async () => {
         try {
-            const res = await api.get("/api/contributions/");
-            setItems(res.data);
+            await loadFirstPage();
         } catch {
             toast.error("Unable to fetch contributions");
         }
@@ -174,8 +198,7 @@ const Contributions: React.FC = () => {
             }, 5000);
 
             // Refresh list
-            const res = await api.get("/api/contributions/");
-            setItems(res.data);
+            await loadFirstPage();
         } catch (err: any) {
             console.error(err);
             toast.error(err.response?.data?.detail || "Failed to create contribution");
@@ -276,6 +299,17 @@ const Contributions: React.FC = () => {
                     </div>
                 ))}
             </div>
+            {nextPage && (
+                <div className="mt-8 text-center">
+                    <button
+                        onClick={loadMore}
+                        disabled={loadingMore}
+                        className="px-6 py-2 rounded-lg border border-cyan-500/40 text-cyan-300 hover:bg-cyan-500/10 disabled:opacity-50 transition"
+                    >
+                        {loadingMore ? "Loading…" : "Load older contributions"}
+                    </button>
+                </div>
+            )}
         </div>
     );
 };
@@ -3,6 +3,7 @@ import axios from "../api/axios";
 import {toast} from "react-toastify";
 import {Link} from "react-router-dom";
 import {FaUsers, FaThumbsUp, FaGithub, FaVideo, FaFileAlt} from "react-icons/fa";
+import {openMessageEvents} from "../api/events";
 
 /** Shape of the data returned from the dashboard API */
 interface DashboardData {
@@ -13,7 +14,11 @@ interface DashboardData {
     endorsement_score: number;
     video_contributions: number;
     resume_generated: boolean;
-    github_repo_count: number;
+    /** null until the backend has fetched the count for the first time */
+    github_repo_count: number | null;
+    github_repo_count_pending: boolean;
+    /** The linked GitHub username does not exist */
+    github_user_not_found: boolean;
     unread_count: number;
 }
 
@@ -42,22 +47,28 @@ const Dashboard: React.FC = () => {
             setLoading(false);
         }
     };
-    /** Run on mount: fetch dashboard and set up polling */
+    /** Run on mount: fetch dashboard and subscribe to unread count pushes */
     useEffect(() => {
         fetchDashboard();
 
-        // Poll unread count every 10 seconds
-        const interval = setInterval(async () => {
-            try {
-                const res = await axios.get("/api/messaging/messages/unread_count/");
-                setUnread(res.data.unread_count);
-            } catch (err) {
-                console.error("Unread fetch error:", err);
+        // The server pushes the unread count whenever it changes; while the
+        // stream is unavailable the count is polled instead
+        const close = openMessageEvents(
+            {
+                unread: (data) => setUnread(data.unread_count),
+            },
+            async () => {
+                try {
+                    const res = await axios.get("/api/messaging/messages/unread_count/");
+                    setUnread(res.data.unread_count);
+                } catch {
+                    // The next poll retries
+                }
             }
-        }, 10000);
+        );
 
-        // Cleanup interval on unmount
-        return () => clearInterval(interval);
+        // Close the stream on unmount
+        return close;
     }, []);
 
     /** Show loading state */
@@ -137,9 +148,15 @@ const Dashboard: React.FC = () => {
                             }
                             <h3 className="text-lg font-semibold text-slate-200">GitHub Repositories</h3>
                             <p className="text-4xl font-extrabold mt-2 bg-gradient-to-r from-cyan-300 to-purple-300 bg-clip-text text-transparent">
-                                {data?.github_repo_count}
+                                {data?.github_repo_count_pending
+                                    ? "…"
+                                    : data?.github_user_not_found
+                                      ? "—"
+                                      : data?.github_repo_count}
                             </p>
-                            <span className="mt-3 text-sm text-slate-400">View on GitHub</span>
+                            <span className="mt-3 text-sm text-slate-400">
+                                {data?.github_user_not_found ? "GitHub user not found" : "View on GitHub"}
+                            </span>
                         </div>
                     </a>
 
@@ -1,4 +1,4 @@
-import React, {useEffect, useState} from "react";
+import React, {useEffect, useRef, useState} from "react";
 import api from "../api/axios";
 import {toast} from "react-toastify";
 
@@ -60,11 +60,15 @@ const Messages: React.FC = () => {
     const [currentUserId, setCurrentUserId] = useState<number | null>(null);
     const [currentUsername, setCurrentUsername] = useState<string>("");
 
+    // Opaque sync cursor; "0" starts from the beginning
+    const cursorRef = useRef("0");
+
     //Fetch messages & current user
     const fetchMessages = async () => {
         try {
-            const res = await api.get("/api/messaging/messages/");
-            setMessages(res.data);
+            setMessages([]);
+            cursorRef.current = "0";
+            await syncMessages();
 
             const userRes = await api.get("/api/users/me/");
             setCurrentUserId(userRes.data.id); // store ID
@@ -78,6 +82,30 @@ const Messages: React.FC = () => {
         fetchMessages();
     }, []);
 
+    // Merge messages created, changed or deleted since the cursor into the list
+    const syncMessages = async () => {
+        try {
+            let hasMore = true;
+            while (hasMore) {
+                const res = await api.get("/api/messaging/messages/", {
+                    params: {since: cursorRef.current},
+                });
+                const changed: Message[] = res.data.results;
+                const deleted: number[] = res.data.deleted;
+                setMessages((prev) => {
+                    const byId = new Map(prev.map((m) => [m.id, m]));
+                    changed.forEach((m) => byId.set(m.id, m));
+                    deleted.forEach((id) => byId.delete(id));
+                    return Array.from(byId.values());
+                });
+                cursorRef.current = res.data.cursor;
+                hasMore = res.data.has_more;
+            }
+        } catch {
+            toast.error("Failed to refresh messages");
+        }
+    };
+
     // Send new message
     const sendMessage = async (e: React.FormEvent) => {
         e.preventDefault();
@@ -99,7 +127,7 @@ const Messages: React.FC = () => {
             setText("");
             setRecipientUsername("");
             setFile(null);
-            fetchMessages(); // refresh inbox
+            syncMessages(); // fetch only what changed
         } catch (err: any) {
             if (err.response?.data) {
                 console.error("Backend error:", err.response.data);
@@ -120,7 +148,7 @@ const Messages: React.FC = () => {
         try {
             await api.post(`/api/messaging/messages/${id}/action/`, {action});
             toast.success(`Message ${action}ed`);
-            fetchMessages();
+            syncMessages();
         } catch {
             toast.error(`Failed to ${action} message`);
         }
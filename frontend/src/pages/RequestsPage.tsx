@@ -1,29 +1,56 @@
 import React, {useEffect, useState} from "react";
 import api from "../api/axios";
+import {fetchPage} from "../api/pagination";
 import {toast} from "react-toastify";
 
 type Request = {
     id: number;
     sender: string;
+    sender_id: number;
     recipient: string;
-    status: "pending" | "accepted" | "rejected";
+    recipient_id: number;
+    status: "pending" | "accepted" | "used";
 };
 
 const RequestsPage: React.FC = () => {
     const [requests, setRequests] = useState<Request[]>([]);
+    const [nextPage, setNextPage] = useState<string | null>(null);
+    const [loadingMore, setLoadingMore] = useState(false);
+    // Only the recipient of a request may accept or reject it
+    const [currentUserId, setCurrentUserId] = useState<number | null>(null);
 
-    // Fetch all contribution requests
+    // Fetch the newest page of contribution requests
     const fetchRequests = async () => {
         try {
-            const res = await api.get("/api/contributions/requests/");
-            setRequests(res.data);
+            // Incoming and outgoing requests (plus status counts) in one round trip
+            const page = await fetchPage<Request>("/api/contributions/requests/inbox/");
+            setRequests(page.results);
+            setNextPage(page.next);
         } catch {
             toast.error("Failed to fetch requests");
         }
     };
 
+    // Append the next (older) page of requests
+    const loadMore = async () => {
+        if (!nextPage) return;
+        setLoadingMore(true);
+        try {
+            const page = await fetchPage<Request>(nextPage);
+            setRequests((prev) => [...prev, ...page.results]);
+            setNextPage(page.next);
+        } catch {
+            toast.error("Failed to fetch more requests");
+        } finally {
+            setLoadingMore(false);
+        }
+    };
+
     useEffect(() => {
         fetchRequests();
+        api.get("/api/users/me/")
+            .then((res) => setCurrentUserId(res.data.id))
+            .catch(() => toast.error("Failed to load your profile"));
     }, []);
 
     // Handle request action (accept/reject)
@@ -45,7 +72,7 @@ const RequestsPage: React.FC = () => {
                     <span>
                         <strong>{req.sender}</strong> → {req.recipient} ({req.status})
                     </span>
-                    {req.status === "pending" && (
+                    {req.status === "pending" && req.recipient_id === currentUserId && (
                         <div className="space-x-2">
                             <button
                                 onClick={() => handleAction(req.id, "accept")}
@@ -63,6 +90,17 @@ const RequestsPage: React.FC = () => {
                     )}
                 </div>
             ))}
+            {nextPage && (
+                <div className="mt-4 text-center">
+                    <button
+                        onClick={loadMore}
+                        disabled={loadingMore}
+                        className="px-4 py-2 rounded border text-primary disabled:opacity-50"
+                    >
+                        {loadingMore ? "Loading…" : "Load older requests"}
+                    </button>
+                </div>
+            )}
         </div>
     );
 };
@@ -1,6 +1,8 @@
 import React, {JSX, useEffect, useState} from "react";
 import {Link} from "react-router-dom";
 import api from "../api/axios";
+import {fetchPage} from "../api/pagination";
+import {searchUsers} from "../api/search";
 import {toast} from "react-toastify";
 import {FaGithub, FaUserPlus, FaEye} from "react-icons/fa";
 
@@ -13,19 +15,26 @@ interface User {
     profile_image: string | null;
 }
 
+// Delay between the last keystroke and the search request
+const SEARCH_DELAY = 300;
+
 const UsersList: React.FC = () => {
-    // State for users list
+    // Directory pages loaded so far (newest first) and the next page URL
     const [users, setUsers] = useState<User[]>([]);
+    const [nextPage, setNextPage] = useState<string | null>(null);
+    const [loadingMore, setLoadingMore] = useState(false);
     // Loading state
     const [loading, setLoading] = useState(true);
-    // Search query state
+    // Search query state and its results (null when not searching)
     const [search, setSearch] = useState("");
+    const [results, setResults] = useState<User[] | null>(null);
 
-    // Fetch all users from backend API
+    // Fetch the first page of users from backend API
     const fetchUsers = async () => {
         try {
-            const res = await api.get("/api/users/");
-            setUsers(res.data);
+            const page = await fetchPage<User>("/api/users/");
+            setUsers(page.results);
+            setNextPage(page.next);
         } catch (err) {
             toast.error("Failed to load users");
             console.error("Users fetch error:", err); // Show error notification
@@ -34,11 +43,58 @@ const UsersList: React.FC = () => {
         }
     };
 
+    // Append the next page of users
+    const loadMore = async () => {
+        if (!nextPage) return;
+        setLoadingMore(true);
+        try {
+            const page = await fetchPage<User>(nextPage);
+            setUsers((prev) => [...prev, ...page.results]);
+            setNextPage(page.next);
+        } catch {
+            toast.error("Failed to load more users");
+        } finally {
+            setLoadingMore(false);
+        }
+    };
+
     // Run fetchUsers once when component mounts
     useEffect(() => {
         fetchUsers();
     }, []);
 
+    // Search the whole directory on the server once typing pauses
+    useEffect(() => {
+        const query = search.trim();
+        if (!query) {
+            setResults(null);
+            return;
+        }
+        let current = true;
+        const timer = window.setTimeout(async () => {
+            try {
+                const hits = await searchUsers(query, 50);
+                if (current) {
+                    setResults(
+                        hits.map((hit) => ({
+                            id: hit.id,
+                            username: hit.username,
+                            bio: hit.snippet,
+                            github_username: "",
+                            profile_image: null,
+                        }))
+                    );
+                }
+            } catch {
+                if (current) toast.error("Search failed");
+            }
+        }, SEARCH_DELAY);
+        return () => {
+            current = false;
+            window.clearTimeout(timer);
+        };
+    }, [search]);
+
     // Handle endorsing a user
     const endorseUser = async (id: number, username: string) => {
         try {
@@ -48,14 +104,13 @@ const UsersList: React.FC = () => {
                 endorsed_user_username: username,
             });
             toast.success(`You endorsed ${username}`);
-            fetchUsers(); // Refresh user list after endorsement
         } catch (err: any) {
             console.error("Endorsement error:", err.response?.data || err.message);
             toast.error("You cannot endorse yourself");
         }
     };
 
-    const filtered = users.filter((u) => u.username.toLowerCase().includes(search.toLowerCase()));
+    const shown = results ?? users;
 
     // Show loading message while fetching users
     if (loading) return <p className="text-center mt-10 text-yellow-400">Loading users...</p>;
@@ -85,11 +140,11 @@ const UsersList: React.FC = () => {
                 />
             </div>
 
-            {filtered.length === 0 ? (
+            {shown.length === 0 ? (
                 <p className="text-center text-yellow-500">No users found.</p>
             ) : (
                 <div className="grid grid-cols-1 sm:grid-cols-2 lg:grid-cols-3 gap-10">
-                    {filtered.map((u) => (
+                    {shown.map((u) => (
                         <div
                             key={u.id}
                             className="relative group bg-black/70 border border-yellow-700 rounded-2xl 
@@ -160,6 +215,18 @@ const UsersList: React.FC = () => {
                     ))}
                 </div>
             )}
+
+            {results === null && nextPage && (
+                <div className="mt-12 text-center">
+                    <button
+                        onClick={loadMore}
+                        disabled={loadingMore}
+                        className="px-6 py-2 rounded-lg border border-yellow-500/40 text-yellow-300 hover:bg-yellow-500/10 disabled:opacity-50 transition"
+                    >
+                        {loadingMore ? "Loading…" : "Load more developers"}
+                    </button>
+                </div>
+            )}
         </div>
     );
 };